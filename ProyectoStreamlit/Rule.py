@@ -1,37 +1,245 @@
 # Contenido de Rule.py
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from indice_similitud import normalizar_filas
 
 class Rule:
     """Clase base para todas las reglas."""
     def apply(self, user_input, travel_data):
         raise NotImplementedError("Cada regla debe implementar 'apply'")
 
+    def apply_batch(self, user_inputs, travel_data):
+        """Aplica la regla a N entradas y retorna una matriz N×M."""
+        filas = []
+        for user_input in user_inputs:
+            result = self.apply(user_input, travel_data)
+            if np.isscalar(result):
+                result = np.full(len(travel_data), result)
+            filas.append(np.asarray(result, dtype=float))
+        return np.vstack(filas) if filas else np.empty((0, len(travel_data)))
+
 class CosineSimilarityRule(Rule):
-    def __init__(self, scaler, normalized_data):
+    def __init__(self, scaler, normalized_data, weight=1.0, indice=None):
         self.scaler = scaler
         self.normalized_data = normalized_data
+        self.weight = weight
+        # Índice de similitud (ver indice_similitud.py); sin índice se usa sklearn
+        self.indice = indice
 
     def apply(self, user_input, travel_data):
         user_input_scaled = self.scaler.transform([user_input])
-        return cosine_similarity(user_input_scaled, self.normalized_data)[0]
+        return self.apply_batch(user_input_scaled, travel_data)[0]
+
+    def apply_batch(self, user_inputs, travel_data):
+        # user_inputs ya viene escalado (N×3), una sola multiplicación contra el catálogo
+        if self.indice is None:
+            # sklearn se importa solo si se usa esta ruta (importarlo cuesta ~1 s)
+            from sklearn.metrics.pairwise import cosine_similarity
+            return cosine_similarity(user_inputs, self.normalized_data)
+        return self.indice.similitud(normalizar_filas(user_inputs))
 
 class ThresholdRule(Rule):
-    def __init__(self, threshold, column_name):
+    def __init__(self, threshold, column_name, weight=1.0):
         self.threshold = threshold
         self.column_name = column_name
+        self.weight = weight
 
     def apply(self, user_input, travel_data):
         if self.column_name not in travel_data.columns:
             return 0  # Retorna 0 si la columna no existe
         return (travel_data[self.column_name] <= self.threshold).astype(float)
 
+    def apply_batch(self, user_inputs, travel_data):
+        # El umbral no depende de la entrada: se calcula una vez y se replica por fila
+        result = self.apply(None, travel_data)
+        if np.isscalar(result):
+            result = np.full(len(travel_data), result)
+        return np.broadcast_to(np.asarray(result, dtype=float), (len(user_inputs), len(travel_data)))
+
 class EqualityRule(Rule):
-    def __init__(self, column_name):
+    def __init__(self, column_name, weight=1.0):
         self.column_name = column_name
+        self.weight = weight
 
     def apply(self, user_input, travel_data):
         if self.column_name not in travel_data.columns or user_input is None:
             return 0  # Retorna 0 si no hay coincidencia posible
         # Aquí asumimos que user_input es una lista y el valor relevante está en una posición específica
         # Para este caso, usaremos el tipo_hospedaje como entrada adicional si está presente
-        return (travel_data[self.column_name] == user_input).astype(float)
\ No newline at end of file
+        return (travel_data[self.column_name] == user_input).astype(float)
+
+    def apply_batch(self, user_inputs, travel_data):
+        result = np.zeros((len(user_inputs), len(travel_data)))
+        if self.column_name not in travel_data.columns:
+            return result
+        columna = travel_data[self.column_name].to_numpy()
+        # Una comparación por valor distinto, no por consulta
+        for valor in set(v for v in user_inputs if v):
+            filas = [i for i, v in enumerate(user_inputs) if v == valor]
+            result[filas] = (columna == valor).astype(float)
+        return result
+
+class ClimateRule(Rule):
+    """Preferencia de clima: la clase de clima de la fila (según temperatura y humedad) coincide con la pedida."""
+    CLIMAS = ["frío", "templado", "cálido", "tropical"]
+    COLUMNAS = ["avg_temperature", "avg_humidity"]
+
+    def __init__(self, weight=1.0, templado_desde=15.0, calido_desde=25.0, humedad_tropical=70.0):
+        self.weight = weight
+        self.templado_desde = templado_desde
+        self.calido_desde = calido_desde
+        self.humedad_tropical = humedad_tropical
+
+    def clases(self, temperatura, humedad):
+        """Código de clima por fila (índice en CLIMAS, -1 sin datos)."""
+        temperatura = np.asarray(temperatura, dtype=float)
+        humedad = np.asarray(humedad, dtype=float)
+        clases = np.where(temperatura < self.templado_desde, 0, np.where(temperatura < self.calido_desde, 1, 2))
+        clases[(clases == 2) & (humedad >= self.humedad_tropical)] = 3
+        clases[np.isnan(temperatura) | np.isnan(humedad)] = -1
+        return clases.astype(np.int8)
+
+    def apply(self, user_input, travel_data):
+        if user_input is None or any(c not in travel_data.columns for c in self.COLUMNAS):
+            return 0
+        clases = self.clases(travel_data[self.COLUMNAS[0]], travel_data[self.COLUMNAS[1]])
+        return (clases == self.CLIMAS.index(user_input)).astype(float) if user_input in self.CLIMAS else 0
+
+class SafetyRule(Rule):
+    """Preferencia de seguridad: puntaje de seguridad de la fila escalado a [0, 1] sobre una escala fija."""
+    def __init__(self, column_name="safety_score", weight=1.0, minimo=0.0, maximo=10.0):
+        self.column_name = column_name
+        self.weight = weight
+        # Escala fija (no la del catálogo): el puntaje de una fila no depende de qué otras filas se cargaron
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def escalar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        return np.nan_to_num(np.clip((valores - self.minimo) / ((self.maximo - self.minimo) or 1.0), 0.0, 1.0))
+
+    def apply(self, user_input, travel_data):
+        if user_input is None or self.column_name not in travel_data.columns:
+            return 0
+        return self.escalar(travel_data[self.column_name])
+
+class ActivitiesRule(Rule):
+    """Preferencia de actividades: fracción de las actividades pedidas que ofrece la fila."""
+    def __init__(self, column_name="top_activities", weight=1.0):
+        self.column_name = column_name
+        self.weight = weight
+
+    @staticmethod
+    def tokens(texto):
+        """Actividades normalizadas de un texto separado por comas."""
+        if not isinstance(texto, str):
+            return set()
+        return {t.strip().lower() for t in texto.split(",") if t.strip()}
+
+    def apply(self, user_input, travel_data):
+        pedidas = {t.strip().lower() for t in user_input or []}
+        if not pedidas or self.column_name not in travel_data.columns:
+            return 0
+        return np.array([len(pedidas & self.tokens(t)) / len(pedidas) for t in travel_data[self.column_name]])
+
+class FuzzyRule(Rule):
+    """Regla difusa: grado (0 a 1) con que la fila cumple sus términos, combinados con AND (mínimo) u OR (máximo).
+
+    Cada término es una función de pertenencia triangular (a, b, c) o trapezoidal (a, b, c, d)
+    sobre una columna; None en un extremo (a o d) deja ese lado abierto, con grado 1 hasta el borde
+    (p. ej. [null, null, c, d] vale 1 hasta c y baja a 0 en d). Un término puede ser
+    relativo a la consulta: "cociente" evalúa columna / valor pedido y "diferencia" columna - valor
+    pedido, con el valor de la misma columna en la entrada (presupuesto, punto medio, mes).
+    """
+    COLUMNAS_CONSULTA = ["Total cost", "Duration (days)", "Month"]
+    FORMAS = {"triangular": 3, "trapezoidal": 4}
+    OPERADORES = ("and", "or")
+    RELATIVOS = ("cociente", "diferencia")
+
+    def __init__(self, terminos, operador="and", weight=1.0):
+        if operador not in self.OPERADORES:
+            raise ValueError(f"Operador difuso desconocido: {operador!r} (use 'and' u 'or')")
+        if not terminos:
+            raise ValueError("Una regla difusa necesita al menos un término")
+        self.operador = operador
+        self.weight = weight
+        self.terminos = [self._termino(t) for t in terminos]
+
+    @classmethod
+    def _termino(cls, termino):
+        forma, puntos = termino.get("forma", "trapezoidal"), list(termino["puntos"])
+        relativo = termino.get("relativo")
+        if cls.FORMAS.get(forma) != len(puntos):
+            raise ValueError(f"La forma {forma!r} necesita {cls.FORMAS.get(forma, '3 o 4')} puntos: {puntos}")
+        if forma == "triangular":
+            puntos = [puntos[0], puntos[1], puntos[1], puntos[2]]
+        definidos = [p for p in puntos if p is not None]
+        abiertos = (puntos[0] is not None and puntos[1] is None) or (puntos[3] is not None and puntos[2] is None)
+        if abiertos or definidos != sorted(definidos):
+            raise ValueError(f"Puntos de pertenencia inválidos: {termino['puntos']}")
+        if relativo is not None and (relativo not in cls.RELATIVOS or termino["column"] not in cls.COLUMNAS_CONSULTA):
+            raise ValueError(f"Término relativo inválido: {relativo!r} sobre {termino['column']!r}")
+        return {"columna": termino["column"], "puntos": puntos, "relativo": relativo}
+
+    @staticmethod
+    def pertenencia(valores, puntos):
+        """Grado de pertenencia trapezoidal (a, b, c, d) de cada valor; 0 para NaN."""
+        a, b, c, d = puntos
+        valores = np.asarray(valores, dtype=float)
+        xp, fp = [], []
+        if a is not None:
+            xp, fp = [a, b], [0.0, 1.0]
+        if d is not None:
+            if xp and xp[-1] == c:
+                xp, fp = xp[:-1], fp[:-1]
+            xp, fp = xp + [c, d], fp + [1.0, 0.0]
+        if not xp:
+            grado = np.ones(valores.shape)
+        elif all(x0 < x1 for x0, x1 in zip(xp, xp[1:])):
+            # Una sola pasada: fuera de [xp[0], xp[-1]] interp extiende los extremos (los hombros)
+            grado = np.interp(valores, xp, fp)
+        else:
+            # Bordes verticales (a == b o c == d)
+            grado = np.ones(valores.shape)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if a is not None:
+                    grado = np.minimum(grado, (valores - a) / (b - a) if b > a else (valores >= a).astype(float))
+                if d is not None:
+                    grado = np.minimum(grado, (d - valores) / (d - c) if d > c else (valores <= d).astype(float))
+            grado = np.clip(grado, 0.0, 1.0)
+        grado[np.isnan(valores)] = 0.0
+        return grado
+
+    @classmethod
+    def grado(cls, valores, termino, consulta=None):
+        """Grado de un término sobre los valores crudos de su columna, dado el valor pedido en la consulta.
+
+        Los términos relativos trasladan los puntos de la función (p. ej. cociente: a * presupuesto)
+        en lugar de transformar la columna: es una sola pasada sobre los valores.
+        """
+        puntos, relativo = termino["puntos"], termino["relativo"]
+        if relativo == "cociente" and consulta > 0:
+            puntos = [None if p is None else p * consulta for p in puntos]
+        elif relativo == "diferencia":
+            puntos = [None if p is None else p + consulta for p in puntos]
+        elif relativo == "cociente":
+            # Presupuesto 0 o negativo: cualquier costo positivo queda infinitamente por encima
+            with np.errstate(divide="ignore", invalid="ignore"):
+                valores = np.asarray(valores, dtype=float) / max(consulta, 0.0)
+        return cls.pertenencia(valores, puntos)
+
+    @staticmethod
+    def combinar(grados, operador):
+        """AND (mínimo) u OR (máximo) de los grados de los términos."""
+        if len(grados) == 1:
+            return grados[0]
+        return np.minimum.reduce(grados) if operador == "and" else np.maximum.reduce(grados)
+
+    def apply(self, user_input, travel_data):
+        # user_input: valores crudos de la consulta alineados con COLUMNAS_CONSULTA
+        if any(t["columna"] not in travel_data.columns for t in self.terminos):
+            return 0
+        grados = []
+        for t in self.terminos:
+            consulta = None if t["relativo"] is None else user_input[self.COLUMNAS_CONSULTA.index(t["columna"])]
+            grados.append(self.grado(travel_data[t["columna"]].to_numpy(dtype=float), t, consulta))
+        return self.combinar(grados, self.operador)
@@ -1,9 +1,7 @@
 # Contenido actualizado de app.py
+import time
 import streamlit as st
-import pandas as pd
-from motor_inferencia import MotorInferencia
-from base_conocimiento import BaseConocimiento
-from base_hechos import BaseHechos
+from motor_compartido import obtener_motor_compartido
 
 # Configuración de la página
 st.set_page_config(
@@ -18,19 +16,14 @@ st.set_page_config(
     }
 )
 
-# Cargar dataset
-# try travel_data = pd.read_csv("cleaned_travel_dataset.csv") if not found then try travel_data = pd.read_csv("ProyectoStreamlit/cleaned_travel_dataset.csv")
-
-travel_data = None
-try:
-    travel_data = pd.read_csv("cleaned_travel_dataset.csv")
-except FileNotFoundError:
-    travel_data = pd.read_csv("ProyectoStreamlit/cleaned_travel_dataset.csv")
-
 # Inicializar sistema
-base_conocimiento = BaseConocimiento(travel_data)
-base_hechos = BaseHechos()
-motor = MotorInferencia(base_conocimiento, base_hechos)
+# La base de conocimientos se construye una sola vez por proceso y la comparten todas las sesiones;
+# cada sesión conserva su propio motor con su BaseHechos.
+compartido = obtener_motor_compartido()
+if "motor" not in st.session_state:
+    st.session_state.motor = compartido.nueva_sesion()
+motor = st.session_state.motor
+base_hechos = motor.base_hechos
 
 # Barra lateral
 st.sidebar.header("📋 Acerca del Proyecto")
@@ -163,15 +156,42 @@ with st.form("travel_form"):
         help="Seleccione el tipo de hospedaje que prefiere. Deje en blanco para no filtrar por este criterio."
     )
 
+    # Subsección: Preferencias del Destino (solo puntúan si se indican)
+    st.subheader("🌤️ Preferencias del Destino")
+    plan = compartido.base_conocimiento.plan
+    col_pref1, col_pref2 = st.columns(2)
+    with col_pref1:
+        clima = st.selectbox(
+            "Clima",
+            [""] + plan.climas,
+            index=0,
+            help="Clima preferido en el destino. Deje en blanco para no considerarlo."
+        )
+    with col_pref2:
+        usar_seguridad = st.checkbox("Exigir seguridad mínima", value=False)
+        seguridad_min = st.slider(
+            "Seguridad mínima",
+            0.0, 10.0, 7.0, 0.5,
+            help="Puntaje de seguridad mínimo del destino (solo si se marca la casilla)."
+        )
+    actividades = st.multiselect(
+        "Actividades",
+        plan.vocabulario,
+        help="Actividades que le interesan; se priorizan los destinos que ofrecen más de ellas."
+    )
+
     # Botón para realizar la búsqueda
     submitted = st.form_submit_button("Buscar Destinos")
 
 if submitted:
     # Ingresar datos del usuario en la BaseHechos
-    base_hechos.ingresar_datos_usuario(presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje)
+    base_hechos.ingresar_datos_usuario(presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje,
+                                       clima, seguridad_min if usar_seguridad else None, actividades)
     
     # Generar recomendaciones
+    t0 = time.perf_counter()
     recomendaciones = motor.generar_recomendaciones()
+    tiempo_consulta_ms = (time.perf_counter() - t0) * 1000
 
     # Mostrar el resultado
     st.subheader("Resultado de las Recomendaciones")
@@ -182,6 +202,11 @@ if submitted:
     else:
         st.warning("😕 **No se encontraron coincidencias con tus criterios.** Intenta ajustar tus preferencias.")
 
+    st.caption(
+        f"⏱️ Arranque del motor: {compartido.tiempo_arranque_s:.2f} s (una vez por proceso) · "
+        f"Esta consulta: {tiempo_consulta_ms:.1f} ms"
+    )
+
 # Pie de página
 st.markdown("""
 ---
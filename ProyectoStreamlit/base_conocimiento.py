@@ -1,80 +1,484 @@
 # Contenido actualizado de base_conocimiento.py
-import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
+# pandas se importa dentro de las funciones que lo usan: el núcleo solo necesita numpy
 import numpy as np
 import json
 import Rule as rl
+from catalogo import CatalogoColumnar
+from escalador import EscaladorMinMax
+from plan_puntuacion import PlanPuntuacion
+from seleccion_top_k import top_k
+from indice_similitud import INDICES, crear_indice, normalizar_filas
+from indices_filtro import IndiceFiltros, orden_fisico, posiciones, cantidad
+from instrumentacion import METRICAS
+import snapshot
+import formato_columnar
+import collections
+import itertools
 import os
+import threading
+
+RUTA_REGLAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json")
+
+# Versiones únicas en todo el proceso: cambian cada vez que se (re)cargan catálogo o reglas
+_versiones = itertools.count(1)
+
+# Todo lo que usa una consulta, en un solo objeto inmutable: las actualizaciones construyen
+# un Estado nuevo y lo publican con una sola asignación, así una consulta en curso nunca
+# mezcla el catálogo de una versión con los índices o el plan de otra.
+Estado = collections.namedtuple("Estado", [
+    "catalogo", "scaler", "normalized_data", "indice_similitud", "indice_filtros",
+    "reglas_config", "rules", "plan", "version",
+])
+
+
+def _del_estado(campo):
+    return property(lambda self: getattr(self._estado, campo))
+
 
 class BaseConocimiento:
-    def __init__(self, travel_data):
-        self.travel_data = travel_data.copy()
-        self.travel_data["Total cost"] = self.travel_data["Accommodation cost"] + self.travel_data["Transportation cost"]
-        self.scaler = MinMaxScaler()
-        self.normalized_data = self.scaler.fit_transform(
-            self.travel_data[["Total cost", "Duration (days)", "Month"]]
-        )
-        self.rules = self.load_rules()
+    COLUMNAS_SIMILITUD = ["Total cost", "Duration (days)", "Month"]
+    COLUMNAS_RESULTADO = ["Destination", "Total cost", "Duration (days)", "Accommodation type"]
+    # Las filas agregadas o eliminadas se reordenan físicamente cuando superan esta fracción
+    FRACCION_COMPACTACION = 0.25
+    # Registro de contadores e histogramas por etapa (instrumentacion.py)
+    metricas = METRICAS
+
+    catalogo = _del_estado("catalogo")
+    scaler = _del_estado("scaler")
+    normalized_data = _del_estado("normalized_data")
+    indice_similitud = _del_estado("indice_similitud")
+    indice_filtros = _del_estado("indice_filtros")
+    reglas_config = _del_estado("reglas_config")
+    rules = _del_estado("rules")
+    plan = _del_estado("plan")
+    version = _del_estado("version")
+
+    @property
+    def estado(self):
+        """Estado vigente; leerlo una sola vez garantiza trabajar sobre una única versión."""
+        return self._estado
+
+    def __init__(self, travel_data, indice="exacto", opciones_indice=None):
+        self._inicializar(indice, opciones_indice)
+        self._cargar_catalogo(travel_data)
         print("Reglas cargadas.")
         print("Base de conocimientos inicializada.")
 
-    def load_rules(self):
-        # Construir la ruta absoluta al archivo rules.json
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        rules_path = os.path.join(script_dir, "rules.json")
-        with open(rules_path, "r") as f:
-            rules_config = json.load(f)["rules"]
+    def _inicializar(self, indice, opciones_indice, hash_dataset=None, hash_reglas=None):
+        self.tipo_indice = indice
+        self.opciones_indice = opciones_indice or {}
+        # Hashes de las fuentes; solo se conocen cuando la base se construye con desde_csv()
+        self.hash_dataset = hash_dataset
+        self.hash_reglas = hash_reglas
+        # Serializa a los que escriben; los que leen solo toman self._estado
+        self._escritura = threading.Lock()
+
+    def _cargar_catalogo(self, travel_data, escalador=None, reglas_config=None):
+        # El catálogo se guarda en forma columnar; el DataFrame original no se retiene
+        if isinstance(travel_data, CatalogoColumnar):
+            catalogo = travel_data
+        else:
+            catalogo = CatalogoColumnar.desde_dataframe(travel_data)
+        catalogo.agregar_numerica("Total cost", catalogo["Accommodation cost"] + catalogo["Transportation cost"])
+        # Filas ordenadas por (tipo de hospedaje, costo) para que los filtros sean búsquedas binarias
+        catalogo = catalogo.tomar(orden_fisico(catalogo["Total cost"], catalogo.codigos("Accommodation type")))
+        similitud = self._matriz_similitud(catalogo)
+        if escalador is None:
+            escalador = EscaladorMinMax().fit(similitud)
+        # Con un escalador dado (ajustado sobre un catálogo mayor, p. ej. los bloques del modo
+        # streaming) solo se transforma
+        normalized_data = escalador.transform(similitud)
+        # Índice de similitud de coseno: "exacto" o "ivf" (aproximado, ver indice_similitud.py)
+        indice_similitud = crear_indice(self.tipo_indice, normalizar_filas(normalized_data), **self.opciones_indice)
+        indice_filtros = IndiceFiltros(catalogo["Total cost"], catalogo.codigos("Accommodation type"))
+        self._estado = self._compilar(catalogo, escalador, normalized_data, indice_similitud, indice_filtros, reglas_config)
+
+    def _compilar(self, catalogo, scaler, normalized_data, indice_similitud, indice_filtros, reglas_config=None, plan=None):
+        """Construye las reglas y el plan de puntuación sobre las piezas dadas → Estado con versión nueva."""
+        if reglas_config is None:
+            with open(RUTA_REGLAS, "r") as f:
+                reglas_config = json.load(f)["rules"]
+        rules = self._construir_reglas(reglas_config, scaler, normalized_data, indice_similitud)
+        if plan is None:
+            plan = PlanPuntuacion(rules, catalogo, indice_similitud, scaler)
+        # Cualquier resultado calculado con la versión anterior queda invalidado
+        return Estado(catalogo, scaler, normalized_data, indice_similitud, indice_filtros,
+                      reglas_config, rules, plan, next(_versiones))
+
+    def _matriz_similitud(self, catalogo, filas=slice(None)):
+        return np.column_stack([catalogo.valores(c, filas) for c in self.COLUMNAS_SIMILITUD])
+
+    def recargar_catalogo(self, travel_data):
+        """Reemplaza el catálogo completo y recompila las reglas sobre él."""
+        with self._escritura:
+            self._cargar_catalogo(travel_data)
+
+    def recargar_reglas(self, reglas_config=None):
+        """Vuelve a leer rules.json (o usa `reglas_config`) y recompila el plan de puntuación."""
+        with self._escritura:
+            e = self._estado
+            self._estado = self._compilar(e.catalogo, e.scaler, e.normalized_data, e.indice_similitud,
+                                          e.indice_filtros, reglas_config)
+
+    def add_destinations(self, destinos):
+        """Agrega destinos (DataFrame con las columnas del CSV) sin reconstruir la base.
+
+        Las filas nuevas quedan al final del catálogo. Solo se reescala todo si cambian los
+        mínimos o máximos del escalador; si no, se normalizan únicamente las filas nuevas.
+        Retorna la versión publicada.
+        """
+        if len(destinos) == 0:
+            return self.version
+        destinos = destinos.assign(**{"Total cost": destinos["Accommodation cost"].to_numpy(dtype=float)
+                                                    + destinos["Transportation cost"].to_numpy(dtype=float)})
+        with self._escritura:
+            e = self._estado
+            catalogo = e.catalogo.agregar_filas(destinos)
+            n = len(e.catalogo)
+            # Límites nuevos = límites actuales ampliados con las filas nuevas
+            escalador = EscaladorMinMax().fit(np.vstack([
+                e.scaler.data_min_, e.scaler.data_max_, self._matriz_similitud(catalogo, slice(n, None))
+            ]))
+            vivas = e.indice_filtros.vivas
+            if vivas is not None:
+                vivas = np.concatenate([vivas, np.ones(len(destinos), dtype=bool)])
+            self._publicar(e, catalogo, escalador, vivas, desde=n)
+            return self.version
+
+    def remove_destinations(self, etiquetas):
+        """Elimina destinos por su etiqueta de índice (la fila original del CSV) marcándolos como borrados.
+
+        Si alguna fila eliminada definía un mínimo o máximo, los límites se recalculan sobre
+        las filas vigentes. Retorna la versión publicada.
+        """
+        with self._escritura:
+            e = self._estado
+            vivas = e.indice_filtros.vivas
+            if vivas is None:
+                vivas = np.ones(len(e.catalogo), dtype=bool)
+            quitar = np.isin(e.catalogo.indice, np.asarray(list(etiquetas))) & vivas
+            if not quitar.any():
+                return e.version
+            vivas = vivas & ~quitar
+            minimos, maximos = e.scaler.data_min_.copy(), e.scaler.data_max_.copy()
+            if vivas.any():
+                for j, columna in enumerate(self.COLUMNAS_SIMILITUD):
+                    valores = e.catalogo.valores(columna)
+                    for limites, reducir in ((minimos, np.nanmin), (maximos, np.nanmax)):
+                        # Solo se recalcula un límite que ya ninguna fila vigente alcanza
+                        if (valores[quitar] == limites[j]).any() and not (vivas & (valores == limites[j])).any():
+                            limites[j] = reducir(valores[vivas])
+            escalador = EscaladorMinMax().fit(np.vstack([minimos, maximos]))
+            self._publicar(e, e.catalogo, escalador, vivas, desde=len(e.catalogo))
+            return self.version
+
+    def _publicar(self, e, catalogo, escalador, vivas, desde):
+        """Arma el Estado tras agregar (filas desde `desde`) o eliminar filas y lo publica."""
+        mismos_limites = (np.array_equal(escalador.data_min_, e.scaler.data_min_, equal_nan=True)
+                          and np.array_equal(escalador.data_max_, e.scaler.data_max_, equal_nan=True))
+        if mismos_limites:
+            escalador = e.scaler
+            normalized_data, indice_similitud = e.normalized_data, e.indice_similitud
+            if desde < len(catalogo):
+                nuevas = escalador.transform(self._matriz_similitud(catalogo, slice(desde, None)))
+                normalized_data = np.concatenate([normalized_data, nuevas])
+                # Se concatena por columnas para que el resultado ya quede en orden Fortran
+                unitarios = np.concatenate([indice_similitud.unitarios.T, normalizar_filas(nuevas).T], axis=1).T
+                indice_similitud = indice_similitud.actualizado(unitarios, desde)
+        else:
+            # Los límites se movieron: se reescala todo el catálogo (los centroides IVF se conservan)
+            normalized_data = escalador.transform(self._matriz_similitud(catalogo))
+            indice_similitud = e.indice_similitud.actualizado(normalizar_filas(normalized_data))
+
+        f = e.indice_filtros
+        indice_filtros = IndiceFiltros(catalogo["Total cost"], catalogo.codigos("Accommodation type"),
+                                       f.orden_costo, f.costos_ordenados, f.n_ordenadas, vivas)
+        if indice_filtros.pendientes > self.FRACCION_COMPACTACION * len(catalogo):
+            catalogo, normalized_data, indice_similitud, indice_filtros = self._compactar(
+                catalogo, normalized_data, indice_similitud, vivas)
+        # El contenido ya no coincide con el CSV original: el snapshot no debe reutilizarse
+        self.hash_dataset = None
+        self._estado = self._compilar(catalogo, escalador, normalized_data, indice_similitud,
+                                      indice_filtros, e.reglas_config)
+
+    @staticmethod
+    def _compactar(catalogo, normalized_data, indice_similitud, vivas):
+        """Descarta las filas eliminadas y restablece el orden físico (tipo, costo) de todas."""
+        filas = np.arange(len(catalogo)) if vivas is None else np.flatnonzero(vivas)
+        filas = filas[orden_fisico(catalogo["Total cost"][filas], catalogo.codigos("Accommodation type")[filas])]
+        catalogo = catalogo.tomar(filas)
+        indice_similitud = indice_similitud.actualizado(indice_similitud.unitarios[filas])
+        indice_filtros = IndiceFiltros(catalogo["Total cost"], catalogo.codigos("Accommodation type"))
+        return catalogo, normalized_data[filas], indice_similitud, indice_filtros
+
+    def compactar(self):
+        """Aplica ya las altas y bajas pendientes al orden físico del catálogo."""
+        with self._escritura:
+            e = self._estado
+            if not e.indice_filtros.pendientes:
+                return e.version
+            catalogo, normalized_data, indice_similitud, indice_filtros = self._compactar(
+                e.catalogo, e.normalized_data, e.indice_similitud, e.indice_filtros.vivas)
+            self._estado = self._compilar(catalogo, e.scaler, normalized_data, indice_similitud,
+                                          indice_filtros, e.reglas_config)
+            return self.version
+
+    @classmethod
+    def desde_csv(cls, ruta_dataset, ruta_snapshot=None, indice="exacto", opciones_indice=None):
+        """Carga la base desde un snapshot vigente o, si no lo hay, desde el CSV (y guarda el snapshot).
+
+        El snapshot se reconstruye automáticamente cuando cambia el hash del CSV o de rules.json.
+        Si no se puede escribir en `ruta_snapshot`, la base se construye igual y solo se avisa.
+        """
+        hash_dataset = snapshot.hash_archivo(ruta_dataset)
+        hash_reglas = snapshot.hash_archivo(RUTA_REGLAS)
+        if ruta_snapshot and snapshot.vigente(ruta_snapshot, hash_dataset, hash_reglas, indice, opciones_indice):
+            return cls.desde_snapshot(ruta_snapshot)
+        import pandas as pd
+        base = cls(pd.read_csv(ruta_dataset), indice, opciones_indice)
+        base.hash_dataset, base.hash_reglas = hash_dataset, hash_reglas
+        if ruta_snapshot:
+            try:
+                base.guardar_snapshot(ruta_snapshot)
+            except OSError as e:
+                # Directorio de solo lectura o sin espacio: se sigue con la base en memoria
+                print(f"⚠️ No se pudo guardar el snapshot en {ruta_snapshot}: {e}")
+        return base
+
+    @classmethod
+    def columnas_necesarias(cls, reglas_config=None):
+        """Columnas del catálogo que leen las reglas, la similitud, los filtros y el resultado."""
+        if reglas_config is None:
+            with open(RUTA_REGLAS, "r") as f:
+                reglas_config = json.load(f)["rules"]
+        columnas = {"Accommodation cost", "Transportation cost", "Accommodation type"}
+        columnas.update(cls.COLUMNAS_SIMILITUD, cls.COLUMNAS_RESULTADO)
+        columnas.update(cls._columna_regla(rule) for rule in reglas_config if "column" in rule)
+        if any(rule["type"] == "climate" for rule in reglas_config):
+            columnas.update(rl.ClimateRule.COLUMNAS)
+        columnas.update(t["column"] for rule in reglas_config if rule["type"] == "fuzzy" for t in rule["terminos"])
+        # "Total cost" no se guarda: se calcula al cargar
+        columnas.discard("Total cost")
+        return sorted(columnas)
+
+    @classmethod
+    def desde_columnar(cls, ruta, indice="exacto", opciones_indice=None, columnas=None):
+        """Construye la base desde un catálogo columnar (Parquet o directorio .columnar, ver formato_columnar.py).
+
+        Solo se leen `columnas` (por defecto, columnas_necesarias()): el resto del catálogo no se
+        carga y no aparece en travel_data. Como con el CSV, una regla sobre una columna que el
+        catálogo no tiene no aporta puntaje.
+        """
+        if columnas is None:
+            guardadas = formato_columnar.columnas_guardadas(ruta)
+            columnas = [c for c in cls.columnas_necesarias() if c in guardadas]
+        catalogo = formato_columnar.leer(ruta, columnas)
+        return cls(catalogo, indice, opciones_indice)
+
+    @classmethod
+    def desde_snapshot(cls, ruta):
+        """Reconstruye la base desde un snapshot, con los arreglos mapeados en memoria (solo lectura)."""
+        manifiesto, arreglos = snapshot.cargar(ruta)
+        meta = manifiesto["catalogo"]
+        base = cls.__new__(cls)
+        base._inicializar(manifiesto["indice"]["tipo"], manifiesto["indice"]["opciones"],
+                          manifiesto["hash_dataset"], manifiesto["hash_reglas"])
+        catalogo = CatalogoColumnar(
+            {c: arreglos[f"num_{i}"] for i, c in enumerate(meta["numericas"])},
+            {c: (arreglos[f"cat_{i}"], meta["categorias"][i]) for i, c in enumerate(meta["categoricas"])},
+            arreglos["indice"],
+            meta["columnas"],
+        )
+        # Ajustar con [mínimos; máximos] reproduce exactamente el escalador original
+        escalador = manifiesto["escalador"]
+        scaler = EscaladorMinMax().fit(np.array([escalador["data_min"], escalador["data_max"]]))
+        arreglos_indice = {k[len("indice_"):]: v for k, v in arreglos.items() if k.startswith("indice_")}
+        indice_similitud = INDICES[base.tipo_indice].desde_exportado(
+            arreglos["unitarios"], manifiesto["indice"]["parametros"], arreglos_indice
+        )
+        indice_filtros = IndiceFiltros(
+            catalogo["Total cost"], catalogo.codigos("Accommodation type"),
+            arreglos["filtros_orden_costo"], arreglos["filtros_costos_ordenados"]
+        )
+        arreglos_plan = {k[len("plan_"):]: v for k, v in arreglos.items() if k.startswith("plan_")}
+        plan = PlanPuntuacion.desde_exportado(manifiesto["plan"], arreglos_plan, indice_similitud, scaler)
+        base._estado = base._compilar(catalogo, scaler, arreglos["normalizados"], indice_similitud,
+                                      indice_filtros, manifiesto["reglas"], plan)
+        return base
+
+    @classmethod
+    def desde_bloque(cls, travel_data, escalador, reglas_config):
+        """Base sobre un bloque del catálogo, escalada con un escalador ajustado sobre el catálogo completo.
+
+        La usa el modo streaming (base_streaming.py): no vuelve a leer rules.json ni imprime mensajes.
+        """
+        base = cls.__new__(cls)
+        base._inicializar("exacto", {})
+        base._cargar_catalogo(travel_data, escalador, reglas_config)
+        return base
+
+    def guardar_snapshot(self, ruta):
+        """Guarda la base ajustada como snapshot binario mapeable en memoria (ver snapshot.py)."""
+        # El snapshot solo guarda el orden físico: primero se aplican las altas y bajas pendientes
+        self.compactar()
+        snapshot.guardar(self, ruta)
+
+    @property
+    def travel_data(self):
+        """Catálogo vigente como DataFrame. Se materializa en cada acceso: evitarlo en la ruta de consulta."""
+        e = self._estado
+        if e.indice_filtros.vivas is None:
+            return e.catalogo.a_dataframe()
+        return e.catalogo.registros(np.flatnonzero(e.indice_filtros.vivas))
+
+    def load_rules(self, rules_config=None):
+        if rules_config is None:
+            with open(RUTA_REGLAS, "r") as f:
+                rules_config = json.load(f)["rules"]
+        return self._construir_reglas(rules_config, self.scaler, self.normalized_data, self.indice_similitud)
+
+    @staticmethod
+    def _construir_reglas(rules_config, scaler, normalized_data, indice_similitud):
         rules = []
         for rule in rules_config:
+            weight = rule.get("weight", 1.0)
             if rule["type"] == "cosine_similarity":
-                rules.append(rl.CosineSimilarityRule(self.scaler, self.normalized_data))
+                rules.append(rl.CosineSimilarityRule(scaler, normalized_data, weight, indice_similitud))
             elif rule["type"] == "threshold":
-                column = "Total cost" if rule["column"] == "budget" else rule["column"]
-                rules.append(rl.ThresholdRule(rule["threshold"], column))
+                rules.append(rl.ThresholdRule(rule["threshold"], BaseConocimiento._columna_regla(rule), weight))
             elif rule["type"] == "equality":
-                column = "Accommodation type" if rule["column"] in ["hotel_name", "city_name"] else rule["column"]
-                rules.append(rl.EqualityRule(column))
+                rules.append(rl.EqualityRule(BaseConocimiento._columna_regla(rule), weight))
+            elif rule["type"] == "climate":
+                opciones = {c: rule[c] for c in ("templado_desde", "calido_desde", "humedad_tropical") if c in rule}
+                rules.append(rl.ClimateRule(weight, **opciones))
+            elif rule["type"] == "safety":
+                escala = {c: rule[c] for c in ("minimo", "maximo") if c in rule}
+                rules.append(rl.SafetyRule(rule.get("column", "safety_score"), weight, **escala))
+            elif rule["type"] == "activities":
+                rules.append(rl.ActivitiesRule(rule.get("column", "top_activities"), weight))
+            elif rule["type"] == "fuzzy":
+                rules.append(rl.FuzzyRule(rule["terminos"], rule.get("operador", "and"), weight))
         return rules
 
-    def calcular_similitud(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None):
-        # Convertir user_input a un DataFrame con los mismos nombres de columnas que se usaron en fit
-        user_input_df = pd.DataFrame(
-            [[presupuesto, (duracion_min + duracion_max) / 2, mes]],
-            columns=["Total cost", "Duration (days)", "Month"]
-        )
-        user_input_scaled = self.scaler.transform(user_input_df)
-        results = []
-        for rule in self.rules:
-            if isinstance(rule, rl.CosineSimilarityRule):
-                result = rule.apply(user_input_scaled[0], self.travel_data)  # Pasamos el array escalado
-                results.append(result)
-            elif isinstance(rule, rl.ThresholdRule):
-                result = rule.apply(presupuesto, self.travel_data)
-                if np.isscalar(result):
-                    result = np.full(len(self.travel_data), result)
-                results.append(result)
-            elif isinstance(rule, rl.EqualityRule) and tipo_hospedaje:
-                result = rule.apply(tipo_hospedaje, self.travel_data)
-                if np.isscalar(result):
-                    result = np.full(len(self.travel_data), result)
-                results.append(result)
+    @staticmethod
+    def _columna_regla(rule):
+        """Columna del catálogo que evalúa una regla de umbral o de igualdad de rules.json."""
+        if rule["type"] == "threshold" and rule["column"] == "budget":
+            return "Total cost"
+        if rule["type"] == "equality" and rule["column"] in ["hotel_name", "city_name"]:
+            return "Accommodation type"
+        return rule["column"]
+
+    def calcular_similitud(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+                           clima=None, seguridad_min=None, actividades=None, filas=slice(None)):
+        """Similitud de una consulta; alineada con las filas de self.catalogo (o solo con `filas`)."""
+        plan = self._estado.plan
+        entrada = self._entrada(presupuesto, duracion_min, duracion_max, mes)
+        return plan.puntuar_una(entrada, tipo_hospedaje, filas,
+                                preferencias=plan.preferencias(clima, seguridad_min, actividades))
+
+    @staticmethod
+    def _entrada(presupuesto, duracion_min, duracion_max, mes):
+        return np.array([presupuesto, (duracion_min + duracion_max) / 2, mes], dtype=float)
+
+    def calcular_similitud_batch(self, consultas):
+        """Calcula la similitud de N consultas contra el catálogo en una sola pasada.
+
+        Cada consulta es una tupla (presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje) o
+        una Consulta, que puede traer además clima, seguridad_min y actividades.
+        Retorna una matriz N×M con una fila por consulta y una columna por destino.
+        """
+        return self._similitud_batch(self._estado, list(consultas))
+
+    @staticmethod
+    def _similitud_batch(estado, consultas, preferencias=None):
+        if not consultas:
+            return np.empty((0, len(estado.catalogo)))
+        if preferencias is None:
+            preferencias = [estado.plan.preferencias(*c[5:8]) for c in consultas]
+        entradas = [[c[0], (c[1] + c[2]) / 2, c[3]] for c in consultas]
+        return estado.plan.puntuar(entradas, [c[4] for c in consultas], preferencias)
+
+    def recomendar_destinos(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+                            clima=None, seguridad_min=None, actividades=None, k=6):
+        # Una sola lectura del estado: la consulta completa usa la misma versión
+        estado = self._estado
+        t0 = t = METRICAS.inicio()
+        entrada = self._entrada(presupuesto, duracion_min, duracion_max, mes)
+        preferencias = estado.plan.preferencias(clima, seguridad_min, actividades)
+        filas = self._candidatos(estado, presupuesto, tipo_hospedaje, entrada, preferencias)
+        t = METRICAS.registrar("filtros", t)
+        METRICAS.contar("consultas")
+        if filas is None:
+            METRICAS.contar("consultas_sin_candidatos")
+            return self._sin_resultados()
+        METRICAS.contar("filas_puntuadas", cantidad(filas))
+        # Solo se puntúan las filas que pasan los filtros
+        similitud = estado.plan.puntuar_una(entrada, tipo_hospedaje, filas, preferencias=preferencias)
+        METRICAS.registrar("puntuacion", t)
+        recomendaciones = self._seleccionar(estado, similitud, filas, k)
+        METRICAS.registrar("consulta_total", t0)
+        return recomendaciones
+
+    def recomendar_destinos_batch(self, consultas, k=6):
+        """Genera las recomendaciones de N consultas reutilizando una sola matriz de similitud.
+
+        La matriz se calcula contra todo el catálogo, así que el lote siempre es exacto
+        aunque la base use un índice aproximado.
+        """
+        estado = self._estado
+        consultas = list(consultas)
+        t0 = METRICAS.inicio()
+        preferencias = [estado.plan.preferencias(*c[5:8]) for c in consultas]
+        similitudes = self._similitud_batch(estado, consultas, preferencias)
+        METRICAS.registrar("lote_puntuacion", t0)
+        METRICAS.contar("consultas_lote", len(consultas))
+        recomendaciones = []
+        for consulta, similitud, preferencia in zip(consultas, similitudes, preferencias):
+            filas = self._candidatos(estado, consulta[0], consulta[4], preferencias=preferencia)
+            if filas is None:
+                recomendaciones.append(self._sin_resultados())
             else:
-                results.append(np.zeros(len(self.travel_data)))
-        
-        results = [np.array(r) for r in results]
-        return np.mean(results, axis=0)
+                recomendaciones.append(self._seleccionar(estado, similitud[filas], filas, k))
+        METRICAS.registrar("lote_total", t0)
+        return recomendaciones
 
-    def recomendar_destinos(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None):
-        self.travel_data["Similarity"] = self.calcular_similitud(presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje)
-        destinos_filtrados = self.travel_data.copy()
+    @staticmethod
+    def _candidatos(estado, presupuesto, tipo_hospedaje, entrada=None, preferencias=None):
+        """Filas que cumplen presupuesto, tipo de hospedaje y seguridad mínima (None si no hay ninguna).
 
-        destinos_filtrados = destinos_filtrados[destinos_filtrados["Total cost"] <= presupuesto]
+        Con un índice de similitud aproximado y una entrada, solo se consideran las filas de
+        las listas sondeadas que cumplen los filtros.
+        """
+        codigo = None
         if tipo_hospedaje:
-            destinos_filtrados = destinos_filtrados[destinos_filtrados["Accommodation type"] == tipo_hospedaje]
-        
-        if destinos_filtrados.empty:
-            return pd.DataFrame()
-        
-        destinos_recomendados = destinos_filtrados.sort_values(by="Similarity", ascending=False)
-        return destinos_recomendados[["Destination", "Total cost", "Duration (days)", "Accommodation type", "Similarity"]].head(6)
+            codigo = estado.catalogo.codigo("Accommodation type", tipo_hospedaje)
+            if codigo < 0:
+                return None
+        if estado.indice_similitud.aproximado and entrada is not None:
+            def filtro(filas):
+                mascara = estado.indice_filtros.mascara(filas, presupuesto, codigo)
+                if preferencias is not None and preferencias.seguridad_min is not None:
+                    mascara &= estado.plan.seguridad[filas] >= preferencias.seguridad_min
+                return mascara
+            filas = estado.indice_similitud.candidatos(estado.plan.unitaria(entrada), filtro)
+        else:
+            filas = estado.plan.filtrar(estado.indice_filtros.candidatos(presupuesto, codigo), preferencias)
+        return filas if cantidad(filas) else None
+
+    @staticmethod
+    def _sin_resultados():
+        import pandas as pd
+        return pd.DataFrame()
+
+    @staticmethod
+    def _seleccionar(estado, similitud, filas, k):
+        """Elige los k mejores candidatos sin ordenarlos todos y arma solo esas k filas."""
+        t = METRICAS.inicio()
+        filas = posiciones(filas)
+        locales = top_k(similitud, k, desempate=estado.catalogo.indice[filas])
+        t = METRICAS.registrar("seleccion_top_k", t)
+        destinos_recomendados = estado.catalogo.registros(filas[locales], BaseConocimiento.COLUMNAS_RESULTADO)
+        destinos_recomendados = destinos_recomendados.assign(Similarity=similitud[locales])
+        METRICAS.registrar("armado_resultado", t)
+        return destinos_recomendados
@@ -1,14 +1,50 @@
 # Contenido de base_hechos.py
+import collections
+
+
+class Consulta(collections.namedtuple("Consulta", ["presupuesto", "duracion_min", "duracion_max", "mes", "tipo_hospedaje",
+                                                   "clima", "seguridad_min", "actividades"])):
+    """Hechos de una consulta como valor inmutable.
+
+    Es una tupla con el orden que esperan recomendar_destinos / recomendar_destinos_batch, así
+    que puede pasarse tal cual a la Base de Conocimientos y compartirse entre hilos.
+    Las preferencias (clima, seguridad mínima, actividades) son opcionales; las actividades se
+    guardan normalizadas y como tupla ordenada, así dos consultas con las mismas actividades son iguales.
+    """
+    __slots__ = ()
+
+    def __new__(cls, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+                clima=None, seguridad_min=None, actividades=None):
+        actividades = tuple(sorted({a.strip().lower() for a in actividades or () if a and a.strip()})) or None
+        return super().__new__(cls, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje or None,
+                               clima or None, seguridad_min, actividades)
+
+    @classmethod
+    def desde_hechos(cls, hechos):
+        """Consulta a partir de un diccionario con el formato de BaseHechos.obtener_datos_usuario()."""
+        return cls(hechos["presupuesto"], hechos["duracion_min"], hechos["duracion_max"],
+                   hechos["mes"], hechos.get("tipo_hospedaje"), hechos.get("clima"),
+                   hechos.get("seguridad_min"), hechos.get("actividades"))
+
+
 class BaseHechos:
     def __init__(self):
         self.hechos = {}
 
-    def ingresar_datos_usuario(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje):
+    def ingresar_datos_usuario(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje,
+                               clima=None, seguridad_min=None, actividades=None):
         self.hechos["presupuesto"] = presupuesto
         self.hechos["duracion_min"] = duracion_min
         self.hechos["duracion_max"] = duracion_max
         self.hechos["mes"] = mes
         self.hechos["tipo_hospedaje"] = tipo_hospedaje if tipo_hospedaje else None
+        self.hechos["clima"] = clima if clima else None
+        self.hechos["seguridad_min"] = seguridad_min
+        self.hechos["actividades"] = list(actividades) if actividades else None
 
     def obtener_datos_usuario(self):
-        return self.hechos
\ No newline at end of file
+        return self.hechos
+
+    def obtener_consulta(self):
+        """Copia inmutable de los hechos actuales, para no depender de escrituras posteriores."""
+        return Consulta.desde_hechos(self.hechos)
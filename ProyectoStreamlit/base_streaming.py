@@ -0,0 +1,103 @@
+# Contenido de base_streaming.py
+"""
+Base de Conocimientos en modo streaming
+=======================================
+Para catálogos que no caben en memoria. El CSV se lee por bloques de `tamano_bloque` filas:
+
+1. Primera pasada (al construir): ajusta los mínimos y máximos del escalador bloque a bloque
+   (EscaladorMinMax.partial_fit) y fija el tipo de cada columna: es de texto si lo es en algún
+   bloque. pandas infiere los tipos por bloque, y un bloque con una columna de texto vacía
+   (solo NaN) la leería como numérica.
+2. Segunda pasada (en cada consulta o lote): cada bloque se lee con los tipos de la primera
+   pasada y se carga como una BaseConocimiento escalada con el escalador global, se calcula
+   su top-K local y se fusiona con el top-K acumulado.
+
+Como el escalado es global y el orden del top-K es total (puntaje y, en empate, índice
+original de la fila), el ranking es idéntico al del motor en memoria. La memoria máxima
+depende del tamaño del bloque, no del catálogo. Expone la misma interfaz de consulta que
+BaseConocimiento, así que MotorInferencia (y su caché) funcionan igual sobre ella.
+"""
+import json
+
+import numpy as np
+
+from base_conocimiento import RUTA_REGLAS, BaseConocimiento, _versiones
+from escalador import EscaladorMinMax
+from seleccion_top_k import top_k
+
+
+class BaseConocimientoStreaming:
+    def __init__(self, ruta_dataset, tamano_bloque=100_000):
+        self.ruta_dataset = ruta_dataset
+        self.tamano_bloque = tamano_bloque
+        with open(RUTA_REGLAS, "r") as f:
+            self.reglas_config = json.load(f)["rules"]
+
+        # Primera pasada: estadísticas min/max y columnas de texto, por bloque
+        self.scaler = EscaladorMinMax()
+        self.filas = 0
+        columnas, texto = [], set()
+        for bloque in self._bloques():
+            total = bloque["Accommodation cost"].to_numpy(dtype=float) + bloque["Transportation cost"].to_numpy(dtype=float)
+            self.scaler.partial_fit(np.column_stack([
+                total, bloque["Duration (days)"].to_numpy(dtype=float), bloque["Month"].to_numpy(dtype=float)
+            ]))
+            columnas = list(bloque.columns)
+            texto.update(c for c in bloque.columns if not self._es_numerica(bloque[c]))
+            self.filas += len(bloque)
+        if not self.filas:
+            raise ValueError(f"El catálogo {ruta_dataset} está vacío")
+        # Tipos explícitos para la segunda pasada, iguales en todos los bloques
+        self.tipos = {c: str if c in texto else float for c in columnas}
+        self.version = next(_versiones)
+        print(f"Base de conocimientos (streaming) inicializada: {self.filas} filas.")
+
+    def _bloques(self, **opciones):
+        import pandas as pd
+        with pd.read_csv(self.ruta_dataset, chunksize=self.tamano_bloque, **opciones) as lector:
+            yield from lector
+
+    @staticmethod
+    def _es_numerica(serie):
+        import pandas as pd
+        return pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)
+
+    def _bases(self):
+        """Segunda pasada: una BaseConocimiento por bloque, con el escalado global."""
+        for bloque in self._bloques(dtype=self.tipos):
+            yield BaseConocimiento.desde_bloque(bloque, self.scaler, self.reglas_config)
+
+    @staticmethod
+    def _fusionar(acumulado, parcial, k):
+        """Top-K de la unión de dos resultados parciales, con el mismo orden que top_k."""
+        if parcial.empty:
+            return acumulado
+        if acumulado is None:
+            return parcial
+        import pandas as pd
+        unidos = pd.concat([acumulado, parcial])
+        mejores = unidos.iloc[top_k(unidos["Similarity"].to_numpy(), k, desempate=unidos.index.to_numpy())]
+        # Una columna de texto solo con nulos en un bloque llega como object y arrastra a la unión:
+        # se conserva el tipo de los bloques que sí tienen valores, como en el motor en memoria
+        tipos = {c: t for parte in (acumulado, parcial) for c, t in parte.dtypes.items()
+                 if not (t == object and parte[c].isna().all())}
+        return mejores.astype(tipos)
+
+    def recomendar_destinos(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+                            clima=None, seguridad_min=None, actividades=None, k=6):
+        mejores = None
+        for base in self._bases():
+            parcial = base.recomendar_destinos(presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje,
+                                               clima, seguridad_min, actividades, k=k)
+            mejores = self._fusionar(mejores, parcial, k)
+        return BaseConocimiento._sin_resultados() if mejores is None else mejores
+
+    def recomendar_destinos_batch(self, consultas, k=6):
+        """Recomendaciones de N consultas con una sola lectura del CSV."""
+        consultas = list(consultas)
+        mejores = [None] * len(consultas)
+        if consultas:
+            for base in self._bases():
+                for i, parcial in enumerate(base.recomendar_destinos_batch(consultas, k)):
+                    mejores[i] = self._fusionar(mejores[i], parcial, k)
+        return [BaseConocimiento._sin_resultados() if m is None else m for m in mejores]
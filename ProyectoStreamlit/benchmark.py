@@ -7,6 +7,7 @@ import pandas as pd
 from ProyectoStreamlit.base_conocimiento import BaseConocimiento
 from ProyectoStreamlit.base_hechos import BaseHechos
 from ProyectoStreamlit.motor_inferencia import MotorInferencia
+from ProyectoStreamlit.casos_prueba import test_cases
 
 # --- Carga robusta del CSV ---
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -26,75 +27,6 @@ base_conocimiento = BaseConocimiento(travel_data)
 base_hechos = BaseHechos()
 motor = MotorInferencia(base_conocimiento, base_hechos)
 
-# --- Definición de casos de prueba (total 13 escenarios) ---
-test_cases = [
-    {"name": "Escenario hotel barato",
-     "presupuesto": 1000, "dur_min": 3, "dur_max": 5, "mes": 6, "tipo_hosp": "Hotel"},
-    {"name": "Viaje largo en resort",
-     "presupuesto": 8000, "dur_min": 14, "dur_max": 21, "mes": 12, "tipo_hosp": "Resort"},
-    {"name": "Escapada sin hospedaje",
-     "presupuesto": 2000, "dur_min": 2, "dur_max": 4, "mes": 4, "tipo_hosp": None},
-    # Escenarios adicionales
-    {"name": "Fin de semana en Airbnb barato",
-     "presupuesto": 500,  "dur_min": 1,  "dur_max": 2,  "mes": 3,  "tipo_hosp": "Airbnb"},
-    {"name": "Vacaciones en Villa lujosa",
-     "presupuesto": 15000,"dur_min": 7,  "dur_max": 10, "mes": 8,  "tipo_hosp": "Villa"},
-    {"name": "Semana estándar en hotel",
-     "presupuesto": 3000, "dur_min": 5,  "dur_max": 7,  "mes": 5,  "tipo_hosp": "Hotel"},
-    {"name": "Escapada otoñal sin filtro",
-     "presupuesto": 2500, "dur_min": 4,  "dur_max": 6,  "mes": 10, "tipo_hosp": None},
-    {"name": "Viaje familiar en resort",
-     "presupuesto": 6000, "dur_min": 10, "dur_max": 14, "mes": 7,  "tipo_hosp": "Resort"},
-    {"name": "Escapada febrero low‑cost",
-     "presupuesto": 800,  "dur_min": 3,  "dur_max": 5,  "mes": 2,  "tipo_hosp": None},
-    {"name": "Vacaciones de invierno en hotel",
-     "presupuesto": 12000,"dur_min": 10, "dur_max": 15, "mes": 1,  "tipo_hosp": "Hotel"},
-    {"name": "Viaje de trabajo en Airbnb",
-     "presupuesto": 1800, "dur_min": 2,  "dur_max": 4,  "mes": 11, "tipo_hosp": "Airbnb"},
-    {"name": "Retiro de fin de año en Villa",
-     "presupuesto": 20000,"dur_min": 14, "dur_max": 21, "mes": 12, "tipo_hosp": "Villa"},
-{"name": "Lujo en villa verano",
-     "presupuesto": 15000, "dur_min": 7,  "dur_max": 14, "mes": 7,  "tipo_hosp": "Villa"},
-    {"name": "Vacaciones familiares Airbnb",
-     "presupuesto": 3500, "dur_min": 5,  "dur_max": 10, "mes": 7,  "tipo_hosp": "Airbnb"},
-    {"name": "Escapada rápida en octubre",
-     "presupuesto": 1500, "dur_min": 1,  "dur_max": 3,  "mes": 10, "tipo_hosp": None},
-    {"name": "Viaje cultural en invierno",
-     "presupuesto": 3000, "dur_min": 5,  "dur_max": 10, "mes": 1,  "tipo_hosp": "Hotel"},
-    {"name": "Retiro ecológico primavera",
-     "presupuesto": 2500, "dur_min": 7,  "dur_max": 14, "mes": 5,  "tipo_hosp": "Resort"},
-    {"name": "Fin de semana exprés",
-     "presupuesto": 800,  "dur_min": 2,  "dur_max": 3,  "mes": 9,  "tipo_hosp": "Airbnb"},
-    {"name": "Estudio de idiomas otoño",
-     "presupuesto": 5000, "dur_min": 30, "dur_max": 60, "mes": 9,  "tipo_hosp": "Hotel"},
-    {"name": "Crucero caribeño",
-     "presupuesto": 12000,"dur_min": 5,  "dur_max": 10, "mes": 3,  "tipo_hosp": "Resort"},
-    {"name": "Aventura mochilero",
-     "presupuesto": 1000, "dur_min": 10, "dur_max": 20, "mes": 2,  "tipo_hosp": None},
-    {"name": "Vacaciones extremas",
-     "presupuesto": 4000, "dur_min": 1,  "dur_max": 1,  "mes": 2,  "tipo_hosp": "Airbnb"},
-{"name": "Vacaciones familiares en Airbnb",
-     "presupuesto": 3500, "dur_min": 5, "dur_max": 10, "mes": 7, "tipo_hosp": "Airbnb"},
-    {"name": "Escapada de fin de semana",
-     "presupuesto": 500,  "dur_min": 1, "dur_max": 2, "mes": 3, "tipo_hosp": None},
-    {"name": "Vacaciones de lujo en villa",
-     "presupuesto": 20000,"dur_min": 7, "dur_max": 14,"mes": 8, "tipo_hosp": "Villa"},
-    {"name": "Viaje de negocios estándar",
-     "presupuesto": 1500, "dur_min": 3, "dur_max": 5, "mes": 11, "tipo_hosp": "Hotel"},
-    {"name": "Tour extendido sin filtro",
-     "presupuesto": 6000, "dur_min": 10,"dur_max": 20,"mes": 5, "tipo_hosp": None},
-    {"name": "Vacaciones económicas largas",
-     "presupuesto": 1200, "dur_min": 14,"dur_max": 21,"mes": 9, "tipo_hosp": None},
-    {"name": "Temporada alta en resort",
-     "presupuesto": 10000,"dur_min": 7, "dur_max": 10,"mes": 12,"tipo_hosp": "Resort"},
-    {"name": "Escapada precio medio",
-     "presupuesto": 2500, "dur_min": 4, "dur_max": 6, "mes": 10, "tipo_hosp": "Hotel"},
-    {"name": "Primavera en hotel",
-     "presupuesto": 3000, "dur_min": 5, "dur_max": 8, "mes": 4, "tipo_hosp": "Hotel"},
-    {"name": "Otoño en villa",
-     "presupuesto": 8000, "dur_min": 6, "dur_max": 12, "mes": 10, "tipo_hosp": "Villa"}
-]
-
 # --- Medición ---
 N = 30  # muestras por caso
 records = []
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Costo de una actualización incremental del catálogo vs. reconstruir la base completa.
+
+Simula ticks de un feed de precios: cada tick da de baja `--filas-tick` destinos y los
+vuelve a dar de alta con un precio nuevo (nueva etiqueta de índice).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from base_conocimiento import BaseConocimiento
+from benchmark_indice import catalogo_sintetico, script_dir
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanos", default="1e4,1e5,1e6", help="tamaños de catálogo separados por coma")
+    parser.add_argument("--filas-tick", type=int, default=1000, help="filas reemplazadas por tick")
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    filas = []
+    for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+        datos = catalogo_sintetico(tamano, rng)
+        t0 = time.perf_counter()
+        base = BaseConocimiento(datos)
+        reconstruir_s = time.perf_counter() - t0
+
+        siguiente = tamano
+        altas, bajas = [], []
+        for _ in range(args.ticks):
+            vigentes = base.catalogo.indice if base.indice_filtros.vivas is None else base.catalogo.indice[base.indice_filtros.vivas]
+            etiquetas = rng.choice(vigentes, args.filas_tick, replace=False)
+            t0 = time.perf_counter()
+            base.remove_destinations(etiquetas)
+            bajas.append(time.perf_counter() - t0)
+
+            nuevos = datos.loc[etiquetas[etiquetas < tamano]].copy()
+            nuevos["Accommodation cost"] *= rng.lognormal(0.0, 0.1, len(nuevos))
+            nuevos.index = np.arange(siguiente, siguiente + len(nuevos))
+            siguiente += len(nuevos)
+            t0 = time.perf_counter()
+            base.add_destinations(nuevos)
+            altas.append(time.perf_counter() - t0)
+
+        fila = {"filas": tamano, "reconstruir_s": reconstruir_s, "alta_tick_s": float(np.median(altas)),
+                "baja_tick_s": float(np.median(bajas)), "filas_tick": args.filas_tick}
+        fila["aceleracion"] = reconstruir_s / (fila["alta_tick_s"] + fila["baja_tick_s"])
+        filas.append(fila)
+        print(fila)
+
+    resumen = pd.DataFrame(filas)
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "actualizaciones.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/actualizaciones.csv")
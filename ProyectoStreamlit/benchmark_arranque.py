@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tiempo de importación de los módulos del motor y tiempo hasta la primera recomendación.
+
+Cada medición corre en un proceso nuevo (arranque en frío):
+- `python -X importtime -c "import <módulo>"` por módulo del motor: tiempo acumulado,
+  dependencias más costosas y si se cargó alguna dependencia pesada (sklearn, pandas).
+- Tiempo hasta la primera recomendación construyendo el motor desde el CSV y desde el snapshot.
+
+Sale con código 1 si un módulo supera --max-import-ms o importa una dependencia pesada,
+para que las regresiones se noten en CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# === Parámetros ===
+MODULOS = ["Rule", "base_hechos", "motor_inferencia", "base_conocimiento", "motor_compartido"]
+PESADOS = ["sklearn", "pandas", "scipy", "streamlit"]
+CONSULTA = (1000, 3, 5, 6, None)
+
+PRIMERA_RECOMENDACION = """
+import json, time
+t0 = time.perf_counter()
+from motor_compartido import MotorCompartido
+t_import = time.perf_counter()
+motor = MotorCompartido(ruta_snapshot={snapshot!r}).nueva_sesion()
+t_motor = time.perf_counter()
+motor.base_hechos.ingresar_datos_usuario(*{consulta!r})
+motor.generar_recomendaciones()
+t_fin = time.perf_counter()
+print(json.dumps({{"import_ms": (t_import - t0) * 1e3, "motor_ms": (t_motor - t_import) * 1e3,
+                  "consulta_ms": (t_fin - t_motor) * 1e3, "total_ms": (t_fin - t0) * 1e3}}))
+"""
+
+def importtime(modulo):
+    """Parsea la salida de -X importtime: retorna [(paquete, propio_us, acumulado_us, nivel)]."""
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                             cwd=script_dir, capture_output=True, text=True, check=True)
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        filas.append((nombre.strip(), int(propio), int(acumulado), (len(nombre) - len(nombre.lstrip())) // 2))
+    return filas
+
+def medir_import(modulo):
+    filas = importtime(modulo)
+    # La salida está en post-orden: el subárbol del módulo son las filas previas más anidadas
+    # (así se excluye lo que el intérprete importa al arrancar, p. ej. archivos .pth de site)
+    i = next(i for i, f in enumerate(filas) if f[0] == modulo)
+    nivel, inicio = filas[i][3], i
+    while inicio > 0 and filas[inicio - 1][3] > nivel:
+        inicio -= 1
+    subarbol = filas[inicio:i]
+    paquetes = {nombre.split(".")[0] for nombre, *_ in subarbol}
+    directas = sorted((f for f in subarbol if f[3] == nivel + 1), key=lambda f: -f[2])[:3]
+    return {
+        "modulo": modulo,
+        "import_ms": filas[i][2] / 1e3,
+        "pesados": ",".join(p for p in PESADOS if p in paquetes),
+        "mas_costosos": ", ".join(f"{n} {a / 1e3:.0f}ms" for n, _, a, _ in directas),
+    }
+
+def medir_primera_recomendacion(snapshot):
+    codigo = PRIMERA_RECOMENDACION.format(snapshot=snapshot, consulta=CONSULTA)
+    t0 = time.perf_counter()
+    proceso = subprocess.run([sys.executable, "-c", codigo], cwd=script_dir, capture_output=True, text=True, check=True)
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    resultado["proceso_ms"] = (time.perf_counter() - t0) * 1e3
+    return resultado
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5, help="procesos por medición (se reporta la mediana)")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="falla si un módulo tarda más en importarse")
+    args = parser.parse_args()
+
+    importaciones = []
+    for modulo in MODULOS:
+        medidas = [medir_import(modulo) for _ in range(args.repeticiones)]
+        fila = dict(medidas[0], import_ms=statistics.median(m["import_ms"] for m in medidas))
+        importaciones.append(fila)
+        print(fila)
+
+    arranques = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_snapshot = os.path.join(tmp, "dataset.snapshot")
+        medir_primera_recomendacion(ruta_snapshot)  # genera el snapshot
+        for modo, snapshot in [("csv", None), ("snapshot", ruta_snapshot)]:
+            medidas = [medir_primera_recomendacion(snapshot) for _ in range(args.repeticiones)]
+            fila = {"modo": modo, **{k: statistics.median(m[k] for m in medidas) for k in medidas[0]}}
+            arranques.append(fila)
+            print(fila)
+
+    resumen_import = pd.DataFrame(importaciones)
+    resumen_arranque = pd.DataFrame(arranques)
+    print(resumen_import.to_string(index=False))
+    print(resumen_arranque.to_string(index=False))
+    resumen_import.to_csv(os.path.join(script_dir, "benchmark", "arranque_importacion.csv"), index=False)
+    resumen_arranque.to_csv(os.path.join(script_dir, "benchmark", "arranque_primera_recomendacion.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/arranque_*.csv")
+
+    fallas = [f"{f['modulo']} importa {f['pesados']}" for f in importaciones if f["pesados"]]
+    if args.max_import_ms is not None:
+        fallas += [f"{f['modulo']} tarda {f['import_ms']:.0f} ms" for f in importaciones if f["import_ms"] > args.max_import_ms]
+    if fallas:
+        print("❌ Regresión de arranque: " + "; ".join(fallas))
+        sys.exit(1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tiempo de carga del catálogo: CSV completo vs. formato columnar con proyección de columnas.
+
+Para cada tamaño se escribe el catálogo (dataset real o sintético de generador_catalogo.py) como
+CSV, Parquet y directorio .columnar, y cada formato se mide en un proceso nuevo:
+
+- csv:     pd.read_csv del archivo completo + BaseConocimiento(DataFrame)
+- parquet: BaseConocimiento.desde_columnar(.parquet), solo las columnas necesarias (requiere pyarrow)
+- npy:     BaseConocimiento.desde_columnar(.columnar), solo las columnas necesarias
+
+Se reporta la lectura (archivo → DataFrame o CatalogoColumnar), la construcción total de la
+base, el RSS máximo y el tamaño en disco. Parquet se omite si pyarrow no está instalado.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+import formato_columnar
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+MEDICION = """
+import json, time
+t0 = time.perf_counter()
+import pandas as pd
+import formato_columnar
+from base_conocimiento import BaseConocimiento
+ruta, formato = {ruta!r}, {formato!r}
+t1 = time.perf_counter()
+if formato == "csv":
+    datos = pd.read_csv(ruta)
+else:
+    datos = formato_columnar.leer(ruta, [c for c in BaseConocimiento.columnas_necesarias()
+                                         if c in formato_columnar.columnas_guardadas(ruta)])
+lectura_s = time.perf_counter() - t1
+BaseConocimiento(datos)
+total_s = time.perf_counter() - t1
+with open("/proc/self/status") as f:
+    rss_max_mb = next(int(l.split()[1]) for l in f if l.startswith("VmHWM:")) / 1024
+print(json.dumps({{"lectura_s": lectura_s, "base_s": total_s, "importacion_s": t1 - t0, "rss_max_mb": rss_max_mb}}))
+"""
+
+
+def medir(ruta, formato):
+    codigo = MEDICION.format(ruta=ruta, formato=formato)
+    proceso = subprocess.run([sys.executable, "-c", codigo], cwd=script_dir, capture_output=True, text=True, check=True)
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def tamano_mb(ruta):
+    if os.path.isdir(ruta):
+        return sum(os.path.getsize(os.path.join(ruta, f)) for f in os.listdir(ruta)) / 2**20
+    return os.path.getsize(ruta) / 2**20
+
+
+def formatos_disponibles():
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return ["csv", "parquet", "npy"]
+    except ImportError:
+        print("pyarrow no está instalado: se omite Parquet")
+        return ["csv", "npy"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="0,1e5,1e6", help="filas separadas por coma (0 = dataset real)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    formatos = formatos_disponibles()
+    filas = []
+    with tempfile.TemporaryDirectory() as carpeta:
+        for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+            if tamano:
+                from generador_catalogo import GeneradorCatalogo
+                datos = GeneradorCatalogo.desde_csv().generar(tamano, args.semilla)
+            else:
+                datos = pd.read_csv(os.path.join(script_dir, "cleaned_travel_dataset.csv"))
+            rutas = {"csv": os.path.join(carpeta, "catalogo.csv"), "parquet": os.path.join(carpeta, "catalogo.parquet"),
+                     "npy": os.path.join(carpeta, "catalogo.columnar")}
+            datos.to_csv(rutas["csv"], index=False)
+            for formato in formatos[1:]:
+                formato_columnar.escribir(datos, rutas[formato], formato)
+            n_filas = len(datos)
+            del datos
+            for formato in formatos:
+                for repeticion in range(args.repeticiones):
+                    filas.append({"filas": n_filas, "formato": formato, "repeticion": repeticion,
+                                  "disco_mb": tamano_mb(rutas[formato]), **medir(rutas[formato], formato)})
+                    print(filas[-1])
+            for ruta in rutas.values():
+                shutil.rmtree(ruta) if os.path.isdir(ruta) else os.remove(ruta)
+
+    resumen = pd.DataFrame(filas).groupby(["filas", "formato"], sort=False).agg(
+        lectura_s=("lectura_s", "median"), base_s=("base_s", "median"),
+        rss_max_mb=("rss_max_mb", "max"), disco_mb=("disco_mb", "first")).reset_index()
+    csv = resumen[resumen["formato"] == "csv"].set_index("filas")
+    resumen["aceleracion_lectura"] = resumen["filas"].map(csv["lectura_s"]) / resumen["lectura_s"]
+    resumen["aceleracion_base"] = resumen["filas"].map(csv["base_s"]) / resumen["base_s"]
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "carga.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/carga.csv")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Throughput de la API sin estado (MotorInferencia.recomendar) con N hilos.
+
+Todos los hilos comparten la misma base y el mismo motor; cada consulta es una Consulta
+inmutable. Se verifica que cada hilo obtenga exactamente el resultado de la ejecución en un
+solo hilo y se mide el throughput. La ganancia depende de cuánto tiempo pasa la consulta en
+NumPy con el GIL liberado y de los núcleos disponibles (se reporta `nucleos`).
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from base_conocimiento import BaseConocimiento
+from base_hechos import Consulta
+from benchmark_indice import catalogo_sintetico, consultas_aleatorias, script_dir
+from motor_inferencia import MotorInferencia
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=float, default=1e6, help="filas del catálogo sintético")
+    parser.add_argument("--hilos", default="1,2,4,8", help="cantidades de hilos separadas por coma")
+    parser.add_argument("--rondas", type=int, default=3, help="veces que se repite el conjunto de consultas")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    motor = MotorInferencia(BaseConocimiento(catalogo_sintetico(int(args.filas), rng)))
+    consultas = [Consulta(*c) for c in consultas_aleatorias(rng)] * args.rondas
+    referencia = [motor.recomendar(c) for c in consultas]
+
+    filas = []
+    for n in [int(h) for h in args.hilos.split(",")]:
+        with ThreadPoolExecutor(n) as ejecutor:
+            list(ejecutor.map(motor.recomendar, consultas[:n]))  # calentamiento
+            t0 = time.perf_counter()
+            resultados = list(ejecutor.map(motor.recomendar, consultas))
+            total_s = time.perf_counter() - t0
+        identico = all(a.equals(b) for a, b in zip(referencia, resultados))
+        filas.append({"hilos": n, "consultas": len(consultas), "total_s": total_s,
+                      "consultas_s": len(consultas) / total_s, "identico": identico})
+        print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    resumen["aceleracion"] = resumen["consultas_s"] / resumen["consultas_s"].iloc[0]
+    resumen["filas"] = int(args.filas)
+    resumen["nucleos"] = os.cpu_count()
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "concurrencia.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/concurrencia.csv")
+    if not resumen["identico"].all():
+        print("❌ Las consultas concurrentes no reproducen el resultado de un solo hilo")
+        raise SystemExit(1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Cubo agregado por destino (cubo_destinos.py) vs. BaseConocimiento por viaje.
+
+Para cada tamaño de catálogo (dataset real o sintético de generador_catalogo.py) mide con los
+casos de casos_prueba.py: tiempo de construcción del cubo, grupos y factor de duplicación,
+filas puntuadas por consulta, latencia p50/p99 de consultas individuales, throughput por lotes
+y destinos distintos en el top-K (la base por viaje puede repetir destinos).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from base_conocimiento import BaseConocimiento
+from casos_prueba import consulta, test_cases
+from cubo_destinos import CuboDestinos
+from instrumentacion import METRICAS
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def medir(motor, consultas, rondas, k):
+    """Latencias individuales (ms), consultas/s en lote, filas puntuadas y destinos distintos por consulta."""
+    for c in consultas:
+        motor.recomendar_destinos(*c, k=k)
+    METRICAS.activa = True  # los contadores de filas puntuadas vienen de la instrumentación
+    METRICAS.reiniciar()
+    tiempos = []
+    for _ in range(rondas):
+        for c in consultas:
+            t0 = time.perf_counter_ns()
+            motor.recomendar_destinos(*c, k=k)
+            tiempos.append(time.perf_counter_ns() - t0)
+    contadores = METRICAS.estadisticas()["contadores"]
+    METRICAS.activa = False
+    filas = (contadores.get("filas_puntuadas", 0) + contadores.get("grupos_puntuados", 0)) / len(tiempos)
+    t0 = time.perf_counter()
+    resultados = motor.recomendar_destinos_batch(consultas * rondas, k)
+    lote_s = time.perf_counter() - t0
+    distintos = [r["Destination"].nunique() if len(r) else 0 for r in resultados[:len(consultas)]]
+    tiempos = np.array(tiempos) / 1e6
+    return {
+        "p50_ms": float(np.percentile(tiempos, 50)), "p99_ms": float(np.percentile(tiempos, 99)),
+        "lote_consultas_s": len(consultas) * rondas / lote_s, "filas_por_consulta": filas,
+        "destinos_distintos": float(np.mean(distintos)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanos", default="0,1e5,1e6", help="filas separadas por coma (0 = dataset real)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--rondas", type=int, default=5, help="pasadas por los casos de prueba")
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--estadistico", choices=["mediana", "minimo"], default="mediana")
+    args = parser.parse_args()
+
+    consultas = [tuple(consulta(caso)) for caso in test_cases]
+    filas = []
+    for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+        if tamano:
+            from generador_catalogo import GeneradorCatalogo
+            datos = GeneradorCatalogo.desde_csv().generar(tamano, args.semilla)
+        else:
+            datos = pd.read_csv(os.path.join(script_dir, "cleaned_travel_dataset.csv"))
+        base = BaseConocimiento(datos)
+        del datos
+        t0 = time.perf_counter()
+        cubo = CuboDestinos(base, args.estadistico)
+        construccion_s = time.perf_counter() - t0
+        for modo, motor in (("viajes", base), ("cubo", cubo)):
+            filas.append({"filas": len(base.catalogo), "modo": modo, "grupos": cubo.n_grupos,
+                          "factor_duplicacion": cubo.factor_duplicacion,
+                          "construccion_cubo_s": construccion_s if modo == "cubo" else 0.0,
+                          **medir(motor, consultas, args.rondas, args.k)})
+            print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "cubo.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/cubo.csv")
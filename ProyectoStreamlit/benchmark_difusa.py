@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Reglas difusas: evaluación fila a fila en Python vs. pertenencia vectorizada del plan.
+
+Para cada tamaño de catálogo (dataset real o sintético de generador_catalogo.py) y con las
+reglas difusas de rules.json:
+
+- python:  grado de pertenencia calculado fila a fila (bucle Python por consulta)
+- numpy:   FuzzyRule.apply sobre la columna completa (una operación NumPy por término)
+- plan:    solo la parte difusa del plan compilado (términos del catálogo ya precalculados)
+- lote:    la parte difusa de N consultas en una matriz N × M
+
+Las tres rutas por consulta deben dar los mismos grados. También se reporta el costo de la
+consulta completa con y sin las reglas difusas.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import Rule as rl
+from base_conocimiento import BaseConocimiento, RUTA_REGLAS
+from casos_prueba import consulta, test_cases
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def grado_por_fila(rule, entrada, datos):
+    """Ruta sin vectorizar: una pertenencia por fila y término."""
+    columnas = {t["columna"]: datos[t["columna"]].tolist() for t in rule.terminos}
+    grados = []
+    for i in range(len(datos)):
+        por_termino = []
+        for t in rule.terminos:
+            valor = columnas[t["columna"]][i]
+            if t["relativo"] == "cociente":
+                valor = valor / entrada[rule.COLUMNAS_CONSULTA.index(t["columna"])]
+            elif t["relativo"] == "diferencia":
+                valor = valor - entrada[rule.COLUMNAS_CONSULTA.index(t["columna"])]
+            a, b, c, d = t["puntos"]
+            grado = 1.0
+            if a is not None:
+                grado = min(grado, (valor - a) / (b - a) if b > a else float(valor >= a))
+            if d is not None:
+                grado = min(grado, (d - valor) / (d - c) if d > c else float(valor <= d))
+            por_termino.append(min(max(grado, 0.0), 1.0))
+        grados.append(min(por_termino) if rule.operador == "and" else max(por_termino))
+    return np.array(grados)
+
+
+def parte_difusa(plan, entradas):
+    out = np.zeros((len(entradas), len(plan.estatico)))
+    return plan._sumar_difusas(np.asarray(entradas, dtype=float), slice(None), out)
+
+
+def cronometrar(funcion, repeticiones):
+    funcion()
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - t0) / repeticiones * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="0,1e5,1e6", help="filas separadas por coma (0 = dataset real)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--lote", type=int, default=256, help="consultas por lote")
+    args = parser.parse_args()
+
+    with open(RUTA_REGLAS) as f:
+        reglas = json.load(f)["rules"]
+    if not any(rule["type"] == "fuzzy" for rule in reglas):
+        raise SystemExit("rules.json no tiene reglas difusas")
+    sin_difusas = [rule for rule in reglas if rule["type"] != "fuzzy"]
+    consultas = [tuple(consulta(caso))[:5] for caso in test_cases]
+    entradas = [BaseConocimiento._entrada(*c[:4]) for c in consultas]
+
+    filas = []
+    for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+        if tamano:
+            from generador_catalogo import GeneradorCatalogo
+            datos = GeneradorCatalogo.desde_csv().generar(tamano, args.semilla)
+        else:
+            datos = pd.read_csv(os.path.join(script_dir, "cleaned_travel_dataset.csv"))
+        base = BaseConocimiento(datos)
+        del datos
+        estado = base.estado
+        # Columnas en el orden físico del catálogo, el mismo de los arreglos del plan
+        catalogo = estado.catalogo.a_dataframe()
+        peso_total = estado.plan.peso_base
+        difusas = [(rule, rule.weight / peso_total) for rule in estado.rules if isinstance(rule, rl.FuzzyRule)]
+
+        entrada = entradas[0]
+        esperado = sum(peso * rule.apply(entrada, catalogo) for rule, peso in difusas)
+        assert np.allclose(esperado, sum(peso * grado_por_fila(rule, entrada, catalogo) for rule, peso in difusas))
+        # Las reglas sin términos relativos ya están en el vector estático del plan
+        relativas = sum(peso * rule.apply(entrada, catalogo) for rule, peso in difusas
+                        if any(t["relativo"] for t in rule.terminos))
+        assert np.allclose(relativas, parte_difusa(estado.plan, [entrada])[0]), "El plan no coincide con las reglas"
+
+        repeticiones_python = 1 if len(catalogo) > 10_000 else args.repeticiones
+        resultado = {
+            "filas": len(catalogo),
+            "python_ms": cronometrar(lambda: [grado_por_fila(rule, entrada, catalogo) for rule, _ in difusas],
+                                     repeticiones_python),
+            "numpy_ms": cronometrar(lambda: [rule.apply(entrada, catalogo) for rule, _ in difusas], args.repeticiones),
+            "plan_ms": cronometrar(lambda: parte_difusa(estado.plan, [entrada]), args.repeticiones),
+        }
+        lote = (entradas * (args.lote // len(entradas) + 1))[:args.lote]
+        resultado["lote_por_consulta_ms"] = cronometrar(lambda: parte_difusa(estado.plan, lote), 1) / len(lote)
+        resultado["consulta_ms"] = cronometrar(lambda: [base.recomendar_destinos(*c) for c in consultas],
+                                               args.repeticiones) / len(consultas)
+        base.recargar_reglas(sin_difusas)
+        resultado["consulta_sin_difusas_ms"] = cronometrar(lambda: [base.recomendar_destinos(*c) for c in consultas],
+                                                           args.repeticiones) / len(consultas)
+        filas.append(resultado)
+        print(resultado)
+
+    resumen = pd.DataFrame(filas)
+    resumen["aceleracion_plan"] = resumen["python_ms"] / resumen["plan_ms"]
+    resumen["sobrecosto_consulta"] = resumen["consulta_ms"] / resumen["consulta_sin_difusas_ms"]
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "difusa.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/difusa.csv")
@@ -1,74 +1,297 @@
 #!/usr/bin/env python3
+"""Energía por inferencia (J y J/1000 recomendaciones) en modo individual, por lotes y multinúcleo.
+
+Fuente de energía:
+- RAPL (Linux powercap, /sys/class/powercap/intel-rapl:N/energy_uj) si los contadores existen y
+  son legibles: se reporta la energía del paquete descontando el consumo en reposo medido antes.
+- Si no, un modelo por tiempo de CPU: J = segundos de CPU del proceso y sus hijos × vatios por
+  núcleo. El valor sale de benchmark/energia_calibracion.json (generado con --calibrar en una
+  máquina con RAPL) o, sin calibración, de la estimación TDP_W / NUCLEOS_TDP.
+
+El muestreo corre en un proceso aparte (no compite por el GIL con la inferencia): lee los
+contadores RAPL cada `--intervalo` s (corrigiendo el desborde) y el tiempo de CPU de la
+inferencia y de sus procesos hijos (p. ej. el pool del modo multinúcleo) con psutil, o desde
+/proc si psutil no está instalado. Sin ninguna de las dos fuentes (p. ej. macOS sin psutil) el
+benchmark se detiene en lugar de reportar 0 J.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
 import os
 import time
-import threading
-import psutil
-import numpy as np
+
 import pandas as pd
-from motor_inferencia import MotorInferencia
+
+try:
+    import psutil
+except ImportError:  # se usa /proc como alternativa en Linux
+    psutil = None
+
 from base_conocimiento import BaseConocimiento
-from base_hechos import BaseHechos
+from casos_prueba import consulta, test_cases
+from motor_inferencia import MotorInferencia
 
-# === Carga del dataset ===
 script_dir = os.path.dirname(os.path.abspath(__file__))
-paths = [
-    os.path.join(script_dir, "cleaned_travel_dataset.csv"),
-    os.path.join(script_dir, "ProyectoStreamlit", "cleaned_travel_dataset.csv"),
-]
-for p in paths:
-    if os.path.exists(p):
-        travel_data = pd.read_csv(p)
-        break
-else:
-    raise FileNotFoundError(f"No cleaned_travel_dataset.csv en {paths}")
-
-# === Inicialización del sistema ===
-base_conocimiento = BaseConocimiento(travel_data)
-base_hechos      = BaseHechos()
-motor            = MotorInferencia(base_conocimiento, base_hechos)
-
-# === Parámetros ===
-TDP_W           = 20.0    # vatios estimados para M2
-N_MUESTRAS      = 30      # número de mediciones
-SAMPLE_INTERVAL = 0.1     # s, muestreo de CPU
-BATCH_SIZE      = 1000    # inferencias por medición
-
-# Datos de usuario (ajusta según tu caso real)
-PRESUPUESTO, DUR_MIN, DUR_MAX, MES, TIPO_HOSP = 1000, 3, 7, 6, None
-
-def batch_inference():
-    """Ejecuta BATCH_SIZE inferencias seguidas."""
-    base_hechos.ingresar_datos_usuario(PRESUPUESTO, DUR_MIN, DUR_MAX, MES, TIPO_HOSP)
-    for _ in range(BATCH_SIZE):
-        motor.generar_recomendaciones()
-
-def measure_energy():
-    """Mide runtime, uso de CPU y energía para BATCH_SIZE inferencias."""
-    cpu_samples = []
-    thread = threading.Thread(target=batch_inference)
-    start_time = time.time()
-    thread.start()
-    while thread.is_alive():
-        cpu_samples.append(psutil.cpu_percent(interval=SAMPLE_INTERVAL))
-    runtime = time.time() - start_time            # tiempo total batch (s)
-    avg_cpu = np.mean(cpu_samples) if cpu_samples else 0.0
-
-    avg_power_w = (avg_cpu / 100.0) * TDP_W        # vatios
-    energy_j    = avg_power_w * runtime           # julios
-    energy_kwh  = energy_j / 3_600_000            # kWh
-
-    # Energía por inferencia:
-    energy_j_per = energy_j / BATCH_SIZE
-    energy_kwh_per = energy_kwh / BATCH_SIZE
-
-    return runtime, avg_cpu, energy_j_per, energy_kwh_per
+RUTA_CALIBRACION = os.path.join(script_dir, "benchmark", "energia_calibracion.json")
+# Estimación sin calibrar (la del script original): 20 W de TDP repartidos en 8 núcleos (M2)
+TDP_W = 20.0
+NUCLEOS_TDP = 8
+TICKS_S = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def dominios_rapl():
+    """Contadores de energía por paquete legibles: [(ruta energy_uj, rango máximo en µJ)]."""
+    dominios = []
+    for carpeta in sorted(glob.glob("/sys/class/powercap/intel-rapl:*")):
+        if carpeta.count(":") != 1:  # solo paquetes, no subdominios (core, uncore, dram)
+            continue
+        try:
+            with open(os.path.join(carpeta, "energy_uj")) as f:
+                int(f.read())
+            with open(os.path.join(carpeta, "max_energy_range_uj")) as f:
+                dominios.append((os.path.join(carpeta, "energy_uj"), int(f.read())))
+        except (OSError, ValueError):
+            continue
+    return dominios
+
+
+def _leer_uj(dominios):
+    lecturas = []
+    for ruta, _ in dominios:
+        with open(ruta) as f:
+            lecturas.append(int(f.read()))
+    return lecturas
+
+
+def fuente_cpu():
+    """Fuente del tiempo de CPU por proceso; error si no hay ninguna (el modelo daría 0 J)."""
+    if psutil is not None:
+        return "psutil"
+    if os.path.exists(f"/proc/{os.getpid()}/stat"):
+        return "proc"
+    raise RuntimeError("No hay fuente de tiempo de CPU por proceso: instala psutil (pip install psutil)")
+
+
+def _tiempos_cpu(pid_raiz, excluir):
+    """Segundos de CPU (usuario + sistema) de pid_raiz y de todos sus descendientes vivos."""
+    if fuente_cpu() == "psutil":
+        return _tiempos_cpu_psutil(pid_raiz, excluir)
+    return _tiempos_cpu_proc(pid_raiz, excluir)
+
+
+def _tiempos_cpu_psutil(pid_raiz, excluir):
+    raiz = psutil.Process(pid_raiz)
+    resultado = {}
+    for proceso in [raiz] + raiz.children(recursive=True):
+        if proceso.pid == excluir:
+            continue
+        try:
+            tiempos = proceso.cpu_times()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        resultado[proceso.pid] = tiempos.user + tiempos.system
+    return resultado
+
+
+def _tiempos_cpu_proc(pid_raiz, excluir):
+    padres, tiempos = {}, {}
+    for ruta in glob.glob("/proc/[0-9]*/stat"):
+        try:
+            with open(ruta) as f:
+                campos = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        pid = int(ruta.split("/")[2])
+        padres[pid] = int(campos[1])
+        tiempos[pid] = (int(campos[11]) + int(campos[12])) / TICKS_S
+    resultado = {}
+    for pid in tiempos:
+        actual = pid
+        while actual in padres and actual != pid_raiz and actual > 1:
+            actual = padres[actual]
+        if actual == pid_raiz and pid != excluir:
+            resultado[pid] = tiempos[pid]
+    return resultado
+
+
+def _muestreador(pid, intervalo, conexion):
+    """Proceso muestreador: acumula energía RAPL y CPU de `pid` hasta recibir 'fin'."""
+    dominios = dominios_rapl()
+    propio = os.getpid()
+    previas = _leer_uj(dominios)
+    iniciales = _tiempos_cpu(pid, propio)
+    ultimos = dict(iniciales)
+    energia_uj = 0
+    conexion.send("listo")
+
+    def muestrear():
+        nonlocal previas, energia_uj
+        actuales = _leer_uj(dominios)
+        for (_, rango), antes, ahora in zip(dominios, previas, actuales):
+            energia_uj += ahora - antes if ahora >= antes else ahora + rango - antes
+        previas = actuales
+        # Se conserva el último valor de cada proceso, aunque termine antes del final
+        ultimos.update(_tiempos_cpu(pid, propio))
+
+    while not conexion.poll(intervalo):
+        muestrear()
+    conexion.recv()
+    muestrear()
+    cpu_s = sum(t - iniciales.get(p, 0.0) for p, t in ultimos.items())
+    conexion.send({"rapl_j": energia_uj / 1e6 if dominios else None, "cpu_s": cpu_s})
+
+
+class Medicion:
+    """Mide energía y CPU de un bloque de código con un proceso muestreador separado."""
+
+    def __init__(self, intervalo=0.1):
+        self.intervalo = intervalo
+        self._contexto = multiprocessing.get_context("spawn")
+
+    def __enter__(self):
+        fuente_cpu()
+        self._conexion, remoto = self._contexto.Pipe()
+        self._proceso = self._contexto.Process(target=_muestreador, args=(os.getpid(), self.intervalo, remoto), daemon=True)
+        self._proceso.start()
+        self._conexion.recv()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tiempo_s = time.perf_counter() - self._t0
+        self._conexion.send("fin")
+        self.resultado = self._conexion.recv()
+        self._proceso.join()
+
+
+def potencia_reposo(segundos, intervalo):
+    """Vatios del paquete sin carga del benchmark (None sin RAPL)."""
+    with Medicion(intervalo) as medicion:
+        time.sleep(segundos)
+    rapl_j = medicion.resultado["rapl_j"]
+    return None if rapl_j is None else rapl_j / medicion.tiempo_s
+
+
+def _ocupar(segundos):
+    fin = time.perf_counter() + segundos
+    x = 0
+    while time.perf_counter() < fin:
+        x += 1
+    return x
+
+
+def calibrar(segundos, intervalo):
+    """Vatios por núcleo ocupado (sobre el reposo), medidos con RAPL; se guardan para el modelo por CPU."""
+    reposo_w = potencia_reposo(segundos, intervalo)
+    if reposo_w is None:
+        raise SystemExit("La calibración requiere contadores RAPL legibles (/sys/class/powercap)")
+    nucleos = os.cpu_count()
+    with Medicion(intervalo) as medicion:
+        with multiprocessing.get_context("spawn").Pool(nucleos) as pool:
+            pool.map(_ocupar, [segundos] * nucleos)
+    dinamica_j = medicion.resultado["rapl_j"] - reposo_w * medicion.tiempo_s
+    calibracion = {"vatios_por_nucleo": dinamica_j / medicion.resultado["cpu_s"], "vatios_reposo": reposo_w,
+                   "nucleos": nucleos, "fecha": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    with open(RUTA_CALIBRACION, "w") as f:
+        json.dump(calibracion, f, indent=2)
+    print(f"▶️ Calibración guardada en {os.path.relpath(RUTA_CALIBRACION, script_dir)}: {calibracion}")
+
+
+def vatios_por_nucleo():
+    try:
+        with open(RUTA_CALIBRACION) as f:
+            return json.load(f)["vatios_por_nucleo"], "modelo_cpu_calibrado"
+    except (OSError, ValueError, KeyError):
+        return TDP_W / NUCLEOS_TDP, "modelo_cpu_estimado"
+
+
+def cargas(motor, consultas, tamano_lote, procesos):
+    """Modos de ejecución a medir: nombre → función que resuelve todas las consultas."""
+    def individual():
+        for c in consultas:
+            motor.recomendar(c)
+
+    def lotes():
+        for inicio in range(0, len(consultas), tamano_lote):
+            motor.recomendar_batch(consultas[inicio:inicio + tamano_lote])
+
+    modos = {"individual": (individual, None), "lote": (lotes, None)}
+    if procesos:
+        from motor_particionado import BaseConocimientoParticionada
+        particionada = BaseConocimientoParticionada(motor.base_conocimiento, procesos)
+        particionada.recomendar_destinos_batch(consultas[:1])  # levanta el pool fuera de la medición
+
+        def multinucleo():
+            for inicio in range(0, len(consultas), tamano_lote):
+                particionada.recomendar_destinos_batch([tuple(c) for c in consultas[inicio:inicio + tamano_lote]])
+
+        modos[f"multinucleo_{procesos}p"] = (multinucleo, particionada.cerrar)
+    return modos
+
 
 if __name__ == "__main__":
-    results = [measure_energy() for _ in range(N_MUESTRAS)]
-    runtimes, cpus, joules_per, kwhs_per = zip(*results)
-
-    print(f"\n=== Energía (por inferencia) en {N_MUESTRAS} muestras de {BATCH_SIZE} inf. cada una ===")
-    print(f"Tiempo batch medio      : {np.mean(runtimes):.3f} s  ± {np.std(runtimes):.3f}")
-    print(f"Uso CPU medio           : {np.mean(cpus):.1f}%    ± {np.std(cpus):.1f}")
-    print(f"Energía por inferencia  : {np.mean(joules_per):.6f} J  ± {np.std(joules_per):.6f}")
-    print(f"Energía por inferencia  : {np.mean(kwhs_per):.9f} kWh ± {np.std(kwhs_per):.9f}")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inferencias", type=int, default=1000, help="recomendaciones por medición")
+    parser.add_argument("--repeticiones", type=int, default=5, help="mediciones por modo")
+    parser.add_argument("--tamano-lote", type=int, default=64)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(), help="procesos del modo multinúcleo (0 = omitirlo)")
+    parser.add_argument("--filas", type=float, default=0, help="catálogo sintético de este tamaño (0 = dataset real)")
+    parser.add_argument("--intervalo", type=float, default=0.1, help="período de muestreo (s)")
+    parser.add_argument("--reposo-s", type=float, default=2.0, help="duración de la medición en reposo (s)")
+    parser.add_argument("--calibrar", action="store_true", help="calibrar el modelo por CPU con RAPL y salir")
+    args = parser.parse_args()
+
+    if args.calibrar:
+        calibrar(args.reposo_s, args.intervalo)
+        raise SystemExit(0)
+
+    if args.filas:
+        from generador_catalogo import GeneradorCatalogo
+        datos = GeneradorCatalogo.desde_csv().generar(int(args.filas))
+    else:
+        datos = pd.read_csv(os.path.join(script_dir, "cleaned_travel_dataset.csv"))
+    # Sin caché de resultados: se mide la inferencia, no los aciertos
+    motor = MotorInferencia(BaseConocimiento(datos))
+    consultas = [consulta(test_cases[i % len(test_cases)]) for i in range(args.inferencias)]
+
+    reposo_w = potencia_reposo(args.reposo_s, args.intervalo)
+    vatios_nucleo, fuente_modelo = vatios_por_nucleo()
+    print(f"Fuente de energía: {'RAPL' if reposo_w is not None else fuente_modelo}"
+          + (f" (reposo {reposo_w:.2f} W)" if reposo_w is not None else f" ({vatios_nucleo:.2f} W por núcleo)")
+          + f", tiempo de CPU: {fuente_cpu()}")
+
+    filas = []
+    for modo, (carga, cerrar) in cargas(motor, consultas, args.tamano_lote, args.procesos).items():
+        carga()  # calentamiento
+        for repeticion in range(args.repeticiones):
+            with Medicion(args.intervalo) as medicion:
+                carga()
+            resultado = medicion.resultado
+            if resultado["cpu_s"] <= 0:
+                raise RuntimeError(f"Tiempo de CPU nulo en el modo {modo} (fuente {fuente_cpu()}): "
+                                   "la fuente no lo registra o la carga es muy corta (sube --inferencias)")
+            modelo_j = resultado["cpu_s"] * vatios_nucleo
+            if resultado["rapl_j"] is not None:
+                energia_j, fuente = resultado["rapl_j"] - reposo_w * medicion.tiempo_s, "rapl"
+            else:
+                energia_j, fuente = modelo_j, fuente_modelo
+            filas.append({"modo": modo, "repeticion": repeticion, "tiempo_s": medicion.tiempo_s,
+                          "cpu_s": resultado["cpu_s"], "rapl_total_j": resultado["rapl_j"], "modelo_cpu_j": modelo_j,
+                          "energia_j": energia_j, "fuente": fuente})
+            print(filas[-1])
+        if cerrar is not None:
+            cerrar()
+
+    detalle = pd.DataFrame(filas)
+    resumen = detalle.groupby("modo", sort=False).agg(
+        tiempo_s=("tiempo_s", "mean"), cpu_s=("cpu_s", "mean"), energia_j=("energia_j", "mean"),
+        energia_std_j=("energia_j", "std"), fuente=("fuente", "first")).reset_index()
+    resumen["inferencias"] = args.inferencias
+    resumen["j_por_inferencia"] = resumen["energia_j"] / args.inferencias
+    resumen["j_por_1000"] = resumen["j_por_inferencia"] * 1000
+    resumen["inferencias_s"] = args.inferencias / resumen["tiempo_s"]
+    resumen["filas_catalogo"] = int(args.filas) or len(datos)
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "energia.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/energia.csv")
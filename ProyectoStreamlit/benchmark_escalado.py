@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Curva de escalado de MotorInferencia: latencia, throughput y memoria vs. tamaño del catálogo.
+
+Cada tamaño se mide en un proceso nuevo sobre un catálogo de generador_catalogo.py (misma
+semilla, así que cada catálogo es prefijo del siguiente). Se usan los casos de casos_prueba.py:
+latencia p50/p99 de consultas individuales en caliente, throughput de un lote y RSS máximo.
+`ns_por_fila` (latencia p50 / filas) muestra dónde el motor deja de ser lineal. Si matplotlib
+está instalado, además se guarda el gráfico en benchmark/escalado.png.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+MEDICION = """
+import json, time
+import numpy as np
+from base_conocimiento import BaseConocimiento
+from casos_prueba import consulta, test_cases
+from generador_catalogo import GeneradorCatalogo
+from motor_inferencia import MotorInferencia
+filas, semilla, rondas = {filas!r}, {semilla!r}, {rondas!r}
+catalogo = GeneradorCatalogo.desde_csv().generar(filas, semilla)
+with open("/proc/self/status") as f:
+    rss_datos_mb = next(int(l.split()[1]) for l in f if l.startswith("VmRSS:")) / 1024
+t0 = time.perf_counter()
+motor = MotorInferencia(BaseConocimiento(catalogo))
+construccion_s = time.perf_counter() - t0
+del catalogo
+consultas = [consulta(caso) for caso in test_cases]
+for c in consultas:
+    motor.recomendar(c)
+tiempos = []
+for _ in range(rondas):
+    for c in consultas:
+        t0 = time.perf_counter_ns()
+        motor.recomendar(c)
+        tiempos.append(time.perf_counter_ns() - t0)
+t0 = time.perf_counter()
+motor.recomendar_batch(consultas * rondas)
+lote_s = time.perf_counter() - t0
+tiempos = np.array(tiempos) / 1e6
+# VmHWM es el pico de este proceso; ru_maxrss en Linux arrastra el RSS del padre
+with open("/proc/self/status") as f:
+    rss_max_mb = next(int(l.split()[1]) for l in f if l.startswith("VmHWM:")) / 1024
+print(json.dumps({{
+    "construccion_s": construccion_s, "p50_ms": float(np.percentile(tiempos, 50)),
+    "p99_ms": float(np.percentile(tiempos, 99)), "consultas_s": len(tiempos) / (tiempos.sum() / 1e3),
+    "lote_consultas_s": len(consultas) * rondas / lote_s, "rss_max_mb": rss_max_mb, "rss_catalogo_mb": rss_datos_mb,
+}}))
+"""
+
+
+def medir(filas, semilla, rondas):
+    codigo = MEDICION.format(filas=filas, semilla=semilla, rondas=rondas)
+    proceso = subprocess.run([sys.executable, "-c", codigo], cwd=script_dir, capture_output=True, text=True, check=True)
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def graficar(resumen, ruta):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib no está instalado: se omite el gráfico")
+        return
+    figura, ejes = plt.subplots(1, 3, figsize=(15, 4))
+    for eje, columnas, titulo in [
+        (ejes[0], ["p50_ms", "p99_ms"], "Latencia (ms)"),
+        (ejes[1], ["consultas_s", "lote_consultas_s"], "Throughput (consultas/s)"),
+        (ejes[2], ["rss_max_mb"], "RSS máximo (MB)"),
+    ]:
+        for columna in columnas:
+            eje.plot(resumen["filas"], resumen[columna], marker="o", label=columna)
+        eje.set_xscale("log")
+        eje.set_yscale("log")
+        eje.set_xlabel("filas del catálogo")
+        eje.set_title(titulo)
+        eje.legend()
+    figura.tight_layout()
+    figura.savefig(ruta)
+    print(f"▶️ Gráfico guardado en {os.path.relpath(ruta, script_dir)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanos", default="1e3,1e4,1e5,1e6,1e7", help="tamaños de catálogo separados por coma")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--rondas", type=int, default=5, help="pasadas por los casos de prueba")
+    args = parser.parse_args()
+
+    filas = []
+    for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+        filas.append({"filas": tamano, **medir(tamano, args.semilla, args.rondas)})
+        print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    resumen["ns_por_fila"] = resumen["p50_ms"] * 1e6 / resumen["filas"]
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "escalado.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/escalado.csv")
+    graficar(resumen, os.path.join(script_dir, "benchmark", "escalado.png"))
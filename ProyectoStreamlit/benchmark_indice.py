@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Latencia y recall@6 del índice de similitud exacto vs. IVF al crecer el catálogo."""
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from base_conocimiento import BaseConocimiento
+
+# === Carga del dataset ===
+script_dir = os.path.dirname(os.path.abspath(__file__))
+paths = [
+    os.path.join(script_dir, "cleaned_travel_dataset.csv"),
+    os.path.join(script_dir, "ProyectoStreamlit", "cleaned_travel_dataset.csv"),
+]
+for p in paths:
+    if os.path.exists(p):
+        travel_data = pd.read_csv(p)
+        break
+else:
+    raise FileNotFoundError(f"No cleaned_travel_dataset.csv en {paths}")
+
+# === Parámetros ===
+K = 6
+N_CONSULTAS = 50
+COLUMNAS = ["Destination", "Month", "Duration (days)", "Accommodation type", "Accommodation cost", "Transportation cost"]
+TIPOS = [None, "Hotel", "Resort", "Hostel", "Airbnb"]
+
+def catalogo_sintetico(n_filas, rng):
+    """Remuestrea el dataset con ruido en costos, duración y mes (solo columnas de la ruta de consulta)."""
+    base = travel_data[COLUMNAS].iloc[rng.integers(0, len(travel_data), n_filas)].reset_index(drop=True)
+    base["Accommodation cost"] *= rng.lognormal(0.0, 0.3, n_filas)
+    base["Transportation cost"] *= rng.lognormal(0.0, 0.3, n_filas)
+    base["Duration (days)"] = np.clip(base["Duration (days)"] + rng.integers(-2, 3, n_filas), 1, None)
+    base["Month"] = (base["Month"] - 1 + rng.integers(-1, 2, n_filas)) % 12 + 1
+    return base
+
+def consultas_aleatorias(rng):
+    consultas = []
+    for _ in range(N_CONSULTAS):
+        dur_min = int(rng.integers(1, 15))
+        consultas.append((float(rng.choice([500, 1000, 2000, 3000, 5000, 10000])), dur_min,
+                          dur_min + int(rng.integers(0, 8)), int(rng.integers(1, 13)), TIPOS[rng.integers(0, len(TIPOS))]))
+    return consultas
+
+def medir_ms(funcion, consultas):
+    t0 = time.perf_counter()
+    resultados = [funcion(*c) for c in consultas]
+    return (time.perf_counter() - t0) / len(consultas) * 1e3, resultados
+
+def recall(exactos, aproximados):
+    """Fracción del top-K exacto recuperada; un empate con el K-ésimo puntaje exacto cuenta como acierto."""
+    aciertos = []
+    for e, a in zip(exactos, aproximados):
+        if e.empty:
+            continue
+        umbral = e["Similarity"].min() - 1e-12
+        aciertos.append(min(len(e), int((a["Similarity"] >= umbral).sum()) if not a.empty else 0) / len(e))
+    return float(np.mean(aciertos)) if aciertos else 1.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanos", default="1e3,1e4,1e5,1e6,1e7", help="tamaños de catálogo separados por coma")
+    parser.add_argument("--sondeos", default="4,16,64", help="valores de n_sondeos para IVF")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    consultas = consultas_aleatorias(rng)
+    filas = []
+    for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+        datos = catalogo_sintetico(tamano, rng)
+        exacto = BaseConocimiento(datos)
+
+        # Ruta exacta original: cosine_similarity de sklearn contra toda la matriz normalizada
+        escaladas = [exacto.plan.escalar([exacto._entrada(*c[:4])]) for c in consultas]
+        t0 = time.perf_counter()
+        for q in escaladas:
+            cosine_similarity(q, exacto.normalized_data)
+        t_sklearn = (time.perf_counter() - t0) / len(escaladas) * 1e3
+
+        t_exacto, esperados = medir_ms(exacto.recomendar_destinos, consultas)
+        fila = {"filas": tamano, "sklearn_coseno_ms": t_sklearn, "exacto_ms": t_exacto}
+        for sondeos in [int(s) for s in args.sondeos.split(",")]:
+            t0 = time.perf_counter()
+            aproximado = BaseConocimiento(datos, indice="ivf", opciones_indice={"n_sondeos": sondeos})
+            fila[f"ivf{sondeos}_construccion_s"] = time.perf_counter() - t0
+            t_ivf, obtenidos = medir_ms(aproximado.recomendar_destinos, consultas)
+            fila[f"ivf{sondeos}_ms"] = t_ivf
+            fila[f"ivf{sondeos}_recall@{K}"] = recall(esperados, obtenidos)
+            del aproximado
+        del datos, exacto
+        filas.append(fila)
+        print(fila)
+
+    resumen = pd.DataFrame(filas)
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "indice_similitud.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/indice_similitud.csv")
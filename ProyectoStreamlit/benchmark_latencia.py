@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Latencia por caso (percentiles) con los casos de casos_prueba.py, y comparación contra una línea base.
+
+- medir: mide con perf_counter_ns. En frío, cada repetición es un proceso nuevo que construye
+  el motor y resuelve cada caso una vez. En caliente, tras `--calentamiento` ejecuciones,
+  toma `--muestras` por caso. Reporta p50/p90/p99/max (ms) por caso y escribe un JSON.
+  El resultado (benchmark/latencia.json) no se versiona; solo la línea base.
+- comparar: contrasta un JSON con la línea base y marca los casos cuya métrica empeora más
+  que `--umbral` (fracción). Termina con código 1 si hay regresiones.
+
+Uso:
+    python benchmark_latencia.py medir [--guardar-linea-base]
+    python benchmark_latencia.py comparar [--actual benchmark/latencia.json] [--umbral 0.1]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+RUTA_DATASET = os.path.join(script_dir, "cleaned_travel_dataset.csv")
+RUTA_RESULTADO = os.path.join(script_dir, "benchmark", "latencia.json")
+RUTA_LINEA_BASE = os.path.join(script_dir, "benchmark", "latencia_base.json")
+PERCENTILES = {"p50": 50, "p90": 90, "p99": 99}
+
+
+def resumen_ms(muestras_ns):
+    muestras = np.asarray(muestras_ns, dtype=float) / 1e6
+    resumen = {nombre: float(np.percentile(muestras, p)) for nombre, p in PERCENTILES.items()}
+    resumen.update(max=float(muestras.max()), media=float(muestras.mean()), n=len(muestras))
+    return resumen
+
+
+def crear_motor(ruta_dataset):
+    import pandas as pd
+    from base_conocimiento import BaseConocimiento
+    from motor_inferencia import MotorInferencia
+    # Sin caché de resultados: se mide el motor, no los aciertos
+    return MotorInferencia(BaseConocimiento(pd.read_csv(ruta_dataset)))
+
+
+def medir_frio(ruta_dataset):
+    """Un proceso recién iniciado: importación + construcción del motor y primera consulta de cada caso."""
+    t0 = time.perf_counter_ns()
+    from casos_prueba import consulta, test_cases
+    motor = crear_motor(ruta_dataset)
+    arranque_ns = time.perf_counter_ns() - t0
+    casos = {}
+    for caso in test_cases:
+        t0 = time.perf_counter_ns()
+        motor.recomendar(consulta(caso))
+        casos[caso["name"]] = time.perf_counter_ns() - t0
+    return {"arranque_ns": arranque_ns, "casos_ns": casos}
+
+
+def medir_caliente(ruta_dataset, muestras, calentamiento):
+    from casos_prueba import consulta, test_cases
+    motor = crear_motor(ruta_dataset)
+    resultados = {}
+    for caso in test_cases:
+        entrada = consulta(caso)
+        for _ in range(calentamiento):
+            motor.recomendar(entrada)
+        tiempos = np.empty(muestras, dtype=np.int64)
+        for i in range(muestras):
+            t0 = time.perf_counter_ns()
+            motor.recomendar(entrada)
+            tiempos[i] = time.perf_counter_ns() - t0
+        resultados[caso["name"]] = tiempos
+    return resultados
+
+
+def medir(args):
+    frios = []
+    for _ in range(args.repeticiones_frio):
+        proceso = subprocess.run([sys.executable, os.path.abspath(__file__), "_frio", "--dataset", args.dataset],
+                                 cwd=script_dir, capture_output=True, text=True, check=True)
+        frios.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+    calientes = medir_caliente(args.dataset, args.muestras, args.calentamiento)
+
+    resultado = {
+        "metadatos": {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "procesador": platform.processor() or platform.machine(),
+            "dataset": os.path.basename(args.dataset),
+            "muestras": args.muestras,
+            "calentamiento": args.calentamiento,
+            "repeticiones_frio": args.repeticiones_frio,
+        },
+        "arranque_ms": resumen_ms([f["arranque_ns"] for f in frios]),
+        "casos": {
+            nombre: {"caliente_ms": resumen_ms(tiempos), "frio_ms": resumen_ms([f["casos_ns"][nombre] for f in frios])}
+            for nombre, tiempos in calientes.items()
+        },
+    }
+    with open(args.salida, "w") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"{'caso':<36} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'frío p50':>9}")
+    for nombre, caso in resultado["casos"].items():
+        c = caso["caliente_ms"]
+        print(f"{nombre:<36} {c['p50']:8.3f} {c['p90']:8.3f} {c['p99']:8.3f} {c['max']:8.3f} {caso['frio_ms']['p50']:9.3f}")
+    print(f"Arranque (frío) p50: {resultado['arranque_ms']['p50']:.1f} ms")
+    print(f"▶️ Resultados guardados en {os.path.relpath(args.salida, script_dir)}")
+    if args.guardar_linea_base:
+        with open(RUTA_LINEA_BASE, "w") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"▶️ Línea base actualizada en {os.path.relpath(RUTA_LINEA_BASE, script_dir)}")
+
+
+def comparar(args):
+    with open(args.actual) as f:
+        actual = json.load(f)
+    with open(args.linea_base) as f:
+        linea_base = json.load(f)
+    regresiones = []
+    print(f"{'caso':<36} {'métrica':<16} {'base':>9} {'actual':>9} {'cambio':>8}")
+    for nombre, caso in actual["casos"].items():
+        if nombre not in linea_base["casos"]:
+            print(f"{nombre:<36} (sin línea base)")
+            continue
+        for modo in args.modos.split(","):
+            for metrica in args.metricas.split(","):
+                base, valor = linea_base["casos"][nombre][modo][metrica], caso[modo][metrica]
+                cambio = valor / base - 1 if base else 0.0
+                marca = ""
+                if cambio > args.umbral:
+                    regresiones.append((nombre, modo, metrica, cambio))
+                    marca = "  ❌"
+                print(f"{nombre:<36} {modo + '.' + metrica:<16} {base:9.3f} {valor:9.3f} {cambio:+8.1%}{marca}")
+    if regresiones:
+        print(f"❌ {len(regresiones)} métrica(s) empeoraron más de {args.umbral:.0%} respecto de la línea base")
+        sys.exit(1)
+    print(f"✅ Ninguna métrica empeoró más de {args.umbral:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="modo", required=True)
+
+    p_medir = sub.add_parser("medir", help="mide la latencia de los casos de prueba")
+    p_medir.add_argument("--dataset", default=RUTA_DATASET)
+    p_medir.add_argument("--muestras", type=int, default=200, help="muestras en caliente por caso")
+    p_medir.add_argument("--calentamiento", type=int, default=20, help="ejecuciones descartadas por caso")
+    p_medir.add_argument("--repeticiones-frio", type=int, default=5, help="procesos nuevos para las medidas en frío")
+    p_medir.add_argument("--salida", default=RUTA_RESULTADO)
+    p_medir.add_argument("--guardar-linea-base", action="store_true", help="usar este resultado como nueva línea base")
+
+    p_comparar = sub.add_parser("comparar", help="compara un resultado con la línea base")
+    p_comparar.add_argument("--actual", default=RUTA_RESULTADO)
+    p_comparar.add_argument("--linea-base", default=RUTA_LINEA_BASE)
+    p_comparar.add_argument("--umbral", type=float, default=0.10, help="empeoramiento relativo tolerado")
+    p_comparar.add_argument("--metricas", default="p50,p99")
+    p_comparar.add_argument("--modos", default="caliente_ms", help="caliente_ms y/o frio_ms, separados por coma")
+
+    # Modo interno: medición en frío dentro de un proceso nuevo
+    p_frio = sub.add_parser("_frio")
+    p_frio.add_argument("--dataset", default=RUTA_DATASET)
+
+    args = parser.parse_args()
+    if args.modo == "_frio":
+        print(json.dumps(medir_frio(args.dataset)))
+    elif args.modo == "medir":
+        medir(args)
+    else:
+        comparar(args)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Escalado de la puntuación particionada con el número de procesos.
+
+Para cada cantidad de procesos mide el tiempo de publicar el catálogo en memoria compartida,
+la latencia mediana de una consulta individual y el throughput de un lote, y verifica que los
+rankings sean idénticos a los de BaseConocimiento en un solo proceso. El escalado solo se
+observa si la máquina tiene al menos tantos núcleos como procesos (se reporta `nucleos`).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from base_conocimiento import BaseConocimiento
+from benchmark_indice import catalogo_sintetico, consultas_aleatorias, script_dir
+from motor_particionado import BaseConocimientoParticionada
+
+
+def medir(motor, consultas, repeticiones):
+    latencias = []
+    for consulta in consultas[:repeticiones]:
+        t0 = time.perf_counter()
+        motor.recomendar_destinos(*consulta)
+        latencias.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    resultados = motor.recomendar_destinos_batch(consultas)
+    lote_s = time.perf_counter() - t0
+    return float(np.median(latencias)) * 1000, len(consultas) / lote_s, resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=float, default=2e6, help="filas del catálogo sintético")
+    parser.add_argument("--procesos", default="1,2,4,8", help="cantidades de procesos separadas por coma")
+    parser.add_argument("--repeticiones", type=int, default=20, help="consultas individuales medidas")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    base = BaseConocimiento(catalogo_sintetico(int(args.filas), rng))
+    consultas = consultas_aleatorias(rng)
+    # Calentamiento y referencia en un solo proceso
+    medir(base, consultas, 1)
+    latencia_ms, throughput, referencia = medir(base, consultas, args.repeticiones)
+    filas = [{"modo": "un_proceso", "procesos": 1, "publicar_s": 0.0, "latencia_ms": latencia_ms,
+              "consultas_s": throughput, "identico": True}]
+    print(filas[-1])
+
+    for n in [int(p) for p in args.procesos.split(",")]:
+        t0 = time.perf_counter()
+        with BaseConocimientoParticionada(base, n) as motor:
+            medir(motor, consultas, 1)
+            publicar_s = time.perf_counter() - t0
+            latencia_ms, throughput, resultados = medir(motor, consultas, args.repeticiones)
+        identico = all(a.equals(b) for a, b in zip(referencia, resultados))
+        filas.append({"modo": "particionado", "procesos": n, "publicar_s": publicar_s,
+                      "latencia_ms": latencia_ms, "consultas_s": throughput, "identico": identico})
+        print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    resumen["filas"] = int(args.filas)
+    resumen["nucleos"] = os.cpu_count()
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "particionado.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/particionado.csv")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: bucle de reglas por consulta vs. plan de puntuación compilado."""
+import os
+import time
+import numpy as np
+import pandas as pd
+
+import Rule as rl
+from base_conocimiento import BaseConocimiento
+
+# === Carga del dataset ===
+script_dir = os.path.dirname(os.path.abspath(__file__))
+paths = [
+    os.path.join(script_dir, "cleaned_travel_dataset.csv"),
+    os.path.join(script_dir, "ProyectoStreamlit", "cleaned_travel_dataset.csv"),
+]
+for p in paths:
+    if os.path.exists(p):
+        travel_data = pd.read_csv(p)
+        break
+else:
+    raise FileNotFoundError(f"No cleaned_travel_dataset.csv en {paths}")
+
+# === Parámetros ===
+N_REPETICIONES = 2000
+CONSULTAS = [
+    (1000, 3, 5, 6, "Hotel"),
+    (8000, 14, 21, 12, "Resort"),
+    (2000, 2, 4, 4, None),
+]
+
+def similitud_por_reglas(bc, datos, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None):
+    """Ruta anterior: DataFrame de una fila, scaler.transform y despacho isinstance por regla."""
+    user_input_df = pd.DataFrame(
+        [[presupuesto, (duracion_min + duracion_max) / 2, mes]],
+        columns=["Total cost", "Duration (days)", "Month"]
+    )
+    user_input_scaled = bc.scaler.transform(user_input_df.to_numpy())
+    # Las reglas de preferencia no puntúan en consultas sin preferencias (tampoco en el plan)
+    reglas = [rule for rule in bc.rules if not isinstance(rule, (rl.ClimateRule, rl.SafetyRule, rl.ActivitiesRule))]
+    results = []
+    for rule in reglas:
+        if isinstance(rule, rl.CosineSimilarityRule):
+            results.append(rule.apply_batch(user_input_scaled, datos)[0])
+        elif isinstance(rule, rl.ThresholdRule):
+            result = rule.apply(presupuesto, datos)
+            if np.isscalar(result):
+                result = np.full(len(datos), result)
+            results.append(result)
+        elif isinstance(rule, rl.FuzzyRule):
+            results.append(np.asarray(rule.apply([presupuesto, (duracion_min + duracion_max) / 2, mes], datos), dtype=float))
+        elif isinstance(rule, rl.EqualityRule) and tipo_hospedaje:
+            result = rule.apply(tipo_hospedaje, datos)
+            if np.isscalar(result):
+                result = np.full(len(datos), result)
+            results.append(result)
+        else:
+            results.append(np.zeros(len(datos)))
+    results = [np.array(r, dtype=float) for r in results]
+    return np.average(results, axis=0, weights=[rule.weight for rule in reglas])
+
+def medir(funcion, consulta):
+    """Tiempo medio por consulta en microsegundos."""
+    funcion(*consulta)  # calentamiento (y compilación JIT si aplica)
+    t0 = time.perf_counter()
+    for _ in range(N_REPETICIONES):
+        funcion(*consulta)
+    return (time.perf_counter() - t0) / N_REPETICIONES * 1e6
+
+if __name__ == "__main__":
+    base_conocimiento = BaseConocimiento(travel_data)
+    datos = base_conocimiento.travel_data  # la ruta anterior trabajaba sobre el DataFrame completo
+    print(f"Backend del plan: {base_conocimiento.plan.backend}  |  filas: {len(datos)}")
+    print(f"{'Consulta':<32}{'reglas (µs)':>14}{'plan (µs)':>12}{'speedup':>10}")
+    for consulta in CONSULTAS:
+        esperado = similitud_por_reglas(base_conocimiento, datos, *consulta)
+        obtenido = base_conocimiento.calcular_similitud(*consulta)
+        assert np.allclose(esperado, obtenido), f"El plan no coincide con las reglas en {consulta}"
+
+        t_reglas = medir(lambda *c: similitud_por_reglas(base_conocimiento, datos, *c), consulta)
+        t_plan = medir(base_conocimiento.calcular_similitud, consulta)
+        print(f"{str(consulta):<32}{t_reglas:>14.1f}{t_plan:>12.1f}{t_reglas / t_plan:>9.1f}x")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Costo de las reglas de preferencia (clima, seguridad, actividades) en la ruta de consulta.
+
+Para cada tamaño de catálogo (dataset real o sintético de generador_catalogo.py):
+
+- Latencia p50/p99 de recomendar_destinos con los casos de casos_prueba.py, sin preferencias y
+  con cada preferencia (y todas juntas).
+- Coincidencia de actividades sobre todo el catálogo: bitset compilado (AND + popcount) vs.
+  pandas str.contains por actividad pedida sobre la columna de texto. Ambas rutas deben contar
+  las mismas coincidencias por fila.
+"""
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from base_conocimiento import BaseConocimiento
+from casos_prueba import consulta, test_cases
+from plan_puntuacion import _popcount
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+VARIANTES = {
+    "sin_preferencias": {},
+    "clima": {"clima": "templado"},
+    "seguridad": {"seguridad_min": 7},
+    "actividades": {"actividades": ["beach", "museums", "hiking"]},
+    "todas": {"clima": "templado", "seguridad_min": 7, "actividades": ["beach", "museums", "hiking"]},
+}
+
+
+def medir(base, consultas, preferencias, rondas, k):
+    """Latencias individuales (ms) de recomendar_destinos con las preferencias dadas."""
+    for c in consultas:
+        base.recomendar_destinos(*c, **preferencias, k=k)
+    tiempos = []
+    for _ in range(rondas):
+        for c in consultas:
+            t0 = time.perf_counter_ns()
+            base.recomendar_destinos(*c, **preferencias, k=k)
+            tiempos.append(time.perf_counter_ns() - t0)
+    tiempos = np.array(tiempos) / 1e6
+    return {"p50_ms": float(np.percentile(tiempos, 50)), "p99_ms": float(np.percentile(tiempos, 99))}
+
+
+def coincidencias_pandas(textos, actividades):
+    """Actividades pedidas presentes en cada fila, con una búsqueda de texto por actividad."""
+    total = np.zeros(len(textos), dtype=np.int64)
+    for actividad in actividades:
+        patron = rf"(?:^|,)\s*{re.escape(actividad)}\s*(?:,|$)"
+        total += textos.str.contains(patron, case=False, regex=True, na=False).to_numpy()
+    return total
+
+
+def coincidencias_bitset(plan, actividades):
+    preferencias = plan.preferencias(actividades=actividades)
+    return _popcount(plan.actividades & preferencias.bits).sum(axis=1)
+
+
+def medir_actividades(base, textos, actividades, repeticiones):
+    plan = base.plan
+    esperado = coincidencias_pandas(textos, actividades)
+    assert np.array_equal(esperado, coincidencias_bitset(plan, actividades)), "El bitset no coincide con pandas"
+    resultado = {}
+    for ruta, funcion in (("pandas_ms", lambda: coincidencias_pandas(textos, actividades)),
+                          ("bitset_ms", lambda: coincidencias_bitset(plan, actividades))):
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        resultado[ruta] = (time.perf_counter() - t0) / repeticiones * 1e3
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="0,1e5,1e6", help="filas separadas por coma (0 = dataset real)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--rondas", type=int, default=5, help="pasadas por los casos de prueba")
+    parser.add_argument("--repeticiones", type=int, default=5, help="repeticiones de la coincidencia de actividades")
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+
+    consultas = [tuple(consulta(caso))[:5] for caso in test_cases]
+    filas = []
+    for tamano in [int(float(t)) for t in args.tamanos.split(",")]:
+        if tamano:
+            from generador_catalogo import GeneradorCatalogo
+            datos = GeneradorCatalogo.desde_csv().generar(tamano, args.semilla)
+        else:
+            datos = pd.read_csv(os.path.join(script_dir, "cleaned_travel_dataset.csv"))
+        base = BaseConocimiento(datos)
+        del datos
+        # Texto en el orden físico del catálogo, el mismo de los arreglos del plan
+        textos = pd.Series(base.catalogo["top_activities"])
+
+        actividades = medir_actividades(base, textos, VARIANTES["actividades"]["actividades"], args.repeticiones)
+        for variante, preferencias in VARIANTES.items():
+            filas.append({"filas": len(base.catalogo), "variante": variante,
+                          **medir(base, consultas, preferencias, args.rondas, args.k),
+                          **(actividades if variante == "actividades" else {})})
+            print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    sin = resumen[resumen["variante"] == "sin_preferencias"].set_index("filas")
+    resumen["sobrecosto_p50"] = resumen["p50_ms"] / resumen["filas"].map(sin["p50_ms"])
+    resumen["aceleracion_bitset"] = resumen["pandas_ms"] / resumen["bitset_ms"]
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "preferencias.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/preferencias.csv")
@@ -1,16 +1,24 @@
+#!/usr/bin/env python3
+"""Calidad del ranking (precision@K, recall@K, NDCG@K, MAP@K, cobertura) a nivel destino.
+
+Evalúa con evaluacion_ranking.evaluar dos conjuntos etiquetados:
+- manual: los casos escritos a mano de abajo, con sus destinos relevantes.
+- sintetico: `--consultas` consultas generadas a partir de filas del catálogo. Un destino es
+  relevante si alguna de sus filas cumple tipo de hospedaje, presupuesto, duración dentro del
+  rango y mes a ±1 de la consulta (criterio de reglas, independiente del puntaje).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
 import pandas as pd
-from sklearn.metrics import precision_score, recall_score, confusion_matrix
-from motor_inferencia import MotorInferencia
+
 from base_conocimiento import BaseConocimiento
-from base_hechos import BaseHechos
+from evaluacion_ranking import evaluar
 
-# 1) Carga y setup
-df_data = pd.read_csv("cleaned_travel_dataset.csv")
-bc = BaseConocimiento(df_data)
-bh = BaseHechos()
-motor = MotorInferencia(bc, bh)
+script_dir = os.path.dirname(os.path.abspath(__file__))
 
-# 2) Define tu test set con ground truth
 test_set = [
     {
         "name": "Escenario hotel barato",
@@ -63,45 +71,65 @@ test_set = [
 ]
 
 
-K = 6  # top‑K
+def conjunto_sintetico(travel_data, n_consultas, rng):
+    """Consultas ancladas en filas del catálogo y sus destinos relevantes según el criterio de reglas."""
+    total = (travel_data["Accommodation cost"] + travel_data["Transportation cost"]).to_numpy(dtype=float)
+    duracion = travel_data["Duration (days)"].to_numpy(dtype=float)
+    mes = travel_data["Month"].to_numpy(dtype=float)
+    tipo = travel_data["Accommodation type"].to_numpy(dtype=object)
+    destino = travel_data["Destination"].to_numpy(dtype=object)
+
+    anclas = rng.integers(0, len(travel_data), n_consultas)
+    presupuestos = np.round(total[anclas] * rng.uniform(1.0, 2.0, n_consultas), -1)
+    dur_min = np.maximum(duracion[anclas] - rng.integers(0, 4, n_consultas), 1)
+    dur_max = duracion[anclas] + rng.integers(0, 4, n_consultas)
+    meses = mes[anclas]
+    tipos = np.where(rng.random(n_consultas) < 0.5, tipo[anclas], None)
+
+    consultas, relevantes = [], []
+    for i in range(n_consultas):
+        cumple = (total <= presupuestos[i]) & (duracion >= dur_min[i]) & (duracion <= dur_max[i])
+        cumple &= np.minimum(np.abs(mes - meses[i]), 12 - np.abs(mes - meses[i])) <= 1
+        if tipos[i] is not None:
+            cumple &= tipo == tipos[i]
+        consultas.append((float(presupuestos[i]), int(dur_min[i]), int(dur_max[i]), int(meses[i]), tipos[i]))
+        relevantes.append(set(destino[cumple]))
+    return consultas, relevantes
 
-results = []
-for case in test_set:
-    # inyecta hechos
-    bh.ingresar_datos_usuario(
-        case["presupuesto"],
-        case["dur_min"],
-        case["dur_max"],
-        case["mes"],
-        case["tipo_hosp"]
-    )
-    # genera top‑K
-    recs = motor.generar_recomendaciones()
-    preds = recs["Destination"].tolist()[:K]
 
-    # 3) construye vectores binarios sobre TODO el catálogo
-    all_dest = bc.travel_data["Destination"].tolist()
-    y_true = [1 if d in case["relevantes"] else 0 for d in all_dest]
-    y_pred = [1 if d in preds            else 0 for d in all_dest]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--consultas", type=int, default=5000, help="consultas del conjunto sintético")
+    parser.add_argument("--filas", type=float, default=0, help="catálogo sintético de este tamaño (0 = dataset real)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--memoria-mb", type=float, default=256, help="presupuesto de la matriz de cada bloque")
+    args = parser.parse_args()
 
-    # métricas de clasificación
-    acc = (confusion_matrix(y_true, y_pred).trace() /
-           sum(confusion_matrix(y_true, y_pred).ravel()))
-    prec = precision_score(y_true, y_pred, zero_division=0)
-    rec  = recall_score(y_true, y_pred, zero_division=0)
-    cm   = confusion_matrix(y_true, y_pred)
+    if args.filas:
+        from generador_catalogo import GeneradorCatalogo
+        travel_data = GeneradorCatalogo.desde_csv().generar(int(args.filas), args.semilla)
+    else:
+        travel_data = pd.read_csv(os.path.join(script_dir, "cleaned_travel_dataset.csv"))
+    bc = BaseConocimiento(travel_data)
+    rng = np.random.default_rng(args.semilla)
 
-    results.append({
-        "Caso":      case["name"],
-        "Accuracy":  acc,
-        "Precision": prec,
-        "Recall":    rec,
-        "TP":        cm[1,1],
-        "FP":        cm[0,1],
-        "FN":        cm[1,0],
-        "TN":        cm[0,0],
-    })
+    conjuntos = {
+        "manual": ([(c["presupuesto"], c["dur_min"], c["dur_max"], c["mes"], c["tipo_hosp"]) for c in test_set],
+                   [c["relevantes"] for c in test_set]),
+        "sintetico": conjunto_sintetico(travel_data, args.consultas, rng),
+    }
+    filas = []
+    for nombre, (consultas, relevantes) in conjuntos.items():
+        t0 = time.perf_counter()
+        resumen, por_consulta = evaluar(bc, consultas, relevantes, k=args.k, memoria_mb=args.memoria_mb)
+        filas.append({"conjunto": nombre, **resumen, "tiempo_s": time.perf_counter() - t0})
+        if nombre == "manual":
+            por_consulta.insert(0, "Caso", [c["name"] for c in test_set])
+            print(por_consulta.to_string(index=False))
 
-# 4) muestra resultados
-df_metrics = pd.DataFrame(results)
-print(df_metrics.to_markdown(index=False))
+    resultado = pd.DataFrame(filas)
+    resultado["filas_catalogo"] = len(travel_data)
+    print(resultado.to_string(index=False))
+    resultado.to_csv(os.path.join(script_dir, "benchmark", "calidad.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/calidad.csv")
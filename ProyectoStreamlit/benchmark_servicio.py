@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Cliente de carga para servicio_http.py: throughput y latencia p50/p99 con y sin micro-lotes.
+
+Levanta el servicio en un proceso aparte para cada configuración y lo bombardea con
+`--concurrencia` conexiones keep-alive, cada una enviando solicitudes una tras otra.
+Las respuestas 503 (contrapresión) se cuentan aparte y no entran en las latencias.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark_indice import consultas_aleatorias, script_dir
+from benchmark_streaming import generar_csv
+
+
+async def solicitud(lector, escritor, metodo, ruta, cuerpo=b""):
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+    await escritor.drain()
+    codigo = int((await lector.readline()).split()[1])
+    largo = 0
+    while (linea := await lector.readline()) != b"\r\n":
+        nombre, _, valor = linea.decode().partition(":")
+        if nombre.lower() == "content-length":
+            largo = int(valor)
+    return codigo, await lector.readexactly(largo)
+
+
+async def cliente(puerto, cuerpos, latencias, rechazos):
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    for cuerpo in cuerpos:
+        t0 = time.perf_counter()
+        codigo, _ = await solicitud(lector, escritor, "POST", "/recomendar", cuerpo)
+        if codigo == 503:
+            rechazos.append(1)
+        else:
+            latencias.append(time.perf_counter() - t0)
+    escritor.close()
+
+
+async def carga(puerto, cuerpos, concurrencia):
+    latencias, rechazos = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(cliente(puerto, cuerpos[c::concurrencia], latencias, rechazos) for c in range(concurrencia)))
+    total_s = time.perf_counter() - t0
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    _, estado = await solicitud(lector, escritor, "GET", "/estado")
+    escritor.close()
+    return latencias, len(rechazos), total_s, json.loads(estado)
+
+
+def medir(opciones, cuerpos, concurrencia, puerto):
+    comando = [sys.executable, "-u", "servicio_http.py", "--puerto", str(puerto), *opciones]
+    servidor = subprocess.Popen(comando, cwd=script_dir, stdout=subprocess.PIPE, text=True)
+    try:
+        for linea in servidor.stdout:
+            if linea.startswith("Servicio de recomendaciones"):
+                break
+        asyncio.run(carga(puerto, cuerpos[:concurrencia], concurrencia))  # calentamiento
+        latencias, rechazos, total_s, estado = asyncio.run(carga(puerto, cuerpos, concurrencia))
+    finally:
+        servidor.terminate()
+        servidor.wait()
+    latencias = np.array(latencias) * 1000
+    return {"solicitudes": len(cuerpos), "rechazadas": rechazos, "consultas_s": len(latencias) / total_s,
+            "p50_ms": float(np.percentile(latencias, 50)), "p99_ms": float(np.percentile(latencias, 99)),
+            "tamano_medio_lote": estado["tamano_medio_lote"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=float, default=0, help="filas de un catálogo sintético (0 = dataset real)")
+    parser.add_argument("--solicitudes", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=32, help="conexiones simultáneas")
+    parser.add_argument("--ventana-ms", type=float, default=2.0)
+    parser.add_argument("--lote-max", type=int, default=64)
+    parser.add_argument("--puerto", type=int, default=8765)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    consultas = []
+    while len(consultas) < args.solicitudes:
+        consultas += consultas_aleatorias(rng)
+    cuerpos = [json.dumps({"presupuesto": c[0], "duracion_min": c[1], "duracion_max": c[2], "mes": c[3],
+                           "tipo_hospedaje": c[4]}).encode() for c in consultas[:args.solicitudes]]
+
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        comunes = []
+        if args.filas:
+            ruta = os.path.join(tmp, "catalogo.csv")
+            generar_csv(ruta, int(args.filas), rng)
+            comunes = ["--dataset", ruta]
+        else:
+            # Sin caché de resultados, para medir la puntuación y no los aciertos
+            comunes = ["--dataset", os.path.join(script_dir, "cleaned_travel_dataset.csv")]
+        configuraciones = {
+            "sin_lotes": ["--sin-lotes"],
+            "micro_lotes": ["--ventana-ms", str(args.ventana_ms), "--lote-max", str(args.lote_max)],
+        }
+        for modo, opciones in configuraciones.items():
+            filas.append({"modo": modo, **medir(comunes + opciones, cuerpos, args.concurrencia, args.puerto)})
+            print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    resumen["filas_catalogo"] = int(args.filas) or None
+    resumen["concurrencia"] = args.concurrencia
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "servicio.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/servicio.csv")
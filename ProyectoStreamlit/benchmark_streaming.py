@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Memoria máxima y latencia del modo streaming vs. el motor en memoria.
+
+Genera un CSV sintético grande (remuestreando el dataset) y, en un proceso nuevo por
+configuración, construye el motor y responde un lote de consultas. Reporta el RSS máximo
+del proceso y verifica que los rankings del modo streaming sean idénticos a los del motor
+en memoria (se compara un hash de índices y puntajes).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmark_indice import catalogo_sintetico, consultas_aleatorias, script_dir
+
+MEDICION = """
+import hashlib, json, resource, time
+import pandas as pd
+from base_conocimiento import BaseConocimiento
+from base_streaming import BaseConocimientoStreaming
+ruta, bloque, consultas = {ruta!r}, {bloque!r}, {consultas!r}
+t0 = time.perf_counter()
+base = BaseConocimiento(pd.read_csv(ruta)) if bloque is None else BaseConocimientoStreaming(ruta, bloque)
+t1 = time.perf_counter()
+resultados = base.recomendar_destinos_batch(consultas)
+t2 = time.perf_counter()
+huella = hashlib.sha256()
+for r in resultados:
+    huella.update(r.index.to_numpy().tobytes() + r["Similarity"].to_numpy().tobytes() if not r.empty else b"-")
+# VmHWM es el pico de este proceso; ru_maxrss en Linux arrastra el RSS del padre al hacer fork
+try:
+    with open("/proc/self/status") as f:
+        rss_max_mb = next(int(l.split()[1]) for l in f if l.startswith("VmHWM:")) / 1024
+except OSError:
+    rss_max_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"construccion_s": t1 - t0, "lote_s": t2 - t1, "rss_max_mb": rss_max_mb, "huella": huella.hexdigest()}}))
+"""
+
+def generar_csv(ruta, n_filas, rng, bloque=500_000):
+    """Escribe el CSV sintético por partes para no tener todo el catálogo en memoria."""
+    for inicio in range(0, n_filas, bloque):
+        parte = catalogo_sintetico(min(bloque, n_filas - inicio), rng)
+        parte.to_csv(ruta, mode="w" if inicio == 0 else "a", header=inicio == 0, index=False)
+
+def medir(ruta, bloque, consultas):
+    codigo = MEDICION.format(ruta=ruta, bloque=bloque, consultas=consultas)
+    proceso = subprocess.run([sys.executable, "-c", codigo], cwd=script_dir, capture_output=True, text=True, check=True)
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=float, default=2e6, help="filas del CSV sintético")
+    parser.add_argument("--bloques", default="1e4,1e5,1e6", help="tamaños de bloque separados por coma")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    consultas = consultas_aleatorias(rng)
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "catalogo.csv")
+        generar_csv(ruta, int(args.filas), rng)
+        referencia = medir(ruta, None, consultas)
+        filas.append({"modo": "memoria", "bloque": None, **referencia})
+        print(filas[-1])
+        for bloque in [int(float(b)) for b in args.bloques.split(",")]:
+            medida = medir(ruta, bloque, consultas)
+            filas.append({"modo": "streaming", "bloque": bloque, **medida})
+            print(filas[-1])
+
+    resumen = pd.DataFrame(filas)
+    resumen["identico"] = resumen["huella"] == referencia["huella"]
+    resumen["filas"] = int(args.filas)
+    resumen = resumen.drop(columns="huella")
+    print(resumen.to_string(index=False))
+    resumen.to_csv(os.path.join(script_dir, "benchmark", "streaming.csv"), index=False)
+    print("▶️ Resultados guardados en benchmark/streaming.csv")
+    if not resumen["identico"].all():
+        print("❌ El modo streaming no reproduce el ranking del motor en memoria")
+        sys.exit(1)
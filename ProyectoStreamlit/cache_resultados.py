@@ -0,0 +1,107 @@
+# Contenido de cache_resultados.py
+"""
+Caché de resultados de consultas
+================================
+Guarda las recomendaciones ya calculadas, indexadas por los hechos normalizados del usuario.
+
+- Desalojo LRU cuando se supera la capacidad.
+- TTL opcional (segundos) por entrada.
+- Invalidación automática: cada entrada pertenece a una versión de la Base de Conocimientos;
+  si el catálogo o las reglas se recargan, la versión cambia y la caché se vacía.
+- Contadores de aciertos, fallos, desalojos, expiraciones e invalidaciones.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from base_hechos import Consulta
+
+
+class CacheResultados:
+    def __init__(self, capacidad=1024, ttl=None, reloj=time.monotonic):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._reloj = reloj
+        self._entradas = OrderedDict()  # clave -> (expira, valor)
+        self._version = None
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+        self.invalidaciones = 0
+
+    @staticmethod
+    def clave(datos_usuario):
+        """Clave normalizada a partir de una Consulta o de los hechos de BaseHechos.obtener_datos_usuario().
+
+        Los números se pasan a float (1000 y 1000.0 son la misma clave) y de la duración solo
+        se guarda el punto medio, que es lo único que usa la puntuación.
+        """
+        consulta = datos_usuario if isinstance(datos_usuario, Consulta) else Consulta.desde_hechos(datos_usuario)
+        return (
+            float(consulta.presupuesto),
+            (float(consulta.duracion_min) + float(consulta.duracion_max)) / 2,
+            float(consulta.mes),
+            consulta.tipo_hospedaje,
+            consulta.clima,
+            None if consulta.seguridad_min is None else float(consulta.seguridad_min),
+            consulta.actividades,
+        )
+
+    def obtener(self, clave, version):
+        """Valor guardado para `clave` en la versión dada de la base, o None."""
+        with self._lock:
+            self._sincronizar(version)
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            expira, valor = entrada
+            if expira is not None and self._reloj() >= expira:
+                del self._entradas[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave, version, valor):
+        with self._lock:
+            self._sincronizar(version)
+            expira = self._reloj() + self.ttl if self.ttl is not None else None
+            self._entradas[clave] = (expira, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.invalidaciones += 1
+
+    def _sincronizar(self, version):
+        # Si la base cambió de versión, nada de lo guardado sigue siendo válido
+        if version != self._version:
+            if self._entradas:
+                self._entradas.clear()
+                self.invalidaciones += 1
+            self._version = version
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "capacidad": self.capacidad,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "expirados": self.expirados,
+            "invalidaciones": self.invalidaciones,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,134 @@
+# Contenido de catalogo.py
+"""
+Catálogo columnar compacto
+==========================
+Reemplaza al DataFrame completo dentro de la Base de Conocimientos:
+
+- Columnas numéricas: arreglos NumPy contiguos (float64).
+- Columnas categóricas (texto): codificación por diccionario, un código entero por fila
+  más la lista de valores distintos. Los filtros por tipo se vuelven comparaciones enteras.
+
+Solo las filas que se devuelven al usuario (el top-K) se convierten de nuevo en registros legibles.
+pandas se importa recién al convertir desde/hacia DataFrame, no al importar el módulo.
+"""
+import numpy as np
+
+
+def _tipo_codigo(n_categorias):
+    """Entero con signo más pequeño capaz de guardar n_categorias y el -1 de 'sin valor'."""
+    for tipo in (np.int8, np.int16, np.int32):
+        if n_categorias < np.iinfo(tipo).max:
+            return tipo
+    return np.int64
+
+
+class CatalogoColumnar:
+    def __init__(self, numericas, categoricas, indice, columnas=None):
+        # numericas: {columna: arreglo float64}; categoricas: {columna: (codigos, categorias)}
+        self.numericas = {c: np.ascontiguousarray(v, dtype=float) for c, v in numericas.items()}
+        self.categoricas = {}
+        for columna, (codigos, categorias) in categoricas.items():
+            categorias = np.asarray(categorias, dtype=object)
+            self.categoricas[columna] = (np.ascontiguousarray(codigos), categorias)
+        self.indice = np.asarray(indice)
+        self.columns = list(columnas) if columnas is not None else list(self.numericas) + list(self.categoricas)
+        self._posiciones = {c: {v: i for i, v in enumerate(cats)} for c, (_, cats) in self.categoricas.items()}
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        """Construye el catálogo a partir de un DataFrame, codificando las columnas de texto."""
+        import pandas as pd
+        numericas, categoricas = {}, {}
+        for columna in df.columns:
+            serie = df[columna]
+            if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+                numericas[columna] = serie.to_numpy(dtype=float)
+            else:
+                codigos, categorias = pd.factorize(serie, sort=True)
+                categoricas[columna] = (codigos.astype(_tipo_codigo(len(categorias))), categorias.to_numpy(dtype=object))
+        return cls(numericas, categoricas, df.index.to_numpy(), df.columns)
+
+    def __len__(self):
+        return len(self.indice)
+
+    def __getitem__(self, columna):
+        """Columna completa como arreglo; las categóricas se decodifican (solo para compatibilidad)."""
+        return self.valores(columna)
+
+    def valores(self, columna, posiciones=slice(None)):
+        """Valores legibles de una columna en las posiciones indicadas."""
+        if columna in self.numericas:
+            return self.numericas[columna][posiciones]
+        codigos, categorias = self.categoricas[columna]
+        codigos = codigos[posiciones]
+        if not len(categorias):
+            # Columna sin ningún valor (p. ej. un bloque del modo streaming con solo NaN)
+            return np.full(np.shape(codigos), None, dtype=object)
+        valores = categorias[codigos]
+        valores[codigos < 0] = None
+        return valores
+
+    def agregar_numerica(self, columna, valores):
+        self.numericas[columna] = np.ascontiguousarray(valores, dtype=float)
+        if columna not in self.columns:
+            self.columns.append(columna)
+
+    def tomar(self, posiciones):
+        """Nuevo catálogo con las filas en el orden indicado (las categorías se conservan)."""
+        numericas = {c: v[posiciones] for c, v in self.numericas.items()}
+        categoricas = {c: (codigos[posiciones], cats) for c, (codigos, cats) in self.categoricas.items()}
+        return CatalogoColumnar(numericas, categoricas, self.indice[posiciones], self.columns)
+
+    def agregar_filas(self, df):
+        """Nuevo catálogo con las filas de `df` al final; los textos no vistos amplían las categorías."""
+        import pandas as pd
+        faltantes = [c for c in self.columns if c not in df.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en las filas nuevas: {faltantes}")
+        numericas = {c: np.concatenate([v, df[c].to_numpy(dtype=float)]) for c, v in self.numericas.items()}
+        categoricas = {}
+        for columna, (codigos, categorias) in self.categoricas.items():
+            locales, valores = pd.factorize(df[columna], sort=True)
+            conocidas = self._posiciones[columna]
+            nuevas = [v for v in valores if v not in conocidas]
+            todas = np.concatenate([categorias, np.asarray(nuevas, dtype=object)]) if nuevas else categorias
+            # Código global de cada valor local; el -1 final atiende a los valores faltantes
+            mapa = np.array([conocidas.get(v, -1) for v in valores] + [-1], dtype=np.int64)
+            mapa[:len(valores)][mapa[:len(valores)] < 0] = len(categorias) + np.arange(len(nuevas))
+            tipo = _tipo_codigo(len(todas))
+            categoricas[columna] = (np.concatenate([codigos.astype(tipo), mapa[locales].astype(tipo)]), todas)
+        indice = np.concatenate([self.indice, df.index.to_numpy()])
+        return CatalogoColumnar(numericas, categoricas, indice, self.columns)
+
+    def es_categorica(self, columna):
+        return columna in self.categoricas
+
+    def codigos(self, columna):
+        return self.categoricas[columna][0]
+
+    def categorias(self, columna):
+        return self.categoricas[columna][1]
+
+    def codigo(self, columna, valor):
+        """Código entero de `valor` en la columna (-1 si no aparece en el catálogo)."""
+        return self._posiciones[columna].get(valor, -1)
+
+    def registros(self, posiciones, columnas=None):
+        """Convierte solo las filas indicadas en un DataFrame legible."""
+        import pandas as pd
+        columnas = self.columns if columnas is None else columnas
+        datos = {columna: self.valores(columna, posiciones) for columna in columnas}
+        return pd.DataFrame(datos, index=self.indice[posiciones], columns=columnas)
+
+    def a_dataframe(self):
+        """Materializa el catálogo completo (costoso: solo para herramientas fuera de la ruta de consulta)."""
+        import pandas as pd
+        datos = {columna: self[columna] for columna in self.columns}
+        return pd.DataFrame(datos, index=self.indice, columns=self.columns)
+
+    @property
+    def nbytes(self):
+        total = self.indice.nbytes + sum(v.nbytes for v in self.numericas.values())
+        for codigos, categorias in self.categoricas.values():
+            total += codigos.nbytes + sum(len(str(c)) for c in categorias)
+        return total
@@ -0,0 +1,252 @@
+# Contenido de cubo_destinos.py
+"""
+Cubo agregado por destino
+=========================
+El catálogo tiene un viaje por fila y muchas filas comparten (Destination, Month,
+Accommodation type). CuboDestinos agrupa el catálogo por esa clave al cargarlo y guarda por
+grupo: costo total representativo (mediana o mínimo), costo mínimo y máximo, duración media
+y cantidad de viajes.
+
+Una consulta se resuelve en dos pasos:
+
+1. Se puntúan los grupos (no los viajes) con las mismas reglas, escalador y kernel que la base;
+   un grupo pasa el filtro de presupuesto si su viaje más barato lo cumple. Cada destino se
+   queda con su mejor grupo y se eligen los K mejores destinos.
+2. Drill-down: solo en los grupos ganadores se puntúan sus viajes dentro del presupuesto y se
+   devuelve el mejor de cada uno. Si en un grupo ganador no queda ningún viaje tras los
+   filtros, se sigue con el próximo grupo del ranking (de un destino aún no elegido), así que
+   se devuelven K destinos mientras haya grupos con viajes.
+
+La cantidad de filas puntuadas baja en el factor de duplicación del catálogo y el resultado
+tiene un destino por fila. El ranking usa el costo representativo del grupo, así que puede
+diferir del ranking por viaje de BaseConocimiento. Las reglas de umbral sobre columnas que el
+cubo no agrega (todas salvo "Total cost", "Duration (days)" y "Month") no aportan puntaje.
+Las columnas de las reglas de preferencia (clima, seguridad, actividades) describen al destino:
+cada grupo toma las de su viaje más barato.
+
+El cubo se reconstruye cuando cambia la versión de la base (catálogo o reglas).
+"""
+import collections
+import threading
+
+import numpy as np
+
+import Rule as rl
+from base_conocimiento import BaseConocimiento
+from catalogo import CatalogoColumnar
+from indice_similitud import crear_indice, normalizar_filas
+from indices_filtro import IndiceFiltros, cantidad, orden_fisico, posiciones
+from instrumentacion import METRICAS
+from plan_puntuacion import PlanPuntuacion
+from seleccion_top_k import top_k
+
+# Piezas del cubo de una versión de la base. Los viajes de cada grupo están en
+# viajes[inicios[g]:inicios[g] + cuentas[g]], ordenados por costo total.
+Cubo = collections.namedtuple("Cubo", [
+    "estado", "catalogo", "plan", "indice_filtros", "viajes", "costos_viajes", "inicios", "cuentas",
+])
+
+
+def _columnas_preferencia(rules):
+    for rule in rules:
+        if isinstance(rule, rl.ClimateRule):
+            yield from rule.COLUMNAS
+        elif isinstance(rule, (rl.SafetyRule, rl.ActivitiesRule)):
+            yield rule.column_name
+
+
+def _construir(estado, estadistico):
+    catalogo = estado.catalogo
+    vivas = estado.indice_filtros.vivas
+    filas = np.arange(len(catalogo)) if vivas is None else np.flatnonzero(vivas)
+    destinos = catalogo.codigos("Destination")[filas]
+    filas = filas[destinos >= 0]
+    destinos = catalogo.codigos("Destination")[filas]
+    tipos = catalogo.codigos("Accommodation type")[filas]
+    meses = catalogo.valores("Month", filas)
+    costos = catalogo.valores("Total cost", filas)
+    duraciones = catalogo.valores("Duration (days)", filas)
+
+    # Viajes ordenados por grupo y, dentro de cada grupo, por costo
+    orden = np.lexsort((costos, meses, destinos, tipos))
+    destinos, tipos, meses = destinos[orden], tipos[orden], meses[orden]
+    costos, duraciones, viajes = costos[orden], duraciones[orden], filas[orden]
+    nuevo = np.r_[True, (destinos[1:] != destinos[:-1]) | (tipos[1:] != tipos[:-1]) | (meses[1:] != meses[:-1])]
+    inicios = np.flatnonzero(nuevo)
+    cuentas = np.diff(np.r_[inicios, len(viajes)])
+
+    minimos = costos[inicios]
+    maximos = costos[inicios + cuentas - 1]
+    if estadistico == "mediana":
+        representativo = (costos[inicios + (cuentas - 1) // 2] + costos[inicios + cuentas // 2]) / 2
+    elif estadistico == "minimo":
+        representativo = minimos
+    else:
+        raise ValueError(f"Estadístico desconocido: {estadistico!r} (use 'mediana' o 'minimo')")
+    duracion_media = np.add.reduceat(duraciones, inicios) / cuentas if len(inicios) else np.empty(0)
+
+    # Grupos en orden físico (tipo, costo mínimo): el filtro de presupuesto es una búsqueda binaria
+    fisico = orden_fisico(minimos, tipos[inicios])
+    numericas = {
+        "Total cost": representativo[fisico], "Duration (days)": duracion_media[fisico],
+        "Month": meses[inicios][fisico], "Costo minimo": minimos[fisico],
+        "Costo maximo": maximos[fisico], "Viajes": cuentas[fisico],
+    }
+    categoricas = {
+        "Destination": (destinos[inicios][fisico], catalogo.categorias("Destination")),
+        "Accommodation type": (tipos[inicios][fisico], catalogo.categorias("Accommodation type")),
+    }
+    columnas = ["Destination", "Month", "Accommodation type", "Viajes", "Total cost", "Costo minimo", "Costo maximo",
+                "Duration (days)"]
+    # Columnas de preferencia: las del viaje más barato de cada grupo
+    primeros = viajes[inicios][fisico]
+    for columna in _columnas_preferencia(estado.rules):
+        if columna not in catalogo.columns or columna in columnas:
+            continue
+        if catalogo.es_categorica(columna):
+            categoricas[columna] = (catalogo.codigos(columna)[primeros], catalogo.categorias(columna))
+        else:
+            numericas[columna] = catalogo.valores(columna, primeros)
+        columnas.append(columna)
+    agregado = CatalogoColumnar(numericas, categoricas, np.arange(len(inicios)), columnas)
+    similitud = np.column_stack([agregado.valores(c) for c in BaseConocimiento.COLUMNAS_SIMILITUD])
+    indice = crear_indice("exacto", normalizar_filas(estado.scaler.transform(similitud)))
+    plan = PlanPuntuacion(estado.rules, agregado, indice, estado.scaler)
+    filtros = IndiceFiltros(agregado["Costo minimo"], agregado.codigos("Accommodation type"))
+    return Cubo(estado, agregado, plan, filtros, viajes, costos, inicios[fisico], cuentas[fisico])
+
+
+class CuboDestinos:
+    """Misma interfaz de consulta que BaseConocimiento, puntuando grupos (destino, mes, tipo) en lugar de viajes."""
+
+    def __init__(self, base, estadistico="mediana"):
+        self.base = base
+        self.estadistico = estadistico
+        self._lock = threading.Lock()
+        self._cubo = _construir(base.estado, estadistico)
+
+    @property
+    def version(self):
+        return self._cubo.estado.version
+
+    @property
+    def n_grupos(self):
+        return len(self._cubo.catalogo)
+
+    @property
+    def factor_duplicacion(self):
+        """Viajes vigentes por grupo: cuánto se reduce la cantidad de filas puntuadas."""
+        return len(self._cubo.viajes) / max(self.n_grupos, 1)
+
+    def _vigente(self):
+        """Cubo de la versión actual de la base, reconstruyéndolo si la base cambió."""
+        with self._lock:
+            if self.base.version != self._cubo.estado.version:
+                self._cubo = _construir(self.base.estado, self.estadistico)
+            return self._cubo
+
+    def grupos(self):
+        """Cubo completo como DataFrame (una fila por destino, mes y tipo de hospedaje)."""
+        return self._vigente().catalogo.a_dataframe()
+
+    def recomendar_destinos(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+                            clima=None, seguridad_min=None, actividades=None, k=6):
+        cubo = self._vigente()
+        t0 = t = METRICAS.inicio()
+        entrada = BaseConocimiento._entrada(presupuesto, duracion_min, duracion_max, mes)
+        preferencias = (clima, seguridad_min, actividades)
+        grupos = self._candidatos(cubo, presupuesto, tipo_hospedaje, cubo.plan.preferencias(*preferencias))
+        t = METRICAS.registrar("cubo_filtros", t)
+        METRICAS.contar("consultas")
+        if grupos is None:
+            METRICAS.contar("consultas_sin_candidatos")
+            return BaseConocimiento._sin_resultados()
+        METRICAS.contar("grupos_puntuados", cantidad(grupos))
+        puntajes = cubo.plan.puntuar_una(entrada, tipo_hospedaje, grupos,
+                                         preferencias=cubo.plan.preferencias(*preferencias))
+        METRICAS.registrar("cubo_puntuacion", t)
+        recomendaciones = self._detallar(cubo, entrada, presupuesto, tipo_hospedaje, preferencias, puntajes, grupos, k)
+        METRICAS.registrar("cubo_consulta_total", t0)
+        return recomendaciones
+
+    def recomendar_destinos_batch(self, consultas, k=6):
+        """Puntúa los grupos de N consultas en una sola matriz N × grupos y hace el drill-down de cada una."""
+        cubo = self._vigente()
+        consultas = [tuple(c) for c in consultas]
+        if not consultas:
+            return []
+        t0 = METRICAS.inicio()
+        entradas = [BaseConocimiento._entrada(*c[:4]) for c in consultas]
+        preferencias = [cubo.plan.preferencias(*c[5:8]) for c in consultas]
+        puntajes = cubo.plan.puntuar(entradas, [c[4] for c in consultas], preferencias)
+        METRICAS.registrar("cubo_lote_puntuacion", t0)
+        METRICAS.contar("consultas_lote", len(consultas))
+        recomendaciones = []
+        for consulta, entrada, fila, preferencia in zip(consultas, entradas, puntajes, preferencias):
+            grupos = self._candidatos(cubo, consulta[0], consulta[4], preferencia)
+            if grupos is None:
+                recomendaciones.append(BaseConocimiento._sin_resultados())
+            else:
+                recomendaciones.append(self._detallar(cubo, entrada, consulta[0], consulta[4], consulta[5:8],
+                                                      fila[grupos], grupos, k))
+        METRICAS.registrar("cubo_lote_total", t0)
+        return recomendaciones
+
+    @staticmethod
+    def _candidatos(cubo, presupuesto, tipo_hospedaje, preferencias=None):
+        """Grupos del tipo pedido con al menos un viaje dentro del presupuesto y la seguridad mínima (None si no hay)."""
+        codigo = None
+        if tipo_hospedaje:
+            codigo = cubo.catalogo.codigo("Accommodation type", tipo_hospedaje)
+            if codigo < 0:
+                return None
+        grupos = cubo.plan.filtrar(cubo.indice_filtros.candidatos(presupuesto, codigo), preferencias)
+        return grupos if cantidad(grupos) else None
+
+    @staticmethod
+    def _detallar(cubo, entrada, presupuesto, tipo_hospedaje, consulta_preferencias, puntajes, grupos, k):
+        """Mejor grupo por destino → K mejores destinos → mejor viaje de cada grupo ganador."""
+        t = METRICAS.inicio()
+        grupos = posiciones(grupos)
+        # Por destino, el grupo de mayor puntaje (a igual puntaje, el de menor posición)
+        destinos = cubo.catalogo.codigos("Destination")[grupos]
+        orden = np.lexsort((grupos, -puntajes, destinos))
+        mejores = orden[np.r_[True, destinos[orden][1:] != destinos[orden][:-1]]]
+        ganadores = mejores[top_k(puntajes[mejores], k, desempate=grupos[mejores])]
+        t = METRICAS.registrar("cubo_seleccion", t)
+
+        estado = cubo.estado
+        # Los viajes se puntúan con el plan de la base, así que sus preferencias se compilan aparte
+        preferencias = estado.plan.preferencias(*consulta_preferencias)
+        filas, similitud, puntuados = [], [], 0
+
+        def mejor_viaje(g):
+            nonlocal puntuados
+            inicio, fin = cubo.inicios[g], cubo.inicios[g] + cubo.cuentas[g]
+            # Los viajes del grupo están ordenados por costo: los que entran en el presupuesto son un prefijo
+            fin = inicio + int(np.searchsorted(cubo.costos_viajes[inicio:fin], presupuesto, side="right"))
+            viajes = estado.plan.filtrar(cubo.viajes[inicio:fin], preferencias)
+            if not len(viajes):
+                return False
+            puntuados += len(viajes)
+            puntajes_viajes = estado.plan.puntuar_una(entrada, tipo_hospedaje, viajes, preferencias=preferencias)
+            mejor = top_k(puntajes_viajes, 1, desempate=estado.catalogo.indice[viajes])[0]
+            filas.append(viajes[mejor])
+            similitud.append(puntajes_viajes[mejor])
+            return True
+
+        if not all([mejor_viaje(g) for g in grupos[ganadores]]):
+            # Algún grupo ganador quedó vacío: se recorre el ranking completo de grupos
+            # (puntaje descendente, luego posición) tomando el primer grupo con viajes de cada destino
+            filas, similitud = [], []
+            elegidos = set()
+            for i in np.lexsort((grupos, -puntajes)):
+                if len(filas) == k:
+                    break
+                if destinos[i] not in elegidos and mejor_viaje(grupos[i]):
+                    elegidos.add(destinos[i])
+        METRICAS.contar("filas_puntuadas", puntuados)
+        recomendaciones = estado.catalogo.registros(np.array(filas, dtype=np.int64), BaseConocimiento.COLUMNAS_RESULTADO)
+        recomendaciones = recomendaciones.assign(Similarity=similitud)
+        METRICAS.registrar("cubo_detalle", t)
+        return recomendaciones
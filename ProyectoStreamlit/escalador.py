@@ -0,0 +1,54 @@
+# Contenido de escalador.py
+"""
+Escalador min-max liviano
+=========================
+Reemplazo de sklearn.preprocessing.MinMaxScaler (rango [0, 1]) que solo depende de numpy,
+para que importar el motor no cargue scikit-learn. Usa las mismas fórmulas y expone los
+mismos atributos (data_min_, data_max_, data_range_, scale_, min_), así que los resultados
+son idénticos bit a bit.
+"""
+import numpy as np
+
+
+class EscaladorMinMax:
+    def fit(self, X):
+        for atributo in ("data_min_", "data_max_", "n_samples_seen_"):
+            self.__dict__.pop(atributo, None)
+        return self.partial_fit(X)
+
+    def partial_fit(self, X):
+        """Amplía los mínimos y máximos con las filas de X (ajuste incremental)."""
+        X = np.asarray(X, dtype=float)
+        data_min = np.nanmin(X, axis=0)
+        data_max = np.nanmax(X, axis=0)
+        if hasattr(self, "n_samples_seen_"):
+            data_min = np.minimum(self.data_min_, data_min)
+            data_max = np.maximum(self.data_max_, data_max)
+            self.n_samples_seen_ += X.shape[0]
+        else:
+            self.n_samples_seen_ = X.shape[0]
+        data_range = data_max - data_min
+        # Columnas (casi) constantes: escala 1 para no dividir por cero, igual que sklearn
+        rango = data_range.copy()
+        rango[rango < 10 * np.finfo(rango.dtype).eps] = 1.0
+        self.scale_ = 1.0 / rango
+        self.min_ = 0.0 - data_min * self.scale_
+        self.data_min_ = data_min
+        self.data_max_ = data_max
+        self.data_range_ = data_range
+        return self
+
+    def transform(self, X):
+        X = np.array(X, dtype=float)
+        X *= self.scale_
+        X += self.min_
+        return X
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, X):
+        X = np.array(X, dtype=float)
+        X -= self.min_
+        X /= self.scale_
+        return X
@@ -0,0 +1,153 @@
+# Contenido de evaluacion_ranking.py
+"""
+Evaluación vectorizada de la calidad del ranking
+================================================
+Calcula precision@K, recall@K, NDCG@K, MAP@K y cobertura para miles de consultas etiquetadas
+en una pasada vectorizada sobre la matriz de puntajes (N consultas × M filas):
+
+1. Puntajes del lote con el plan compilado del motor, con las filas agrupadas por destino.
+2. Las filas que no cumplen presupuesto, tipo de hospedaje o seguridad mínima, o que están
+   dadas de baja, quedan en -inf, igual que en los filtros del motor.
+3. Deduplicación por destino: cada destino toma el mejor puntaje de sus filas (np.maximum.reduceat
+   sobre las columnas agrupadas por destino), así un destino repetido en el catálogo cuenta una vez.
+4. Top-K por consulta sobre la matriz N × destinos (empates: orden alfabético del destino) y
+   aciertos contra la matriz de relevancia.
+
+Las consultas se procesan en bloques cuyo tamaño sale de un presupuesto de memoria dividido por
+el número de filas del catálogo, así la matriz del bloque (y sus temporales) no crece con M.
+Las métricas que dependen de los relevantes (recall, NDCG, MAP) se promedian solo sobre las
+consultas que tienen al menos uno.
+"""
+import numpy as np
+
+from indice_similitud import IndiceExacto
+from plan_puntuacion import PlanPuntuacion
+
+# Bytes por celda de la matriz N × M de un bloque: puntajes float64, máscara de filtros y los
+# temporales float64 del plan al sumar difusas y preferencias
+BYTES_POR_CELDA = 32
+
+
+def _agrupado_por_destino(estado):
+    """Plan y columnas de filtro con las filas reordenadas por destino, e inicio de cada grupo.
+
+    Con las filas ya agrupadas la matriz de puntajes sale contigua por destino y el máximo por
+    grupo es un np.maximum.reduceat directo, sin reordenar la matriz en cada bloque. El plan
+    puntúa columna a columna, así que los puntajes son idénticos a los del orden original.
+    Las filas sin destino se descartan.
+    """
+    codigos = estado.catalogo.codigos("Destination")
+    orden = np.argsort(codigos, kind="stable")
+    orden = orden[codigos[orden] >= 0]
+    ordenados = codigos[orden]
+    inicios = np.flatnonzero(np.r_[True, ordenados[1:] != ordenados[:-1]])
+
+    plan, filtros = estado.plan, estado.indice_filtros
+    parametros, arreglos = plan.exportar()
+    agrupado = PlanPuntuacion.desde_exportado(parametros, PlanPuntuacion.tomar_filas(arreglos, orden),
+                                              IndiceExacto(plan.unitarios[orden]), estado.scaler)
+    columnas = {
+        "costos": filtros.costos[orden],
+        "codigos_tipo": filtros.codigos_tipo[orden],
+        "vivas": None if filtros.vivas is None else filtros.vivas[orden],
+    }
+    nombres = estado.catalogo.categorias("Destination")[ordenados[inicios]]
+    return agrupado, columnas, inicios, nombres
+
+
+def _matriz_destinos(estado, plan, columnas, inicios, consultas):
+    """Mejor puntaje de cada destino para cada consulta (N × D), -inf si ninguna fila pasa los filtros."""
+    entradas = [[c[0], (c[1] + c[2]) / 2, c[3]] for c in consultas]
+    preferencias = [plan.preferencias(*c[5:8]) for c in consultas]
+    puntajes = plan.puntuar(entradas, [c[4] for c in consultas], preferencias)
+    presupuestos = np.array([c[0] for c in consultas], dtype=float)
+    # -2: consulta sin tipo; -1: tipo que no aparece en el catálogo (ninguna fila lo cumple, ni
+    # las filas sin tipo, que también tienen código -1)
+    tipos = np.array([estado.catalogo.codigo("Accommodation type", c[4]) if c[4] else -2 for c in consultas])
+    validas = columnas["costos"][None, :] <= presupuestos[:, None]
+    validas &= (tipos[:, None] == -2) | ((tipos[:, None] >= 0) & (columnas["codigos_tipo"][None, :] == tipos[:, None]))
+    if columnas["vivas"] is not None:
+        validas &= columnas["vivas"][None, :]
+    for i, p in enumerate(preferencias):
+        if p is not None and p.seguridad_min is not None:
+            validas[i] &= plan.seguridad >= p.seguridad_min
+    puntajes[~validas] = -np.inf
+    return np.maximum.reduceat(puntajes, inicios, axis=1)
+
+
+def tamano_bloque(filas, memoria_mb):
+    """Consultas por bloque para que la matriz del bloque quepa en memoria_mb (al menos una)."""
+    return max(1, int(memoria_mb * 2**20 // (max(filas, 1) * BYTES_POR_CELDA)))
+
+
+def evaluar(base, consultas, relevantes, k=6, memoria_mb=256, bloque=None):
+    """Métricas de ranking a nivel destino.
+
+    consultas: tuplas (presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje) o Consultas
+    (con preferencias opcionales).
+    relevantes: por consulta, el conjunto de nombres de destino relevantes.
+    memoria_mb: presupuesto de la matriz de cada bloque; bloque fija las consultas por bloque.
+    Retorna (resumen: dict, por_consulta: DataFrame).
+    """
+    import pandas as pd
+    estado = base.estado
+    consultas = [tuple(c) for c in consultas]
+    relevantes = list(relevantes)
+    if len(consultas) != len(relevantes):
+        raise ValueError("Se necesita un conjunto de relevantes por consulta")
+
+    plan, columnas, inicios, nombres = _agrupado_por_destino(estado)
+    columna = {nombre: j for j, nombre in enumerate(nombres)}
+    n_destinos = len(nombres)
+
+    # Cantidad de relevantes por consulta (incluye los que no están en el catálogo)
+    n_relevantes = np.array([len(set(r)) for r in relevantes])
+    bloque = bloque or tamano_bloque(len(plan.estatico), memoria_mb)
+
+    top = np.empty((len(consultas), k), dtype=np.int64)
+    validos = np.zeros((len(consultas), k), dtype=bool)
+    aciertos = np.zeros((len(consultas), k), dtype=bool)
+    for inicio in range(0, len(consultas), bloque):
+        matriz = _matriz_destinos(estado, plan, columnas, inicios, consultas[inicio:inicio + bloque])
+        fin = inicio + len(matriz)
+        # Orden estable: a igual puntaje gana el destino que va primero alfabéticamente
+        mejores = np.argsort(-matriz, axis=1, kind="stable")[:, :k]
+        if mejores.shape[1] < k:
+            mejores = np.pad(mejores, ((0, 0), (0, k - mejores.shape[1])))
+        top[inicio:fin] = mejores
+        validos[inicio:fin, :min(k, n_destinos)] = np.isfinite(
+            np.take_along_axis(matriz, mejores[:, :min(k, n_destinos)], axis=1))
+        # Relevancia del bloque (bloque × D), solo para marcar los aciertos del top-K
+        relevancia = np.zeros(matriz.shape, dtype=bool)
+        for i, conjunto in enumerate(relevantes[inicio:fin]):
+            relevancia[i, [columna[d] for d in set(conjunto) if d in columna]] = True
+        aciertos[inicio:fin] = np.take_along_axis(relevancia, mejores, axis=1) & validos[inicio:fin]
+        del matriz, relevancia
+    posiciones = np.arange(1, k + 1)
+    descuentos = 1.0 / np.log2(posiciones + 1)
+    ideales = np.minimum(n_relevantes, k)
+    con_relevantes = n_relevantes > 0
+
+    precision = aciertos.sum(axis=1) / k
+    recall = np.divide(aciertos.sum(axis=1), n_relevantes, out=np.zeros(len(consultas)), where=con_relevantes)
+    dcg = aciertos @ descuentos
+    idcg = np.cumsum(descuentos)[np.maximum(ideales, 1) - 1]
+    ndcg = np.where(con_relevantes, dcg / idcg, 0.0)
+    precision_en = np.cumsum(aciertos, axis=1) / posiciones
+    ap = np.divide((precision_en * aciertos).sum(axis=1), ideales, out=np.zeros(len(consultas)), where=con_relevantes)
+    recomendados = np.unique(top[validos])
+
+    por_consulta = pd.DataFrame({
+        f"precision@{k}": precision, f"recall@{k}": recall, f"ndcg@{k}": ndcg, f"ap@{k}": ap,
+        "relevantes": n_relevantes, "aciertos": aciertos.sum(axis=1), "recomendados": validos.sum(axis=1),
+    })
+    resumen = {
+        "consultas": len(consultas),
+        "consultas_con_relevantes": int(con_relevantes.sum()),
+        f"precision@{k}": float(precision.mean()) if len(consultas) else 0.0,
+        f"recall@{k}": float(recall[con_relevantes].mean()) if con_relevantes.any() else 0.0,
+        f"ndcg@{k}": float(ndcg[con_relevantes].mean()) if con_relevantes.any() else 0.0,
+        f"map@{k}": float(ap[con_relevantes].mean()) if con_relevantes.any() else 0.0,
+        "cobertura": len(recomendados) / n_destinos if n_destinos else 0.0,
+    }
+    return resumen, por_consulta
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# Contenido de formato_columnar.py
+"""
+Catálogo en formato columnar
+============================
+Convierte el CSV del catálogo a un formato columnar tipado y lo lee con proyección de
+columnas: solo se abren las columnas que usan las reglas compiladas y el resultado, ya
+codificadas (sin parsear texto ni inferir tipos).
+
+Dos formatos:
+
+- Parquet (requiere pyarrow): columnas numéricas float64 y columnas de texto como
+  diccionario Arrow con las categorías ordenadas. Los índices del diccionario se usan
+  directamente como códigos del CatalogoColumnar.
+- Directorio .columnar (sin dependencias): un .npy por columna (valores float64 o códigos
+  enteros) y un manifiesto.json con el tipo de cada columna y sus categorías.
+
+En ambos casos las categorías quedan en el mismo orden que produce CatalogoColumnar.desde_dataframe,
+así que la base construida es idéntica a la construida desde el CSV.
+
+Uso: python formato_columnar.py cleaned_travel_dataset.csv cleaned_travel_dataset.parquet
+"""
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+
+from catalogo import CatalogoColumnar, _tipo_codigo
+
+FORMATO = 1
+MANIFIESTO = "manifiesto.json"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("El formato Parquet requiere pyarrow (pip install pyarrow); "
+                          "sin pyarrow se puede usar el formato 'npy' (directorio .columnar)") from e
+    return pyarrow
+
+
+def formato_de(ruta):
+    """'npy' para un directorio con manifiesto, 'parquet' para cualquier otro archivo."""
+    return "npy" if os.path.isdir(ruta) or ruta.endswith(".columnar") else "parquet"
+
+
+def escribir(catalogo, ruta, formato=None):
+    """Escribe un CatalogoColumnar (o un DataFrame) en `ruta`."""
+    if not isinstance(catalogo, CatalogoColumnar):
+        catalogo = CatalogoColumnar.desde_dataframe(catalogo)
+    formato = formato or formato_de(ruta)
+    if formato == "parquet":
+        _escribir_parquet(catalogo, ruta)
+    elif formato == "npy":
+        _escribir_npy(catalogo, ruta)
+    else:
+        raise ValueError(f"Formato columnar desconocido: {formato!r}")
+
+
+def _escribir_parquet(catalogo, ruta):
+    pa = _pyarrow()
+    columnas = []
+    for columna in catalogo.columns:
+        if catalogo.es_categorica(columna):
+            codigos = catalogo.codigos(columna)
+            indices = pa.array(codigos.astype(np.int32), mask=codigos < 0)
+            categorias = pa.array(catalogo.categorias(columna).tolist(), type=pa.string())
+            columnas.append(pa.DictionaryArray.from_arrays(indices, categorias))
+        else:
+            columnas.append(pa.array(catalogo.valores(columna), type=pa.float64()))
+    tabla = pa.Table.from_arrays(columnas, names=list(catalogo.columns))
+    pa.parquet.write_table(tabla, ruta)
+
+
+def _escribir_npy(catalogo, ruta):
+    # Se escribe en un directorio temporal y se reemplaza al final, como los snapshots
+    temporal = f"{ruta}.tmp-{os.getpid()}"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    columnas = []
+    for i, columna in enumerate(catalogo.columns):
+        if catalogo.es_categorica(columna):
+            np.save(os.path.join(temporal, f"col_{i}.npy"), catalogo.codigos(columna))
+            columnas.append({"nombre": columna, "categorias": catalogo.categorias(columna).tolist()})
+        else:
+            np.save(os.path.join(temporal, f"col_{i}.npy"), catalogo.valores(columna))
+            columnas.append({"nombre": columna})
+    with open(os.path.join(temporal, MANIFIESTO), "w") as f:
+        json.dump({"formato": FORMATO, "filas": len(catalogo), "columnas": columnas}, f)
+    shutil.rmtree(ruta, ignore_errors=True)
+    os.replace(temporal, ruta)
+
+
+def columnas_guardadas(ruta):
+    """Nombres de las columnas guardadas, en orden."""
+    if formato_de(ruta) == "npy":
+        return [c["nombre"] for c in _leer_manifiesto(ruta)["columnas"]]
+    return _pyarrow().parquet.read_schema(ruta).names
+
+
+def leer(ruta, columnas=None):
+    """Lee el catálogo en un CatalogoColumnar; con `columnas` solo se leen esas (en el orden del archivo)."""
+    disponibles = columnas_guardadas(ruta)
+    if columnas is not None:
+        faltantes = [c for c in columnas if c not in disponibles]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta}: {faltantes}")
+        disponibles = [c for c in disponibles if c in columnas]
+    if formato_de(ruta) == "npy":
+        return _leer_npy(ruta, disponibles)
+    return _leer_parquet(ruta, disponibles)
+
+
+def _leer_manifiesto(ruta):
+    with open(os.path.join(ruta, MANIFIESTO)) as f:
+        manifiesto = json.load(f)
+    if manifiesto.get("formato") != FORMATO:
+        raise ValueError(f"Formato de {ruta} no soportado: {manifiesto.get('formato')}")
+    return manifiesto
+
+
+def _leer_npy(ruta, nombres):
+    manifiesto = _leer_manifiesto(ruta)
+    numericas, categoricas = {}, {}
+    for i, columna in enumerate(manifiesto["columnas"]):
+        if columna["nombre"] not in nombres:
+            continue
+        valores = np.load(os.path.join(ruta, f"col_{i}.npy"))
+        if "categorias" in columna:
+            categoricas[columna["nombre"]] = (valores, columna["categorias"])
+        else:
+            numericas[columna["nombre"]] = valores
+    return CatalogoColumnar(numericas, categoricas, np.arange(manifiesto["filas"]), nombres)
+
+
+def _leer_parquet(ruta, nombres):
+    pa = _pyarrow()
+    # Un diccionario común por columna aunque el archivo tenga varios grupos de filas
+    tabla = pa.parquet.read_table(ruta, columns=nombres).unify_dictionaries()
+    numericas, categoricas = {}, {}
+    for columna in nombres:
+        datos = tabla.column(columna).combine_chunks()
+        if pa.types.is_dictionary(datos.type):
+            categorias = datos.dictionary.to_numpy(zero_copy_only=False)
+            codigos = datos.indices.fill_null(-1).to_numpy().astype(_tipo_codigo(len(categorias)))
+            categoricas[columna] = (codigos, categorias)
+        elif pa.types.is_string(datos.type) or pa.types.is_large_string(datos.type):
+            # Texto sin diccionario (Parquet escrito por otra herramienta): se codifica aquí
+            import pandas as pd
+            codigos, categorias = pd.factorize(datos.to_numpy(zero_copy_only=False), sort=True)
+            categoricas[columna] = (codigos.astype(_tipo_codigo(len(categorias))), categorias)
+        else:
+            numericas[columna] = datos.to_numpy(zero_copy_only=False).astype(float)
+    return CatalogoColumnar(numericas, categoricas, np.arange(tabla.num_rows), nombres)
+
+
+def convertir(ruta_csv, ruta_salida, formato=None):
+    """Convierte el CSV del catálogo al formato columnar; retorna la cantidad de filas."""
+    import pandas as pd
+    catalogo = CatalogoColumnar.desde_dataframe(pd.read_csv(ruta_csv))
+    escribir(catalogo, ruta_salida, formato)
+    return len(catalogo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="CSV del catálogo")
+    parser.add_argument("salida", help="archivo .parquet o directorio .columnar")
+    parser.add_argument("--formato", choices=["parquet", "npy"], help="por defecto, según la extensión de la salida")
+    args = parser.parse_args()
+    filas = convertir(args.csv, args.salida, args.formato)
+    print(f"▶️ {filas} filas escritas en {args.salida}")
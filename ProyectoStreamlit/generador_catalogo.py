@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# Contenido de generador_catalogo.py
+"""
+Generador de catálogos sintéticos
+=================================
+Aprende las distribuciones del dataset de muestra y genera catálogos de cualquier tamaño
+(1e3 a 1e7 filas) con la misma estructura de columnas:
+
+- Destino: frecuencia observada. Los atributos propios del lugar (City, avg_temperature,
+  avg_humidity, top_activities, safety_score) se copian de una fila del mismo destino, así que
+  su relación conjunta se conserva.
+- Mes: uno de los meses observados para el destino, desplazado ±1 mes al azar.
+- Tipo de hospedaje: el del destino con probabilidad 1 - SUAVIZADO, si no el marginal global.
+- Duración y costos: normal multivariada en escala logarítmica por tipo de hospedaje (captura
+  la correlación entre costo de hospedaje, transporte y duración) más el desvío medio del
+  destino, reducido hacia cero cuando el destino tiene pocas filas.
+- Viajero (género y nacionalidad): marginales globales.
+
+La generación es determinista: la fila i depende solo de la semilla y de i (se genera por
+bloques de tamaño fijo, cada uno con su propio generador), así que un catálogo chico es
+prefijo de uno grande. Las columnas de texto se devuelven como categóricas para que 1e7 filas
+quepan en memoria; generar_csv escribe por bloques sin materializar el catálogo.
+
+Uso: python generador_catalogo.py 1e6 catalogo_1e6.csv --semilla 42
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+RUTA_MUESTRA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cleaned_travel_dataset.csv")
+
+
+class GeneradorCatalogo:
+    COLUMNAS_LUGAR = ["City", "avg_temperature", "avg_humidity", "top_activities", "safety_score"]
+    COLUMNAS_VIAJERO = ["Traveler gender", "Traveler nationality"]
+    COLUMNAS_LOG = ["Duration (days)", "Accommodation cost", "Transportation cost"]
+    # Probabilidad de tomar el tipo de hospedaje del marginal global en lugar del destino
+    SUAVIZADO = 0.2
+    # Filas "virtuales" con las que se reduce el desvío de costos de cada destino hacia cero
+    PESO_PREVIO = 3.0
+    # Mínimo de filas de un tipo de hospedaje para estimar su propia covarianza
+    MINIMO_TIPO = 5
+    BLOQUE = 100_000
+
+    def __init__(self, muestra):
+        self.columnas = list(muestra.columns)
+        muestra = muestra.reset_index(drop=True)
+        self.destinos, codigos = np.unique(muestra["Destination"].to_numpy(dtype=object), return_inverse=True)
+        self.prob_destino = np.bincount(codigos) / len(codigos)
+        # Filas de la muestra agrupadas por destino (para lugar, mes y tipo de hospedaje)
+        self.filas_destino = [np.flatnonzero(codigos == d) for d in range(len(self.destinos))]
+        self.orden_destino = np.concatenate(self.filas_destino)
+        self.cantidad_destino = np.array([len(filas) for filas in self.filas_destino])
+        self.inicio_destino = np.concatenate([[0], np.cumsum(self.cantidad_destino)[:-1]])
+        self.lugar = {c: muestra[c].to_numpy() for c in self.COLUMNAS_LUGAR if c in muestra}
+        self.meses = muestra["Month"].to_numpy(dtype=float)
+        self.tipos_fila = muestra["Accommodation type"].to_numpy(dtype=object)
+        self.tipos, conteo = np.unique(self.tipos_fila, return_counts=True)
+        self.prob_tipo = conteo / conteo.sum()
+        self.viajero = {c: muestra[c].value_counts(normalize=True) for c in self.COLUMNAS_VIAJERO if c in muestra}
+
+        # Normal multivariada en log por tipo; los tipos con pocas filas usan la global
+        logs = np.log(muestra[self.COLUMNAS_LOG].to_numpy(dtype=float))
+        global_ = (logs.mean(axis=0), np.cov(logs, rowvar=False))
+        self.normales = {}
+        for tipo in self.tipos:
+            filas = logs[self.tipos_fila == tipo]
+            self.normales[tipo] = (filas.mean(axis=0), np.cov(filas, rowvar=False)) if len(filas) >= self.MINIMO_TIPO else global_
+        # Desvío de cada destino respecto de la media de su tipo, reducido según cuántas filas tiene
+        residuos = logs - np.array([self.normales[t][0] for t in self.tipos_fila])
+        self.desvio_destino = np.array([
+            residuos[filas].sum(axis=0) / (len(filas) + self.PESO_PREVIO) for filas in self.filas_destino
+        ])
+
+    @classmethod
+    def desde_csv(cls, ruta=RUTA_MUESTRA):
+        return cls(pd.read_csv(ruta))
+
+    def _bloque(self, semilla, indice):
+        n_filas = self.BLOQUE
+        rng = np.random.default_rng([semilla, indice])
+        destino = rng.choice(len(self.destinos), n_filas, p=self.prob_destino)
+        # Una fila de la muestra del mismo destino: aporta lugar, mes y tipo de hospedaje
+        cantidad = self.cantidad_destino[destino]
+        fila = self.orden_destino[self.inicio_destino[destino] + (rng.random(n_filas) * cantidad).astype(np.int64)]
+
+        datos = {"Destination": self.destinos[destino]}
+        datos["Month"] = (self.meses[fila] - 1 + rng.integers(-1, 2, n_filas)) % 12 + 1
+        tipo = self.tipos_fila[fila].copy()
+        globales = rng.random(n_filas) < self.SUAVIZADO
+        tipo[globales] = self.tipos[rng.choice(len(self.tipos), int(globales.sum()), p=self.prob_tipo)]
+
+        logs = np.empty((n_filas, len(self.COLUMNAS_LOG)))
+        for t, (media, covarianza) in self.normales.items():
+            filas_tipo = np.flatnonzero(tipo == t)
+            if len(filas_tipo):
+                logs[filas_tipo] = rng.multivariate_normal(media, covarianza, len(filas_tipo), method="cholesky")
+        logs += self.desvio_destino[destino]
+        valores = np.exp(logs)
+        datos["Duration (days)"] = np.clip(np.round(valores[:, 0]), 1, None)
+        datos["Accommodation type"] = tipo
+        datos["Accommodation cost"] = np.round(valores[:, 1], 2)
+        datos["Transportation cost"] = np.round(valores[:, 2], 2)
+        for columna, marginal in self.viajero.items():
+            datos[columna] = marginal.index.to_numpy(dtype=object)[rng.choice(len(marginal), n_filas, p=marginal.to_numpy())]
+        for columna, valores_lugar in self.lugar.items():
+            datos[columna] = valores_lugar[fila]
+
+        bloque = pd.DataFrame({c: datos[c] for c in self.columnas if c in datos})
+        for columna in bloque.columns:
+            if not pd.api.types.is_numeric_dtype(bloque[columna]):
+                bloque[columna] = bloque[columna].astype("category")
+        bloque.index = pd.RangeIndex(indice * self.BLOQUE, indice * self.BLOQUE + n_filas)
+        return bloque
+
+    def bloques(self, n_filas, semilla=42):
+        """Genera el catálogo de `n_filas` filas por bloques de BLOQUE filas."""
+        for indice, inicio in enumerate(range(0, int(n_filas), self.BLOQUE)):
+            # Siempre se genera el bloque completo: el último se recorta, así el resultado no depende de n_filas
+            yield self._bloque(semilla, indice).iloc[:int(n_filas) - inicio]
+
+    def generar(self, n_filas, semilla=42):
+        """Catálogo completo como DataFrame (columnas de texto categóricas)."""
+        return pd.concat(list(self.bloques(n_filas, semilla)))
+
+    def generar_csv(self, ruta, n_filas, semilla=42):
+        """Escribe el catálogo en un CSV bloque a bloque."""
+        for indice, bloque in enumerate(self.bloques(n_filas, semilla)):
+            bloque.to_csv(ruta, mode="w" if indice == 0 else "a", header=indice == 0, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("filas", type=float, help="cantidad de filas (acepta notación 1e6)")
+    parser.add_argument("salida", help="ruta del CSV a escribir")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--muestra", default=RUTA_MUESTRA, help="dataset del que se aprenden las distribuciones")
+    args = parser.parse_args()
+    GeneradorCatalogo.desde_csv(args.muestra).generar_csv(args.salida, int(args.filas), args.semilla)
+    print(f"▶️ {int(args.filas)} filas escritas en {args.salida}")
@@ -0,0 +1,165 @@
+# Contenido de indice_similitud.py
+"""
+Índices de similitud de coseno
+==============================
+La regla CosineSimilarityRule delega en un índice construido una sola vez en BaseConocimiento:
+
+- IndiceExacto: guarda los vectores del catálogo ya normalizados (norma 1), de modo que la
+  similitud de coseno de una consulta es un solo producto matriz-vector. Se guardan en orden
+  Fortran (cada dimensión contigua), que es como los recorre el plan de puntuación.
+- IndiceIVF: aproximado, estilo "inverted file". Agrupa los vectores unitarios con k-means
+  esférico en `n_listas` listas; una consulta solo revisa las `n_sondeos` listas cuyos
+  centroides son más parecidos. Más sondeos (o un mínimo de candidatos mayor) = más recall
+  y más latencia.
+"""
+import numpy as np
+
+
+def normalizar_filas(matriz):
+    """Divide cada fila por su norma euclidiana (las filas nulas quedan en cero)."""
+    matriz = np.asarray(matriz, dtype=float)
+    normas = np.sqrt(np.einsum("ij,ij->i", matriz, matriz))
+    normas[normas == 0.0] = 1.0
+    return np.ascontiguousarray(matriz / normas[:, None])
+
+
+class IndiceExacto:
+    aproximado = False
+    tipo = "exacto"
+
+    def __init__(self, unitarios):
+        self.unitarios = np.asfortranarray(unitarios)
+
+    def exportar(self):
+        """Parámetros (JSON) y arreglos necesarios para reconstruir el índice sin recalcularlo."""
+        return {}, {}
+
+    @classmethod
+    def desde_exportado(cls, unitarios, parametros, arreglos):
+        return cls(unitarios)
+
+    def actualizado(self, unitarios, desde=0):
+        """Índice sobre `unitarios`, donde las filas anteriores a `desde` no cambiaron."""
+        return type(self)(unitarios)
+
+    def similitud(self, consultas_unitarias, filas=slice(None)):
+        """Coseno de N consultas unitarias (N×d) contra las filas indicadas → N×F."""
+        return consultas_unitarias @ self.unitarios[filas].T
+
+    def candidatos(self, consulta_unitaria, filtro=None):
+        """Todas las filas (que cumplen el filtro) son candidatas en el índice exacto."""
+        filas = np.arange(len(self.unitarios))
+        return filas if filtro is None else filas[filtro(filas)]
+
+
+class IndiceIVF(IndiceExacto):
+    aproximado = True
+    tipo = "ivf"
+
+    def __init__(self, unitarios, n_listas=None, n_sondeos=8, minimo_candidatos=64,
+                 iteraciones=10, muestra_max=100_000, semilla=0):
+        super().__init__(unitarios)
+        self.minimo_candidatos = minimo_candidatos
+        n_filas = len(unitarios)
+        self.n_listas = max(1, min(n_filas, n_listas or int(np.sqrt(n_filas))))
+        self.n_sondeos = min(n_sondeos, self.n_listas)
+
+        # Entrenamiento sobre una muestra; la asignación final sí recorre todo el catálogo
+        rng = np.random.default_rng(semilla)
+        muestra = unitarios[rng.choice(n_filas, min(n_filas, max(muestra_max, self.n_listas)), replace=False)]
+        centroides = muestra[rng.choice(len(muestra), self.n_listas, replace=False)]
+        for _ in range(iteraciones):
+            asignacion = self._asignar(muestra, centroides)
+            sumas = np.zeros_like(centroides)
+            np.add.at(sumas, asignacion, muestra)
+            normas = np.linalg.norm(sumas, axis=1)
+            vacias = normas == 0.0
+            # Las listas vacías conservan su centroide anterior
+            sumas[vacias] = centroides[vacias]
+            normas[vacias] = np.linalg.norm(centroides[vacias], axis=1)
+            normas[normas == 0.0] = 1.0
+            centroides = sumas / normas[:, None]
+        self.centroides = centroides
+
+        self._agrupar(self._asignar(unitarios, centroides))
+
+    def _agrupar(self, asignacion):
+        # Miembros de cada lista guardados de forma contigua: lista l = miembros[limites[l]:limites[l+1]]
+        self.miembros = np.argsort(asignacion, kind="stable")
+        self.limites = np.searchsorted(asignacion[self.miembros], np.arange(self.n_listas + 1))
+
+    def asignacion(self):
+        """Lista de cada fila (inversa de miembros/limites)."""
+        asignacion = np.empty(len(self.miembros), dtype=np.int32)
+        asignacion[self.miembros] = np.repeat(np.arange(self.n_listas, dtype=np.int32), np.diff(self.limites))
+        return asignacion
+
+    def exportar(self):
+        parametros = {"n_listas": self.n_listas, "n_sondeos": self.n_sondeos, "minimo_candidatos": self.minimo_candidatos}
+        arreglos = {"centroides": self.centroides, "miembros": self.miembros, "limites": self.limites}
+        return parametros, arreglos
+
+    @classmethod
+    def desde_exportado(cls, unitarios, parametros, arreglos):
+        indice = cls.__new__(cls)
+        IndiceExacto.__init__(indice, unitarios)
+        indice.n_listas = parametros["n_listas"]
+        indice.n_sondeos = parametros["n_sondeos"]
+        indice.minimo_candidatos = parametros["minimo_candidatos"]
+        indice.centroides = arreglos["centroides"]
+        indice.miembros = arreglos["miembros"]
+        indice.limites = arreglos["limites"]
+        return indice
+
+    def actualizado(self, unitarios, desde=0):
+        """Asigna a las listas solo las filas desde `desde`, sin reentrenar los centroides."""
+        indice = type(self).__new__(type(self))
+        IndiceExacto.__init__(indice, unitarios)
+        indice.n_listas, indice.n_sondeos = self.n_listas, self.n_sondeos
+        indice.minimo_candidatos = self.minimo_candidatos
+        indice.centroides = self.centroides
+        anteriores = self.asignacion()[:desde] if desde else np.empty(0, dtype=np.int32)
+        indice._agrupar(np.concatenate([anteriores, self._asignar(unitarios[desde:], self.centroides)]))
+        return indice
+
+    @staticmethod
+    def _asignar(vectores, centroides, bloque=65_536):
+        """Lista más parecida para cada vector, por bloques para acotar memoria."""
+        asignacion = np.empty(len(vectores), dtype=np.int32)
+        for inicio in range(0, len(vectores), bloque):
+            fin = inicio + bloque
+            asignacion[inicio:fin] = np.argmax(vectores[inicio:fin] @ centroides.T, axis=1)
+        return asignacion
+
+    def candidatos(self, consulta_unitaria, filtro=None):
+        """Filas de las n_sondeos listas más cercanas a la consulta.
+
+        Si se da un `filtro` (función sobre un arreglo de filas que retorna una máscara), las
+        listas se siguen sondeando en orden de parecido hasta reunir `minimo_candidatos` filas
+        que lo cumplan, para que filtros muy selectivos no dejen el resultado vacío.
+        """
+        orden = np.argsort(-(self.centroides @ consulta_unitaria))
+        bloques, encontradas, sondeadas = [], 0, 0
+        while sondeadas < self.n_listas:
+            tanda = orden[sondeadas:sondeadas + max(self.n_sondeos if sondeadas == 0 else 1, 1)]
+            sondeadas += len(tanda)
+            filas = np.concatenate([self.miembros[self.limites[l]:self.limites[l + 1]] for l in tanda])
+            if filtro is not None:
+                filas = filas[filtro(filas)]
+            bloques.append(filas)
+            encontradas += len(filas)
+            if filtro is None or encontradas >= self.minimo_candidatos:
+                break
+        return np.concatenate(bloques)
+
+
+INDICES = {IndiceExacto.tipo: IndiceExacto, IndiceIVF.tipo: IndiceIVF}
+
+
+def crear_indice(tipo, unitarios, **opciones):
+    """Construye el índice de similitud indicado ('exacto' o 'ivf')."""
+    if tipo == "exacto":
+        return IndiceExacto(unitarios)
+    if tipo == "ivf":
+        return IndiceIVF(unitarios, **opciones)
+    raise ValueError(f"Tipo de índice desconocido: {tipo}")
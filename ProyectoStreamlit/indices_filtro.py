@@ -0,0 +1,96 @@
+# Contenido de indices_filtro.py
+"""
+Índices de prefiltrado por presupuesto y tipo de hospedaje
+==========================================================
+Al cargar el catálogo sus filas se ordenan físicamente por (tipo de hospedaje, costo total):
+
+- Cada tipo de hospedaje ocupa un rango contiguo de filas, y dentro de él los costos están
+  ordenados, así que "tipo == t y costo <= presupuesto" es un slice que se obtiene con dos
+  búsquedas binarias.
+- Para consultas sin tipo se guarda además la permutación de filas ordenada por costo:
+  el corte por presupuesto es un prefijo de esa permutación.
+
+La puntuación se calcula solo sobre las filas candidatas.
+
+Con actualizaciones incrementales (BaseConocimiento.add_destinations / remove_destinations)
+solo las primeras `n_ordenadas` filas respetan ese orden: las agregadas después quedan al
+final sin ordenar y se filtran con una máscara, y las eliminadas se marcan en `vivas`
+(tombstones) hasta la próxima compactación.
+"""
+import numpy as np
+
+
+def orden_fisico(costos, codigos_tipo):
+    """Permutación que ordena el catálogo por tipo de hospedaje y luego por costo."""
+    return np.lexsort((costos, codigos_tipo))
+
+
+class IndiceFiltros:
+    def __init__(self, costos, codigos_tipo, orden_costo=None, costos_ordenados=None, n_ordenadas=None, vivas=None):
+        # Las primeras n_ordenadas filas deben venir en el orden de orden_fisico()
+        self.costos = costos
+        self.codigos_tipo = codigos_tipo
+        self.n_ordenadas = len(costos) if n_ordenadas is None else n_ordenadas
+        # Máscara de filas vigentes; None si no hay ninguna eliminada
+        self.vivas = vivas
+        # La permutación puede venir precalculada (p. ej. desde un snapshot o una actualización)
+        ordenadas = costos[:self.n_ordenadas]
+        self.orden_costo = np.argsort(ordenadas, kind="stable") if orden_costo is None else orden_costo
+        self.costos_ordenados = ordenadas[self.orden_costo] if costos_ordenados is None else costos_ordenados
+
+    @property
+    def pendientes(self):
+        """Filas fuera del orden físico: agregadas al final más las eliminadas."""
+        muertas = 0 if self.vivas is None else len(self.vivas) - int(np.count_nonzero(self.vivas))
+        return len(self.costos) - self.n_ordenadas + muertas
+
+    def rango_tipo(self, codigo):
+        """Filas [inicio, fin) de la parte ordenada que pertenecen a un tipo de hospedaje."""
+        codigos = self.codigos_tipo[:self.n_ordenadas]
+        inicio = int(np.searchsorted(codigos, codigo, side="left"))
+        fin = int(np.searchsorted(codigos, codigo, side="right"))
+        return inicio, fin
+
+    def mascara(self, filas, presupuesto, codigo=None):
+        """Cuáles de las `filas` (posiciones) cumplen presupuesto, tipo y siguen vigentes."""
+        mascara = self.costos[filas] <= presupuesto
+        if codigo is not None:
+            mascara &= self.codigos_tipo[filas] == codigo
+        if self.vivas is not None:
+            mascara &= self.vivas[filas]
+        return mascara
+
+    def candidatos(self, presupuesto, codigo=None):
+        """Filas que cumplen el presupuesto (y el tipo, si se da).
+
+        Con tipo retorna un slice contiguo; sin tipo, un arreglo de posiciones ordenado por costo.
+        Si hay filas agregadas o eliminadas desde la última compactación retorna posiciones.
+        """
+        if codigo is None:
+            fin = np.searchsorted(self.costos_ordenados, presupuesto, side="right")
+            filas = self.orden_costo[:fin]
+        else:
+            inicio, fin = self.rango_tipo(codigo)
+            fin = inicio + int(np.searchsorted(self.costos[inicio:fin], presupuesto, side="right"))
+            filas = slice(inicio, fin)
+        if self.n_ordenadas < len(self.costos):
+            agregadas = np.arange(self.n_ordenadas, len(self.costos))
+            agregadas = agregadas[self.mascara(agregadas, presupuesto, codigo)]
+            filas = np.concatenate([posiciones(filas), agregadas])
+        if self.vivas is not None:
+            filas = posiciones(filas)
+            filas = filas[self.vivas[filas]]
+        return filas
+
+
+def posiciones(filas):
+    """Convierte un slice o arreglo de candidatos en posiciones explícitas."""
+    if isinstance(filas, slice):
+        return np.arange(filas.start, filas.stop)
+    return filas
+
+
+def cantidad(filas):
+    if isinstance(filas, slice):
+        return filas.stop - filas.start
+    return len(filas)
@@ -0,0 +1,197 @@
+# Contenido de instrumentacion.py
+"""
+Instrumentación de la ruta de inferencia
+========================================
+Contadores e histogramas de latencia por etapa (filtros, puntuación por regla, top-K, armado
+del DataFrame, caché...) registrados por BaseConocimiento, PlanPuntuacion y MotorInferencia
+en un registro por proceso, METRICAS. Las reglas se miden por instancia: una etapa por columna
+de igualdad, por regla difusa y por preferencia (p. ej. "regla_igualdad:Accommodation type").
+
+Uso en el código instrumentado:
+
+    t0 = METRICAS.inicio()
+    ...
+    METRICAS.registrar("filtros", t0)
+
+La instrumentación viene apagada: se enciende con METRICAS.activa = True o con la variable
+de entorno SBEC_METRICAS=1. Apagada, inicio() retorna 0 sin leer el reloj y registrar()
+retorna de inmediato: el costo es una llamada y una comparación por etapa.
+
+Cada hilo acumula en sus propios histogramas y contadores, sin candado en la ruta de
+inferencia; estadisticas() y prometheus() combinan los acumuladores al leer, así que con
+hilos registrando en ese momento la lectura puede quedar una observación atrás. Los datos
+se pueden volcar a un archivo con volcar() o servir desde servicio_http.py en GET /metricas.
+"""
+import bisect
+import os
+import threading
+import time
+import weakref
+
+# Límites de los buckets del histograma, en segundos (10 µs a 2.5 s)
+LIMITES_S = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+             1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histograma:
+    __slots__ = ("cubetas", "cantidad", "suma_ns", "maximo_ns")
+
+    def __init__(self):
+        self.cubetas = [0] * (len(LIMITES_S) + 1)
+        self.cantidad = 0
+        self.suma_ns = 0
+        self.maximo_ns = 0
+
+    def observar(self, duracion_ns):
+        self.cubetas[bisect.bisect_left(LIMITES_S, duracion_ns / 1e9)] += 1
+        self.cantidad += 1
+        self.suma_ns += duracion_ns
+        if duracion_ns > self.maximo_ns:
+            self.maximo_ns = duracion_ns
+
+    def sumar(self, otro):
+        self.cubetas = [a + b for a, b in zip(self.cubetas, otro.cubetas)]
+        self.cantidad += otro.cantidad
+        self.suma_ns += otro.suma_ns
+        self.maximo_ns = max(self.maximo_ns, otro.maximo_ns)
+
+    def cuantil(self, q):
+        """Cuantil aproximado: límite superior de la cubeta que lo contiene (en segundos)."""
+        objetivo, acumulado = q * self.cantidad, 0
+        for limite, conteo in zip(LIMITES_S, self.cubetas):
+            acumulado += conteo
+            if acumulado >= objetivo:
+                return limite
+        return self.maximo_ns / 1e9
+
+
+class _Acumulador:
+    """Histogramas y contadores de un hilo; solo ese hilo escribe en ellos."""
+    __slots__ = ("etapas", "contadores")
+
+    def __init__(self):
+        self.etapas = {}
+        self.contadores = {}
+
+
+class Instrumentacion:
+    def __init__(self, activa=False, prefijo="sbec"):
+        self.activa = activa
+        self.prefijo = prefijo
+        self._locales = threading.local()
+        # (hilo, acumulador) de los hilos que registraron; los de hilos terminados se pliegan en _retirado
+        self._acumuladores = []
+        self._retirado = _Acumulador()
+        self._lock = threading.Lock()
+
+    def _propio(self):
+        try:
+            return self._locales.acumulador
+        except AttributeError:
+            acumulador = self._locales.acumulador = _Acumulador()
+            with self._lock:
+                self._plegar_terminados()
+                self._acumuladores.append((weakref.ref(threading.current_thread()), acumulador))
+            return acumulador
+
+    def _plegar_terminados(self):
+        vivos = []
+        for hilo, acumulador in self._acumuladores:
+            if hilo() is not None and hilo().is_alive():
+                vivos.append((hilo, acumulador))
+            else:
+                self._combinar(self._retirado, acumulador)
+        self._acumuladores = vivos
+
+    @staticmethod
+    def _combinar(destino, acumulador):
+        # Copias: el hilo dueño puede estar agregando entradas mientras se lee
+        for etapa, h in dict(acumulador.etapas).items():
+            destino.etapas.setdefault(etapa, Histograma()).sumar(h)
+        for contador, valor in dict(acumulador.contadores).items():
+            destino.contadores[contador] = destino.contadores.get(contador, 0) + valor
+
+    def _combinados(self):
+        """Acumulador con la suma de todos los hilos (se llama con el candado tomado)."""
+        self._plegar_terminados()
+        total = _Acumulador()
+        self._combinar(total, self._retirado)
+        for _, acumulador in self._acumuladores:
+            self._combinar(total, acumulador)
+        return total
+
+    def inicio(self):
+        """Marca de tiempo para registrar(); 0 si la instrumentación está apagada."""
+        return time.perf_counter_ns() if self.activa else 0
+
+    def registrar(self, etapa, t0):
+        """Agrega al histograma de `etapa` el tiempo transcurrido desde `t0` y retorna el instante actual."""
+        if not t0:
+            return 0
+        ahora = time.perf_counter_ns()
+        etapas = self._propio().etapas
+        histograma = etapas.get(etapa)
+        if histograma is None:
+            histograma = etapas[etapa] = Histograma()
+        histograma.observar(ahora - t0)
+        return ahora
+
+    def contar(self, contador, cantidad=1):
+        if not self.activa:
+            return
+        contadores = self._propio().contadores
+        contadores[contador] = contadores.get(contador, 0) + cantidad
+
+    def reiniciar(self):
+        with self._lock:
+            self._retirado = _Acumulador()
+            for _, acumulador in self._acumuladores:
+                acumulador.etapas, acumulador.contadores = {}, {}
+
+    def estadisticas(self):
+        """Contadores y, por etapa: cantidad, total, media, máximo y p50/p90/p99 aproximados (ms)."""
+        with self._lock:
+            total = self._combinados()
+        etapas = {
+            etapa: {
+                "cantidad": h.cantidad,
+                "total_ms": h.suma_ns / 1e6,
+                "media_ms": h.suma_ns / h.cantidad / 1e6,
+                "max_ms": h.maximo_ns / 1e6,
+                "p50_ms": h.cuantil(0.5) * 1e3,
+                "p90_ms": h.cuantil(0.9) * 1e3,
+                "p99_ms": h.cuantil(0.99) * 1e3,
+            }
+            for etapa, h in total.etapas.items()
+        }
+        return {"activa": self.activa, "etapas": etapas, "contadores": total.contadores}
+
+    def prometheus(self):
+        """Volcado en el formato de texto de Prometheus (histogramas acumulados y contadores)."""
+        nombre = f"{self.prefijo}_etapa_segundos"
+        lineas = [f"# HELP {nombre} Latencia por etapa de la ruta de inferencia.", f"# TYPE {nombre} histogram"]
+        with self._lock:
+            total = self._combinados()
+        for etapa, h in sorted(total.etapas.items()):
+            acumulado = 0
+            for limite, conteo in zip(LIMITES_S + ("+Inf",), h.cubetas):
+                acumulado += conteo
+                lineas.append(f'{nombre}_bucket{{etapa="{etapa}",le="{limite}"}} {acumulado}')
+            lineas.append(f'{nombre}_sum{{etapa="{etapa}"}} {h.suma_ns / 1e9:.9f}')
+            lineas.append(f'{nombre}_count{{etapa="{etapa}"}} {h.cantidad}')
+        contador = f"{self.prefijo}_eventos_total"
+        lineas += [f"# HELP {contador} Contadores de la ruta de inferencia.", f"# TYPE {contador} counter"]
+        for evento, valor in sorted(total.contadores.items()):
+            lineas.append(f'{contador}{{evento="{evento}"}} {valor}')
+        return "\n".join(lineas) + "\n"
+
+    def volcar(self, ruta):
+        """Escribe prometheus() en `ruta` de forma atómica (para el textfile collector de node_exporter)."""
+        temporal = f"{ruta}.tmp-{os.getpid()}"
+        with open(temporal, "w") as f:
+            f.write(self.prometheus())
+        os.replace(temporal, ruta)
+
+
+# Registro del proceso; SBEC_METRICAS=1 lo enciende desde el arranque
+METRICAS = Instrumentacion(activa=os.environ.get("SBEC_METRICAS", "0") not in ("", "0"))
@@ -0,0 +1,62 @@
+# Contenido de motor_compartido.py
+"""
+Motor compartido por proceso
+============================
+La Base de Conocimientos (catálogo, escalador, índices y plan de reglas) se construye una
+sola vez por proceso y la reutilizan todas las sesiones. Cada sesión solo crea su propia
+BaseHechos y un MotorInferencia liviano que apunta a la base y a la caché compartidas.
+"""
+import os
+import threading
+import time
+
+from base_conocimiento import BaseConocimiento
+from base_hechos import BaseHechos
+from cache_resultados import CacheResultados
+from motor_inferencia import MotorInferencia
+from tabla_topk import TablaTopK
+
+RUTA_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cleaned_travel_dataset.csv")
+# Snapshot binario junto al CSV; se regenera solo si cambian el CSV o rules.json
+RUTA_SNAPSHOT = os.path.splitext(RUTA_DATASET)[0] + ".snapshot"
+# Tabla de top-K materializada (opcional, se construye offline con tabla_topk.py)
+RUTA_TABLA = os.path.splitext(RUTA_DATASET)[0] + ".topk"
+
+_lock = threading.Lock()
+_compartido = None
+
+
+class MotorCompartido:
+    """Recursos de solo lectura compartidos entre sesiones."""
+
+    def __init__(self, ruta_dataset=RUTA_DATASET, capacidad_cache=1024, ttl_cache=None, ruta_snapshot=RUTA_SNAPSHOT,
+                 ruta_tabla=RUTA_TABLA):
+        t0 = time.perf_counter()
+        self.base_conocimiento = BaseConocimiento.desde_csv(ruta_dataset, ruta_snapshot)
+        self.cache = CacheResultados(capacidad=capacidad_cache, ttl=ttl_cache)
+        # None si no hay tabla o si fue construida con otro CSV o con otras reglas
+        self.tabla = TablaTopK.cargar(ruta_tabla, self.base_conocimiento) if ruta_tabla else None
+        # Motor sin hechos propios: atiende Consultas de cualquier hilo (API sin estado)
+        self.motor = MotorInferencia(self.base_conocimiento, cache=self.cache, tabla=self.tabla)
+        self.tiempo_arranque_s = time.perf_counter() - t0
+
+    def nueva_sesion(self):
+        """MotorInferencia con hechos propios de la sesión sobre la base compartida."""
+        return MotorInferencia(self.base_conocimiento, BaseHechos(), self.cache, self.tabla)
+
+
+def obtener_motor_compartido():
+    """Retorna el motor del proceso, construyéndolo la primera vez (seguro entre hilos)."""
+    global _compartido
+    if _compartido is None:
+        with _lock:
+            if _compartido is None:
+                _compartido = MotorCompartido()
+    return _compartido
+
+
+def calentar_en_segundo_plano():
+    """Construye el motor en un hilo aparte para que el servidor no espere al arrancar."""
+    hilo = threading.Thread(target=obtener_motor_compartido, name="calentar-motor", daemon=True)
+    hilo.start()
+    return hilo
@@ -1,16 +1,97 @@
 # Contenido actualizado de motor_inferencia.py
+from base_hechos import Consulta
+from cache_resultados import CacheResultados
+from instrumentacion import METRICAS
+
 class MotorInferencia:
-    def __init__(self, base_conocimiento, base_hechos):
+    """Motor de recomendaciones.
+
+    recomendar() y recomendar_batch() reciben los hechos como valores inmutables (Consulta) y no
+    escriben estado compartido: un mismo motor puede atender consultas desde varios hilos.
+    generar_recomendaciones() conserva el flujo de la app, que lee los hechos de su BaseHechos.
+    Con una TablaTopK (tabla_topk.py) las consultas que caen en su grilla se responden desde la
+    tabla, antes que la caché; el resto se calcula.
+    Los tiempos por etapa y los aciertos de caché quedan en `metricas` (instrumentacion.py).
+    """
+    metricas = METRICAS
+
+    def __init__(self, base_conocimiento, base_hechos=None, cache=None, tabla=None):
         self.base_conocimiento = base_conocimiento
         self.base_hechos = base_hechos
+        # CacheResultados opcional; puede compartirse entre varios motores sobre la misma base
+        self.cache = cache
+        # TablaTopK opcional, construida offline sobre las mismas fuentes que la base
+        self.tabla = tabla
 
     def generar_recomendaciones(self):
-        datos_usuario = self.base_hechos.obtener_datos_usuario()
-        recomendaciones = self.base_conocimiento.recomendar_destinos(
-            datos_usuario["presupuesto"],
-            datos_usuario["duracion_min"],
-            datos_usuario["duracion_max"],
-            datos_usuario["mes"],
-            datos_usuario["tipo_hospedaje"]
+        return self.recomendar(self.base_hechos.obtener_consulta())
+
+    def generar_recomendaciones_batch(self, lista_hechos):
+        """Genera recomendaciones para varios perfiles de usuario en una sola pasada.
+
+        lista_hechos es una lista de diccionarios con el mismo formato que
+        BaseHechos.obtener_datos_usuario() (o de Consultas); retorna un DataFrame por perfil.
+        """
+        return self.recomendar_batch(
+            hechos if isinstance(hechos, Consulta) else Consulta.desde_hechos(hechos) for hechos in lista_hechos
         )
-        return recomendaciones.head(6)
\ No newline at end of file
+
+    def recomendar(self, consulta, k=6):
+        """Recomendaciones de una Consulta; el DataFrame retornado es propio de quien llama."""
+        t0 = METRICAS.inicio()
+        if self.tabla is not None:
+            recomendaciones = self._de_tabla(consulta, k)
+            if recomendaciones is not None:
+                METRICAS.registrar("motor_recomendar", t0)
+                return recomendaciones
+        if self.cache is not None:
+            clave = CacheResultados.clave(consulta) + (k,)
+            version = self.base_conocimiento.version
+            recomendaciones = self.cache.obtener(clave, version)
+            if recomendaciones is not None:
+                METRICAS.contar("cache_aciertos")
+                recomendaciones = recomendaciones.copy()
+                METRICAS.registrar("motor_recomendar", t0)
+                return recomendaciones
+            METRICAS.contar("cache_fallos")
+        recomendaciones = self.base_conocimiento.recomendar_destinos(*consulta, k=k)
+        if self.cache is not None:
+            self.cache.guardar(clave, version, recomendaciones.copy())
+        METRICAS.registrar("motor_recomendar", t0)
+        return recomendaciones
+
+    def recomendar_batch(self, consultas, k=6):
+        """Recomendaciones de varias Consultas en una sola pasada.
+
+        Con caché, solo las consultas que no están guardadas entran al lote.
+        """
+        t0 = METRICAS.inicio()
+        consultas = list(consultas)
+        recomendaciones = [None] * len(consultas)
+        version = self.base_conocimiento.version
+        if self.tabla is not None:
+            recomendaciones = [self._de_tabla(consulta, k) for consulta in consultas]
+        pendientes = [i for i, r in enumerate(recomendaciones) if r is None]
+        if self.cache is not None:
+            claves = {i: CacheResultados.clave(consultas[i]) + (k,) for i in pendientes}
+            for i, clave in claves.items():
+                guardado = self.cache.obtener(clave, version)
+                if guardado is not None:
+                    recomendaciones[i] = guardado.copy()
+            calculadas = [i for i in pendientes if recomendaciones[i] is None]
+            METRICAS.contar("cache_aciertos", len(pendientes) - len(calculadas))
+            METRICAS.contar("cache_fallos", len(calculadas))
+            pendientes = calculadas
+        lote = [tuple(consultas[i]) for i in pendientes]
+        calculadas = self.base_conocimiento.recomendar_destinos_batch(lote, k) if lote else []
+        for i, resultado in zip(pendientes, calculadas):
+            recomendaciones[i] = resultado
+            if self.cache is not None:
+                self.cache.guardar(claves[i], version, resultado.copy())
+        METRICAS.registrar("motor_recomendar_batch", t0)
+        return recomendaciones
+
+    def _de_tabla(self, consulta, k):
+        recomendaciones = self.tabla.buscar(self.base_conocimiento, consulta, k)
+        METRICAS.contar("tabla_aciertos" if recomendaciones is not None else "tabla_fallos")
+        return recomendaciones
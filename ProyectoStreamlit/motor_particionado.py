@@ -0,0 +1,281 @@
+# Contenido de motor_particionado.py
+"""
+Puntuación particionada en varios procesos
+==========================================
+Para catálogos de millones de filas. La matriz de vectores unitarios, los arreglos del plan
+compilado (vector estático, códigos de igualdad, columnas de preferencia) y las columnas de
+filtro (costo y tipo de hospedaje) se copian una sola vez
+a bloques de memoria compartida (multiprocessing.shared_memory); los procesos del pool se
+adjuntan a ellos por nombre, así que el catálogo nunca se serializa.
+
+- Las filas se reparten en `n_procesos` particiones de forma intercalada (fila i → partición
+  i % n) sobre el orden físico (tipo de hospedaje, costo): cada partición conserva ese orden,
+  tiene su propio IndiceFiltros y recibe una parte pareja de cada tipo de hospedaje.
+- Cada proceso puntúa con el mismo PlanPuntuacion (sobre vistas de su partición) y devuelve
+  solo su top-K local: posiciones y puntajes.
+- El proceso principal fusiona los top-K locales con top_k y arma las filas con el catálogo.
+
+El desempate usa el rango del índice original de cada fila, así que el ranking es idéntico al
+de BaseConocimiento (exacto: el índice aproximado no se usa aquí). Si la base cambia de
+versión (add/remove_destinations, recargas) la memoria compartida y el pool se rehacen en la
+siguiente consulta; los anteriores se liberan cuando termina el último lote que los usa.
+
+El pool de procesos y los bloques de memoria compartida viven hasta cerrar(). Hay que usarla
+como administrador de contexto (`with BaseConocimientoParticionada(base) as particionada:`) o
+llamar a cerrar() al detener el servicio; si no, solo se liberan cuando el objeto se recolecta
+o al terminar el intérprete, y mientras tanto los procesos y los segmentos de /dev/shm siguen
+ocupados.
+"""
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from base_conocimiento import BaseConocimiento
+from indice_similitud import IndiceExacto
+from indices_filtro import IndiceFiltros, cantidad, posiciones
+from plan_puntuacion import PlanPuntuacion
+from seleccion_top_k import top_k
+
+# Estado de cada proceso trabajador: vistas sobre la memoria compartida y particiones ya armadas
+_trabajador = {}
+
+
+def _crear_bloque(arreglo):
+    """Copia `arreglo` (contiguo) a un bloque nuevo de memoria compartida."""
+    arreglo = np.ascontiguousarray(arreglo)
+    memoria = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+    np.ndarray(arreglo.shape, arreglo.dtype, buffer=memoria.buf)[...] = arreglo
+    return memoria, (memoria.name, arreglo.shape, arreglo.dtype.str)
+
+
+def _iniciar_trabajador(descriptor):
+    """Inicializador del pool: se adjunta a los bloques compartidos por nombre."""
+    _trabajador.clear()
+    memorias, arreglos = [], {}
+    for clave, (nombre, forma, tipo) in descriptor["bloques"].items():
+        # Los trabajadores comparten el resource_tracker del proceso principal, dueño de los bloques
+        memoria = shared_memory.SharedMemory(name=nombre)
+        memorias.append(memoria)
+        arreglos[clave] = np.ndarray(forma, np.dtype(tipo), buffer=memoria.buf)
+    _trabajador.update(descriptor, memorias=memorias, arreglos=arreglos, particiones={})
+
+
+def _particion(p):
+    """Plan e índice de filtros de la partición `p`, armados sobre vistas (sin copias)."""
+    if p not in _trabajador["particiones"]:
+        a = _trabajador["arreglos"]
+        inicio, fin = _trabajador["limites"][p], _trabajador["limites"][p + 1]
+        filas = slice(inicio, fin)
+        # Vectores unitarios de la partición en orden Fortran, como espera el plan
+        d = _trabajador["dimensiones"]
+        unitarios = a["unitarios"][inicio * d:fin * d].reshape((fin - inicio, d), order="F")
+        vivas = a["vivas"][filas] if "vivas" in a else None
+        ordenadas = slice(inicio, inicio + _trabajador["n_ordenadas"][p])
+        filtros = IndiceFiltros(a["costos"][filas], a["codigos_tipo"][filas], a["orden_costo"][ordenadas],
+                                a["costos_ordenados"][ordenadas], _trabajador["n_ordenadas"][p], vivas)
+        arreglos_plan = {clave[len("plan_"):]: v for clave, v in a.items() if clave.startswith("plan_")}
+        plan = PlanPuntuacion.desde_exportado(
+            _trabajador["parametros_plan"], PlanPuntuacion.tomar_filas(arreglos_plan, filas),
+            IndiceExacto(unitarios), _trabajador["scaler"], backend="numpy")
+        _trabajador["particiones"][p] = (plan, filtros, a["rango"][filas], inicio)
+    return _trabajador["particiones"][p]
+
+
+def _top_k_particion(p, consultas, k):
+    """Top-K local de la partición `p` para cada consulta: (posiciones globales, puntajes)."""
+    plan, filtros, rango, inicio = _particion(p)
+    vacio = (np.empty(0, dtype=np.int64), np.empty(0))
+    resultados = []
+    for consulta in consultas:
+        presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje = consulta[:5]
+        codigo = None
+        if tipo_hospedaje:
+            codigo = _trabajador["tipos"].get(tipo_hospedaje, -1)
+            if codigo < 0:
+                resultados.append(vacio)
+                continue
+        preferencias = plan.preferencias(*consulta[5:8])
+        filas = plan.filtrar(filtros.candidatos(presupuesto, codigo), preferencias)
+        if not cantidad(filas):
+            resultados.append(vacio)
+            continue
+        entrada = BaseConocimiento._entrada(presupuesto, duracion_min, duracion_max, mes)
+        similitud = plan.puntuar_una(entrada, tipo_hospedaje, filas, preferencias=preferencias)
+        filas = posiciones(filas)
+        locales = top_k(similitud, k, desempate=rango[filas])
+        resultados.append((filas[locales] + inicio, similitud[locales]))
+    return resultados
+
+
+class _Publicacion:
+    """Estado publicado en memoria compartida, con su pool y los lotes que lo están usando."""
+    __slots__ = ("estado", "ejecutor", "disposicion", "rango", "liberar", "en_uso", "retirada")
+
+    def __init__(self, estado, ejecutor, disposicion, rango, liberar):
+        self.estado, self.ejecutor, self.disposicion, self.rango = estado, ejecutor, disposicion, rango
+        self.liberar = liberar
+        self.en_uso = 0
+        self.retirada = False
+
+
+def _liberar(memorias, ejecutor):
+    if ejecutor is not None:
+        ejecutor.shutdown(wait=True, cancel_futures=True)
+    for memoria in memorias:
+        memoria.close()
+        memoria.unlink()
+
+
+class BaseConocimientoParticionada:
+    """Misma interfaz de consulta que BaseConocimiento, puntuando en `n_procesos` procesos.
+
+    Levanta procesos y memoria compartida: cerrarla con cerrar() o usarla en un bloque `with`.
+    """
+
+    def __init__(self, base, n_procesos=None):
+        self.base = base
+        self.n_procesos = n_procesos or multiprocessing.cpu_count()
+        # spawn: los trabajadores no heredan hilos ni locks del proceso principal (p. ej. Streamlit)
+        self._contexto = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._publicacion = None
+        self._cerrada = False
+        self._publicar(base.estado)
+
+    def _publicar(self, estado):
+        """Copia el estado vigente a memoria compartida y levanta un pool nuevo; retorna la publicación anterior."""
+        n = self.n_procesos
+        filtros, plan = estado.indice_filtros, estado.plan
+        total = len(estado.catalogo)
+        # Reparto intercalado: cada partición conserva el orden físico de la parte ordenada
+        ordenadas, agregadas = np.arange(filtros.n_ordenadas), np.arange(filtros.n_ordenadas, total)
+        particiones = [np.concatenate([ordenadas[p::n], agregadas[p::n]]) for p in range(n)]
+        n_ordenadas = [len(ordenadas[p::n]) for p in range(n)]
+        disposicion = np.concatenate(particiones)
+        limites = np.concatenate([[0], np.cumsum([len(filas) for filas in particiones])]).tolist()
+
+        costos = filtros.costos[disposicion]
+        # Permutación por costo de la parte ordenada de cada partición (posiciones locales)
+        orden_costo, costos_ordenados = np.zeros(total, dtype=np.int64), np.zeros(total)
+        for p in range(n):
+            parte = slice(limites[p], limites[p] + n_ordenadas[p])
+            orden_costo[parte] = np.argsort(costos[parte], kind="stable")
+            costos_ordenados[parte] = costos[parte][orden_costo[parte]]
+
+        # Rango del índice original: desempata igual que BaseConocimiento con cualquier tipo de etiqueta
+        rango = np.empty(total, dtype=np.int64)
+        rango[np.argsort(estado.catalogo.indice, kind="stable")] = np.arange(total)
+        parametros_plan, arreglos_plan = plan.exportar()
+        arreglos = {
+            # Un bloque Fortran por partición, uno detrás de otro
+            "unitarios": np.concatenate([np.asarray(plan.unitarios)[filas].ravel(order="F") for filas in particiones]),
+            **{f"plan_{clave}": v for clave, v in PlanPuntuacion.tomar_filas(arreglos_plan, disposicion).items()},
+            "costos": costos,
+            "codigos_tipo": filtros.codigos_tipo[disposicion],
+            "orden_costo": orden_costo,
+            "costos_ordenados": costos_ordenados,
+            "rango": rango[disposicion],
+        }
+        if filtros.vivas is not None:
+            arreglos["vivas"] = filtros.vivas[disposicion]
+
+        memorias, bloques = [], {}
+        for clave, arreglo in arreglos.items():
+            memoria, bloques[clave] = _crear_bloque(arreglo)
+            memorias.append(memoria)
+        tipos = estado.catalogo.categorias("Accommodation type")
+        descriptor = {
+            "bloques": bloques, "limites": limites, "n_ordenadas": n_ordenadas,
+            "dimensiones": np.asarray(plan.unitarios).shape[1],
+            "parametros_plan": parametros_plan, "scaler": estado.scaler,
+            "tipos": {valor: codigo for codigo, valor in enumerate(tipos)},
+        }
+        ejecutor = ProcessPoolExecutor(n, mp_context=self._contexto,
+                                       initializer=_iniciar_trabajador, initargs=(descriptor,))
+
+        # El finalizador libera el pool y los bloques si el objeto se recolecta sin cerrar()
+        liberar = weakref.finalize(self, _liberar, memorias, ejecutor)
+        anterior = self._publicacion
+        self._publicacion = _Publicacion(estado, ejecutor, disposicion, arreglos["rango"], liberar)
+        return anterior
+
+    @property
+    def version(self):
+        return self._publicacion.estado.version
+
+    def _retirar(self, publicacion):
+        """Marca una publicación como reemplazada; retorna True si ya no la usa ningún lote."""
+        publicacion.retirada = True
+        return publicacion.en_uso == 0
+
+    def _tomar(self):
+        """Publicación de la versión actual de la base (rehecha si la base cambió), reservada para un lote."""
+        anterior = None
+        with self._lock:
+            if self._cerrada:
+                raise RuntimeError("BaseConocimientoParticionada ya está cerrada")
+            if self.base.version != self._publicacion.estado.version:
+                anterior = self._publicar(self.base.estado)
+                if not self._retirar(anterior):
+                    anterior = None
+            publicacion = self._publicacion
+            publicacion.en_uso += 1
+        if anterior is not None:
+            anterior.liberar()
+        return publicacion
+
+    def _soltar(self, publicacion):
+        """Fin de un lote: una publicación ya reemplazada se libera con su último lote."""
+        with self._lock:
+            publicacion.en_uso -= 1
+            libre = publicacion.retirada and publicacion.en_uso == 0
+        if libre:
+            publicacion.liberar()
+
+    def cerrar(self):
+        """Detiene el pool y libera la memoria compartida (al terminar los lotes en curso)."""
+        with self._lock:
+            self._cerrada = True
+            libre = self._retirar(self._publicacion)
+        if libre:
+            self._publicacion.liberar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def recomendar_destinos(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+                            clima=None, seguridad_min=None, actividades=None, k=6):
+        consulta = (presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje, clima, seguridad_min, actividades)
+        return self.recomendar_destinos_batch([consulta], k)[0]
+
+    def recomendar_destinos_batch(self, consultas, k=6):
+        """Cada proceso resuelve todas las consultas sobre su partición; luego se fusionan los top-K."""
+        consultas = [tuple(c) for c in consultas]
+        if not consultas:
+            return []
+        publicacion = self._tomar()
+        try:
+            futuros = [publicacion.ejecutor.submit(_top_k_particion, p, consultas, k) for p in range(self.n_procesos)]
+            parciales = [futuro.result() for futuro in futuros]
+        finally:
+            self._soltar(publicacion)
+        estado, disposicion, rango = publicacion.estado, publicacion.disposicion, publicacion.rango
+
+        recomendaciones = []
+        for i in range(len(consultas)):
+            filas = np.concatenate([parcial[i][0] for parcial in parciales])
+            if not len(filas):
+                recomendaciones.append(BaseConocimiento._sin_resultados())
+                continue
+            similitud = np.concatenate([parcial[i][1] for parcial in parciales])
+            elegidas = top_k(similitud, k, desempate=rango[filas])
+            destinos = estado.catalogo.registros(disposicion[filas[elegidas]], BaseConocimiento.COLUMNAS_RESULTADO)
+            recomendaciones.append(destinos.assign(Similarity=similitud[elegidas]))
+        return recomendaciones
@@ -0,0 +1,445 @@
+# Contenido de plan_puntuacion.py
+"""
+Plan de puntuación compilado
+============================
+Las reglas de rules.json se compilan una sola vez, al cargar la base de conocimientos,
+en un único kernel ponderado:
+
+    score = (w_cos * coseno + Σ w_umbral * [col <= umbral] + Σ w_igualdad * [col == valor]
+             + Σ w_difusa * μ(col)) / Σ w
+
+- La parte de coseno se reduce a un producto fila a fila contra los vectores unitarios
+  del índice de similitud (las normas del catálogo no se recalculan por consulta). La suma
+  se hace columna a columna, en orden fijo, y no con BLAS: así el puntaje de una fila no
+  depende de cuántas filas se puntúan juntas y el desempate por índice es el mismo en una
+  consulta, en un lote o en bloques (modo streaming).
+- Las reglas de umbral no dependen del usuario, así que se suman en un vector estático.
+- Las reglas de igualdad se agrupan por columna y comparan códigos enteros.
+- Las reglas difusas evalúan funciones de pertenencia vectorizadas. Los términos que solo
+  dependen del catálogo se calculan al compilar (una regla sin términos relativos a la consulta
+  se suma al vector estático); los relativos a la consulta (p. ej. costo / presupuesto) se
+  evalúan por consulta o por lote sobre las columnas guardadas.
+- Las reglas de preferencia (clima, seguridad, actividades) solo puntúan cuando la consulta
+  trae esa preferencia; sus pesos se suman al denominador solo en ese caso, así que una
+  consulta sin preferencias puntúa exactamente igual que antes. Sus columnas se compilan al
+  cargar: clase de clima por fila (int8), seguridad escalada y un bitset de actividades por
+  fila (uint64), que se cruza con el de la consulta con AND y popcount.
+
+Los buffers de trabajo son por hilo, así que un mismo plan atiende consultas concurrentes; las
+operaciones NumPy sobre arreglos grandes liberan el GIL y pueden correr en paralelo.
+
+Si numba está instalado se usa un kernel JIT para la consulta individual; si no, NumPy.
+"""
+import collections
+import threading
+
+import numpy as np
+import Rule as rl
+from indice_similitud import normalizar_filas
+from indices_filtro import posiciones
+from instrumentacion import METRICAS
+
+try:
+    import numba
+except ImportError:  # numba es opcional
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(cache=True, nogil=True)
+    def _kernel_jit(unitarios, consulta, peso_coseno, estatico, codigos, codigos_consulta, pesos_igualdad, out):
+        n_filas, n_dims = unitarios.shape
+        for i in range(n_filas):
+            producto = 0.0
+            for j in range(n_dims):
+                producto += unitarios[i, j] * consulta[j]
+            valor = peso_coseno * producto + estatico[i]
+            for g in range(codigos.shape[0]):
+                # -1: la consulta no trae valor (no puntúa aunque la fila tampoco tenga)
+                if codigos_consulta[g] >= 0 and codigos[g, i] == codigos_consulta[g]:
+                    valor += pesos_igualdad[g]
+            out[i] = valor
+        return out
+
+
+REGLAS_PREFERENCIA = (rl.ClimateRule, rl.SafetyRule, rl.ActivitiesRule)
+
+# Preferencias de una consulta ya compiladas contra el plan. pesos: peso de cada término activo
+# sobre el denominador de la consulta; factor: reescala la parte de las reglas fijas.
+Preferencias = collections.namedtuple("Preferencias", ["clima", "seguridad_min", "bits", "n_actividades", "pesos", "factor"])
+
+# Arreglos exportados con una columna por fila del catálogo (el resto tiene una fila por fila)
+_FILAS_EN_COLUMNAS = {"codigos", "difusa_parciales", "difusa_valores"}
+
+# Bits encendidos de cada byte, para popcount sin np.bitwise_count (NumPy < 2.0)
+_BITS_BYTE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(palabras):
+    """Bits encendidos de cada palabra uint64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(palabras)
+    palabras = np.ascontiguousarray(palabras)
+    return _BITS_BYTE[palabras.view(np.uint8)].reshape(palabras.shape + (8,)).sum(axis=-1)
+
+
+class PlanPuntuacion:
+    """Compila las reglas en un kernel ponderado con buffers preasignados."""
+
+    def __init__(self, rules, catalogo, indice_similitud, scaler, backend="auto"):
+        if backend == "auto":
+            backend = "numba" if numba is not None else "numpy"
+        if backend == "numba" and numba is None:
+            raise ImportError("El backend 'numba' requiere tener numba instalado")
+        self.backend = backend
+
+        n_filas = len(catalogo)
+        peso_total = sum(rule.weight for rule in rules if not isinstance(rule, REGLAS_PREFERENCIA)) or 1.0
+
+        # Escalado Min-Max aplicado directamente con los parámetros ajustados
+        self.escala = np.asarray(scaler.scale_, dtype=float)
+        self.desplazamiento = np.asarray(scaler.min_, dtype=float)
+        self.unitarios = indice_similitud.unitarios
+
+        self.peso_coseno = 0.0
+        self.estatico = np.zeros(n_filas)
+        pesos_columna = {}
+        difusas = []
+        for rule in rules:
+            peso = rule.weight / peso_total
+            if isinstance(rule, rl.CosineSimilarityRule):
+                self.peso_coseno += peso
+            elif isinstance(rule, rl.ThresholdRule):
+                # El umbral es fijo: su aporte se calcula aquí y no en cada consulta
+                if rule.column_name in catalogo.columns:
+                    self.estatico += peso * (catalogo[rule.column_name] <= rule.threshold)
+            elif isinstance(rule, rl.EqualityRule):
+                if rule.column_name in catalogo.columns:
+                    pesos_columna[rule.column_name] = pesos_columna.get(rule.column_name, 0.0) + peso
+            elif isinstance(rule, rl.FuzzyRule):
+                if all(t["columna"] in catalogo.columns for t in rule.terminos):
+                    difusas.append((peso, rule))
+
+        # Reglas de igualdad agrupadas: una fila de códigos por columna
+        self.columnas_igualdad = list(pesos_columna)
+        self.pesos_igualdad = np.array([pesos_columna[c] for c in self.columnas_igualdad])
+        self.categorias = []
+        self.codigos = np.empty((len(self.columnas_igualdad), n_filas), dtype=np.int32)
+        for g, columna in enumerate(self.columnas_igualdad):
+            if catalogo.es_categorica(columna):
+                # Se reutiliza la codificación por diccionario del catálogo
+                valores, codigos = catalogo.categorias(columna), catalogo.codigos(columna)
+            else:
+                valores, codigos = np.unique(catalogo[columna], return_inverse=True)
+            self.categorias.append({valor: codigo for codigo, valor in enumerate(valores)})
+            self.codigos[g] = codigos
+
+        self._compilar_difusas(difusas, catalogo)
+        self._compilar_preferencias(rules, catalogo, peso_total)
+        self._preparar_buffers()
+
+    def _compilar_difusas(self, difusas, catalogo):
+        """Grados de los términos que solo dependen del catálogo y columnas de los relativos a la consulta."""
+        self.difusas = []
+        parciales, valores = [], []
+        for peso, rule in difusas:
+            fijos = [rule.pertenencia(catalogo[t["columna"]], t["puntos"]) for t in rule.terminos if t["relativo"] is None]
+            relativos = [t for t in rule.terminos if t["relativo"] is not None]
+            if not relativos:
+                # No depende de la consulta: se suma una sola vez, como las reglas de umbral
+                self.estatico += peso * rule.combinar(fijos, rule.operador)
+                continue
+            difusa = {"peso": peso, "operador": rule.operador, "parcial": None, "terminos": []}
+            if fijos:
+                difusa["parcial"] = len(parciales)
+                parciales.append(rule.combinar(fijos, rule.operador))
+            for t in relativos:
+                difusa["terminos"].append({
+                    "valores": len(valores), "entrada": rule.COLUMNAS_CONSULTA.index(t["columna"]),
+                    "relativo": t["relativo"], "puntos": t["puntos"],
+                })
+                valores.append(np.asarray(catalogo[t["columna"]], dtype=float))
+            self.difusas.append(difusa)
+        self.difusa_parciales = np.array(parciales).reshape(len(parciales), len(self.estatico))
+        self.difusa_valores = np.array(valores).reshape(len(valores), len(self.estatico))
+
+    def _sumar_difusas(self, entradas, filas, out, prefijo=""):
+        """Agrega a `out` (N × filas) las reglas difusas relativas a las N entradas crudas."""
+        t = METRICAS.inicio()
+        for difusa, etapa in zip(self.difusas, self._etapas[prefijo]["difusas"]):
+            valores = [self.difusa_valores[t["valores"], filas] for t in difusa["terminos"]]
+            parcial = None if difusa["parcial"] is None else self.difusa_parciales[difusa["parcial"], filas]
+            # Consulta a consulta: cada término es una pasada sobre su columna, sin matrices N × M intermedias
+            for entrada, fila in zip(entradas, out):
+                grados = [rl.FuzzyRule.grado(v, t, entrada[t["entrada"]]) for v, t in zip(valores, difusa["terminos"])]
+                if parcial is not None:
+                    grados.append(parcial)
+                fila += difusa["peso"] * rl.FuzzyRule.combinar(grados, difusa["operador"])
+            t = METRICAS.registrar(etapa, t)
+        return out
+
+    def _compilar_preferencias(self, rules, catalogo, peso_base):
+        """Columnas de las reglas de preferencia cuyos datos están en el catálogo."""
+        self.peso_base = peso_base
+        self.pesos_preferencia = {}
+        self.climas, self.vocabulario, self.seguridad_rango = [], [], None
+        self.clima = self.seguridad = self.actividades = None
+        for rule in rules:
+            if isinstance(rule, rl.ClimateRule) and all(c in catalogo.columns for c in rule.COLUMNAS):
+                self.climas = list(rule.CLIMAS)
+                self.clima = rule.clases(catalogo[rule.COLUMNAS[0]], catalogo[rule.COLUMNAS[1]])
+                clave = "clima"
+            elif isinstance(rule, rl.SafetyRule) and rule.column_name in catalogo.columns:
+                self.seguridad = np.asarray(catalogo[rule.column_name], dtype=float)
+                self.seguridad_rango = [rule.minimo, rule.maximo]
+                clave = "seguridad"
+            elif isinstance(rule, rl.ActivitiesRule) and catalogo.es_categorica(rule.column_name):
+                # Se tokenizan los textos distintos, no las filas: cada fila toma el bitset de su texto
+                textos = catalogo.categorias(rule.column_name)
+                tokens = [rule.tokens(t) for t in textos]
+                self.vocabulario = sorted(set().union(*tokens))
+                posicion = {t: i for i, t in enumerate(self.vocabulario)}
+                bits = np.zeros((len(textos) + 1, max(1, -(-len(self.vocabulario) // 64))), dtype=np.uint64)
+                for fila, conjunto in enumerate(tokens):
+                    for token in conjunto:
+                        bits[fila, posicion[token] // 64] |= np.uint64(1) << np.uint64(posicion[token] % 64)
+                # El código -1 (sin texto) toma la última fila, vacía
+                self.actividades = bits[catalogo.codigos(rule.column_name)]
+                clave = "actividades"
+            else:
+                continue
+            self.pesos_preferencia[clave] = self.pesos_preferencia.get(clave, 0.0) + rule.weight
+        self._escalar_seguridad()
+
+    def _escalar_seguridad(self):
+        self.seguridad_escalada = None
+        if self.seguridad is not None:
+            minimo, maximo = self.seguridad_rango
+            self.seguridad_escalada = rl.SafetyRule(minimo=minimo, maximo=maximo).escalar(self.seguridad)
+
+    def preferencias(self, clima=None, seguridad_min=None, actividades=None):
+        """Compila las preferencias de una consulta (None si ninguna aplica a este plan)."""
+        pesos = {}
+        codigo_clima = bits = None
+        n_actividades = 0
+        if clima and "clima" in self.pesos_preferencia:
+            codigo_clima = self.climas.index(clima) if clima in self.climas else -1
+            pesos["clima"] = self.pesos_preferencia["clima"]
+        if seguridad_min is not None and "seguridad" in self.pesos_preferencia:
+            pesos["seguridad"] = self.pesos_preferencia["seguridad"]
+        else:
+            seguridad_min = None
+        pedidas = {a.strip().lower() for a in actividades or [] if a and a.strip()}
+        if pedidas and "actividades" in self.pesos_preferencia:
+            bits = np.zeros(self.actividades.shape[1], dtype=np.uint64)
+            for i, token in enumerate(self.vocabulario):
+                if token in pedidas:
+                    bits[i // 64] |= np.uint64(1) << np.uint64(i % 64)
+            n_actividades = len(pedidas)
+            pesos["actividades"] = self.pesos_preferencia["actividades"]
+        if not pesos:
+            return None
+        total = self.peso_base + sum(pesos.values())
+        return Preferencias(codigo_clima, seguridad_min, bits, n_actividades,
+                            {c: w / total for c, w in pesos.items()}, self.peso_base / total)
+
+    def filtrar(self, filas, preferencias):
+        """Filas (slice o posiciones) que cumplen la seguridad mínima de la consulta, como posiciones."""
+        if preferencias is None or preferencias.seguridad_min is None:
+            return filas
+        filas = posiciones(filas)
+        return filas[self.seguridad[filas] >= preferencias.seguridad_min]
+
+    def _sumar_preferencias(self, preferencias, filas, out, prefijo=""):
+        """Agrega a `out` los términos de preferencia sobre las filas indicadas."""
+        etapas = self._etapas[prefijo]["preferencias"]
+        t = METRICAS.inicio()
+        out *= preferencias.factor
+        pesos = preferencias.pesos
+        if "clima" in pesos and preferencias.clima >= 0:
+            out += pesos["clima"] * (self.clima[filas] == preferencias.clima)
+            t = METRICAS.registrar(etapas["clima"], t)
+        if "seguridad" in pesos:
+            out += pesos["seguridad"] * self.seguridad_escalada[filas]
+            t = METRICAS.registrar(etapas["seguridad"], t)
+        if "actividades" in pesos:
+            coincidencias = _popcount(self.actividades[filas] & preferencias.bits).sum(axis=1)
+            out += (pesos["actividades"] / preferencias.n_actividades) * coincidencias
+            METRICAS.registrar(etapas["actividades"], t)
+        return out
+
+    def _preparar_buffers(self):
+        # Buffers reutilizados entre consultas, uno por hilo: el plan se comparte entre
+        # sesiones y consultas concurrentes no deben escribir sobre los mismos arreglos
+        self._locales = threading.local()
+        # Nombres de las etapas de instrumentación por regla (una consulta y lote), armados una vez
+        difusas = []
+        for difusa in self.difusas:
+            nombre = "+".join(rl.FuzzyRule.COLUMNAS_CONSULTA[t["entrada"]] for t in difusa["terminos"])
+            difusas.append(f"regla_difusa:{nombre}" + (f"#{len(difusas)}" if f"regla_difusa:{nombre}" in difusas else ""))
+        self._etapas = {}
+        for prefijo in ("", "lote_"):
+            self._etapas[prefijo] = {
+                "igualdad": [f"{prefijo}regla_igualdad:{c}" for c in self.columnas_igualdad],
+                "difusas": [prefijo + etapa for etapa in difusas],
+                "preferencias": {p: f"{prefijo}regla_preferencias:{p}" for p in ("clima", "seguridad", "actividades")},
+            }
+
+    def _buffers(self):
+        buffers = self._locales
+        if not hasattr(buffers, "producto"):
+            buffers.producto = np.empty(len(self.estatico))
+            buffers.codigos_consulta = np.empty(len(self.columnas_igualdad), dtype=np.int32)
+            buffers.coincidencias = np.empty(len(self.estatico), dtype=bool)
+        return buffers
+
+    def exportar(self):
+        """Plan compilado como parámetros (JSON) y arreglos, para guardarlo en un snapshot."""
+        parametros = {
+            "peso_coseno": self.peso_coseno,
+            "columnas_igualdad": self.columnas_igualdad,
+            "pesos_igualdad": self.pesos_igualdad.tolist(),
+            "categorias": [[v.item() if hasattr(v, "item") else v for v in categorias] for categorias in self.categorias],
+            "difusas": self.difusas,
+            "preferencias": {
+                "peso_base": self.peso_base, "pesos": self.pesos_preferencia, "climas": self.climas,
+                "vocabulario": self.vocabulario, "seguridad_rango": self.seguridad_rango,
+            },
+        }
+        arreglos = {"estatico": self.estatico, "codigos": self.codigos}
+        for nombre in ("difusa_parciales", "difusa_valores"):
+            if len(getattr(self, nombre)):
+                arreglos[nombre] = getattr(self, nombre)
+        for nombre in ("clima", "seguridad", "actividades"):
+            if getattr(self, nombre) is not None:
+                arreglos[nombre] = getattr(self, nombre)
+        return parametros, arreglos
+
+    @staticmethod
+    def tomar_filas(arreglos, filas):
+        """Arreglos exportados restringidos (o reordenados) a las filas indicadas."""
+        return {nombre: v[:, filas] if nombre in _FILAS_EN_COLUMNAS else v[filas] for nombre, v in arreglos.items()}
+
+    @classmethod
+    def desde_exportado(cls, parametros, arreglos, indice_similitud, scaler, backend="auto"):
+        """Reconstruye un plan ya compilado sin volver a evaluar las reglas sobre el catálogo."""
+        if backend == "auto":
+            backend = "numba" if numba is not None else "numpy"
+        plan = cls.__new__(cls)
+        plan.backend = backend
+        plan.escala = np.asarray(scaler.scale_, dtype=float)
+        plan.desplazamiento = np.asarray(scaler.min_, dtype=float)
+        plan.unitarios = indice_similitud.unitarios
+        plan.peso_coseno = parametros["peso_coseno"]
+        plan.estatico = arreglos["estatico"]
+        plan.columnas_igualdad = parametros["columnas_igualdad"]
+        plan.pesos_igualdad = np.array(parametros["pesos_igualdad"], dtype=float)
+        plan.categorias = [{valor: codigo for codigo, valor in enumerate(valores)} for valores in parametros["categorias"]]
+        plan.codigos = arreglos["codigos"]
+        plan.difusas = parametros["difusas"]
+        for nombre in ("difusa_parciales", "difusa_valores"):
+            setattr(plan, nombre, arreglos.get(nombre, np.empty((0, len(plan.estatico)))))
+        preferencias = parametros["preferencias"]
+        plan.peso_base = preferencias["peso_base"]
+        plan.pesos_preferencia = preferencias["pesos"]
+        plan.climas, plan.vocabulario = preferencias["climas"], preferencias["vocabulario"]
+        plan.seguridad_rango = preferencias["seguridad_rango"]
+        for nombre in ("clima", "seguridad", "actividades"):
+            setattr(plan, nombre, arreglos.get(nombre))
+        plan._escalar_seguridad()
+        plan._preparar_buffers()
+        return plan
+
+    def codificar(self, valores):
+        """Traduce los valores de igualdad de N consultas a códigos (N×G, -1 si no hay valor)."""
+        codigos = np.full((len(valores), len(self.columnas_igualdad)), -1, dtype=np.int32)
+        for g, categorias in enumerate(self.categorias):
+            for i, valor in enumerate(valores):
+                if valor:
+                    codigos[i, g] = categorias.get(valor, -1)
+        return codigos
+
+    def escalar(self, entradas):
+        """Aplica la transformación Min-Max a las entradas crudas (N×3)."""
+        return np.asarray(entradas, dtype=float) * self.escala + self.desplazamiento
+
+    def unitaria(self, entrada):
+        """Entrada cruda de una consulta escalada y normalizada a norma 1."""
+        return normalizar_filas(self.escalar([entrada]))[0]
+
+    def puntuar(self, entradas, valores, preferencias=None):
+        """Puntúa N consultas (entradas crudas N×3, valor de igualdad y Preferencias o None por consulta) → N×M."""
+        consultas = normalizar_filas(self.escalar(entradas))
+        t = METRICAS.inicio()
+        scores = np.empty((len(consultas), len(self.estatico)))
+        for consulta, fila in zip(consultas, scores):
+            self._coseno(consulta, slice(None), fila)
+        scores *= self.peso_coseno
+        t = METRICAS.registrar("lote_regla_coseno", t)
+        # Umbrales y difusas sin términos relativos: un solo vector precalculado al compilar
+        scores += self.estatico
+        t = METRICAS.registrar("lote_reglas_estaticas", t)
+        codigos_consulta = self.codificar(valores)
+        for g, etapa in enumerate(self._etapas["lote_"]["igualdad"]):
+            # Consultas sin valor (-1) no puntúan, igual que en puntuar_una: las filas sin categoría también son -1
+            coincide = (self.codigos[g] == codigos_consulta[:, g, None]) & (codigos_consulta[:, g, None] >= 0)
+            scores += self.pesos_igualdad[g] * coincide
+            t = METRICAS.registrar(etapa, t)
+        if self.difusas:
+            self._sumar_difusas(np.asarray(entradas, dtype=float), slice(None), scores, "lote_")
+        if preferencias is not None and any(p is not None for p in preferencias):
+            for fila, p in zip(scores, preferencias):
+                if p is not None:
+                    self._sumar_preferencias(p, slice(None), fila, "lote_")
+        return scores
+
+    def _coseno(self, consulta, filas, out):
+        """Producto de la consulta unitaria con las filas indicadas, sumando columna a columna."""
+        # unitarios está en orden Fortran: cada columna (o su subconjunto de filas) es contigua
+        producto = self._buffers().producto[:len(out)]
+        np.multiply(self.unitarios[filas, 0], consulta[0], out=out)
+        for j in range(1, self.unitarios.shape[1]):
+            np.multiply(self.unitarios[filas, j], consulta[j], out=producto)
+            out += producto
+        return out
+
+    def puntuar_una(self, entrada, valor, filas=slice(None), out=None, preferencias=None):
+        """Puntúa una sola consulta sobre las filas indicadas (slice o posiciones) con los buffers del plan."""
+        t = METRICAS.inicio()
+        estatico, codigos = self.estatico[filas], self.codigos[:, filas]
+        if out is None:
+            out = np.empty(len(estatico))
+        consulta = self.unitaria(entrada)
+        buffers = self._buffers()
+        codigos_consulta = buffers.codigos_consulta
+        for g, categorias in enumerate(self.categorias):
+            codigos_consulta[g] = categorias.get(valor, -1) if valor else -1
+
+        t = METRICAS.registrar("escalado", t)
+
+        if self.backend == "numba":
+            _kernel_jit(self.unitarios[filas], consulta, self.peso_coseno, estatico,
+                        codigos, codigos_consulta, self.pesos_igualdad, out)
+            METRICAS.registrar("kernel_jit", t)
+            if self.difusas:
+                self._sumar_difusas(np.asarray([entrada], dtype=float), filas, out[None])
+            if preferencias is not None:
+                self._sumar_preferencias(preferencias, filas, out)
+            return out
+
+        self._coseno(consulta, filas, out)
+        out *= self.peso_coseno
+        t = METRICAS.registrar("regla_coseno", t)
+        out += estatico
+        t = METRICAS.registrar("reglas_estaticas", t)
+        coincidencias = buffers.coincidencias[:len(out)]
+        for g, etapa in enumerate(self._etapas[""]["igualdad"]):
+            if codigos_consulta[g] >= 0:
+                np.equal(codigos[g], codigos_consulta[g], out=coincidencias)
+                out[coincidencias] += self.pesos_igualdad[g]
+                t = METRICAS.registrar(etapa, t)
+        if self.difusas:
+            self._sumar_difusas(np.asarray([entrada], dtype=float), filas, out[None])
+        if preferencias is not None:
+            self._sumar_preferencias(preferencias, filas, out)
+        return out
@@ -0,0 +1,32 @@
+# Contenido de seleccion_top_k.py
+"""
+Selección parcial de los K mejores puntajes
+===========================================
+En lugar de ordenar todo el catálogo (O(M log M)) se usa np.partition para encontrar
+el K-ésimo puntaje en O(M) y solo se ordenan los K ganadores.
+
+El orden es total y determinista: puntaje descendente y, en caso de empate, clave de
+desempate ascendente (por defecto la posición; la Base de Conocimientos usa el índice
+original de la fila). Así cualquier fusión de resultados parciales (bloques, particiones)
+produce exactamente el mismo ranking que una sola pasada sobre todo el catálogo.
+"""
+import numpy as np
+
+
+def top_k(scores, k, desempate=None):
+    """Retorna las posiciones de los k mayores puntajes de `scores`, ya ordenadas."""
+    scores = np.asarray(scores)
+    n = len(scores)
+    if desempate is None:
+        desempate = np.arange(n)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        seleccion = np.arange(n)
+    else:
+        kesimo = np.partition(scores, n - k)[n - k]
+        mayores = np.flatnonzero(scores > kesimo)
+        iguales = np.flatnonzero(scores == kesimo)
+        iguales = iguales[np.argsort(desempate[iguales], kind="stable")[:k - len(mayores)]]
+        seleccion = np.concatenate([mayores, iguales])
+    return seleccion[np.lexsort((desempate[seleccion], -scores[seleccion]))]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Servicio HTTP de recomendaciones con micro-lotes
+================================================
+Expone el motor fuera de la interfaz de Streamlit, solo con la biblioteca estándar (asyncio):
+
+- POST /recomendar   cuerpo JSON {"presupuesto", "duracion_min", "duracion_max", "mes",
+                     y opcionales "tipo_hospedaje", "clima", "seguridad_min", "actividades"
+                     (lista) y "k"} → lista de destinos.
+- GET  /estado       profundidad de la cola, lotes procesados, rechazos y versión de la base.
+- GET  /metricas     tiempos por etapa y contadores en formato de texto de Prometheus (con
+                     --metricas o SBEC_METRICAS=1; si no, la instrumentación está apagada).
+
+Con micro-lotes, las solicitudes se acumulan hasta `ventana_ms` milisegundos o `lote_max`
+consultas y se puntúan juntas con MotorInferencia.recomendar_batch (una sola matriz contra el
+catálogo). El cómputo corre en un hilo aparte, así que el bucle de eventos sigue aceptando
+solicitudes mientras se puntúa un lote. Sin micro-lotes cada solicitud se puntúa sola.
+
+Contrapresión: si hay `cola_max` solicitudes pendientes, las nuevas se rechazan con 503 y
+Retry-After en lugar de acumular latencia sin límite.
+
+Uso: python servicio_http.py --puerto 8502 --ventana-ms 2 --lote-max 64
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from base_hechos import Consulta
+from instrumentacion import METRICAS
+
+MENSAJES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class SolicitudInvalida(ValueError):
+    pass
+
+
+def _entero(valor, campo):
+    """Entero de un campo JSON: acepta 7, 7.0 o "7"; rechaza 3.7 o "3.5" en lugar de truncarlos."""
+    if isinstance(valor, bool):
+        raise TypeError(f"{campo} debe ser un entero")
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise TypeError(f"{campo} debe ser un entero") from None
+    if not numero.is_integer():
+        raise ValueError(f"{campo} debe ser un entero, no {valor!r}")
+    return int(numero)
+
+
+class ServicioRecomendaciones:
+    def __init__(self, motor, ventana_ms=2.0, lote_max=64, cola_max=1024, lotes=True):
+        self.motor = motor
+        self.ventana_s = ventana_ms / 1000
+        self.lote_max = lote_max if lotes else 1
+        self.cola_max = cola_max
+        self.lotes = lotes
+        self._cola = None
+        self.pendientes = 0
+        self.atendidas = 0
+        self.rechazadas = 0
+        self.lotes_procesados = 0
+
+    def estado(self):
+        return {
+            "profundidad_cola": self.pendientes,
+            "cola_max": self.cola_max,
+            "micro_lotes": self.lotes,
+            "ventana_ms": self.ventana_s * 1000,
+            "lote_max": self.lote_max,
+            "atendidas": self.atendidas,
+            "rechazadas": self.rechazadas,
+            "lotes_procesados": self.lotes_procesados,
+            "tamano_medio_lote": self.atendidas / self.lotes_procesados if self.lotes_procesados else 0.0,
+            "version_base": self.motor.base_conocimiento.version,
+        }
+
+    async def recomendar(self, consulta, k):
+        """Encola la consulta y espera su resultado; None si la cola está llena."""
+        if self.pendientes >= self.cola_max:
+            self.rechazadas += 1
+            return None
+        futuro = asyncio.get_running_loop().create_future()
+        self.pendientes += 1
+        self._cola.put_nowait((consulta, k, futuro))
+        return await futuro
+
+    async def _despachar(self):
+        """Arma lotes de hasta lote_max solicitudes o ventana_s segundos y los puntúa en un hilo."""
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.ventana_s
+            while len(lote) < self.lote_max:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                resultados = await loop.run_in_executor(None, self._puntuar, lote)
+            except Exception as error:  # _puntuar ya aísla los errores por solicitud; esto es un fallo propio
+                resultados = [error] * len(lote)
+            self.pendientes -= len(lote)
+            self.atendidas += len(lote)
+            self.lotes_procesados += 1
+            for (_, _, futuro), resultado in zip(lote, resultados):
+                if futuro.done():
+                    continue
+                if isinstance(resultado, Exception):
+                    futuro.set_exception(resultado)
+                else:
+                    futuro.set_result(resultado)
+
+    def _puntuar(self, lote):
+        """Corre en el hilo de cómputo: un recomendar_batch por cada k distinto del lote.
+
+        Si un lote falla se reintentan sus consultas una por una: solo falla la solicitud que
+        produce el error (su excepción queda en su posición del resultado).
+        """
+        resultados = [None] * len(lote)
+        for k in {k for _, k, _ in lote}:
+            posiciones = [i for i, (_, k_i, _) in enumerate(lote) if k_i == k]
+            try:
+                if len(posiciones) == 1:
+                    calculados = [self.motor.recomendar(lote[posiciones[0]][0], k)]
+                else:
+                    calculados = self.motor.recomendar_batch([lote[i][0] for i in posiciones], k)
+                for i, recomendaciones in zip(posiciones, calculados):
+                    resultados[i] = self._serializar(recomendaciones)
+            except Exception:
+                for i in posiciones:
+                    resultados[i] = self._puntuar_una(lote[i][0], k)
+        return resultados
+
+    def _puntuar_una(self, consulta, k):
+        try:
+            return self._serializar(self.motor.recomendar(consulta, k))
+        except Exception as error:
+            return error
+
+    @staticmethod
+    def _serializar(recomendaciones):
+        registros = recomendaciones.reset_index(names="id").to_dict(orient="records") if not recomendaciones.empty else []
+        return json.dumps(registros, default=str).encode()
+
+    @staticmethod
+    def _consulta(cuerpo):
+        try:
+            datos = json.loads(cuerpo or b"{}")
+            if not isinstance(datos, dict):
+                raise TypeError("el cuerpo debe ser un objeto JSON")
+            for campo in ("tipo_hospedaje", "clima"):
+                if not isinstance(datos.get(campo), (str, type(None))):
+                    raise TypeError(f"{campo} debe ser texto")
+            seguridad_min = datos.get("seguridad_min")
+            actividades = datos.get("actividades")
+            if actividades is not None and (not isinstance(actividades, list)
+                                            or not all(isinstance(a, str) for a in actividades)):
+                raise TypeError("actividades debe ser una lista de textos")
+            consulta = Consulta(float(datos["presupuesto"]), _entero(datos["duracion_min"], "duracion_min"),
+                                _entero(datos["duracion_max"], "duracion_max"), _entero(datos["mes"], "mes"),
+                                datos.get("tipo_hospedaje"), datos.get("clima"),
+                                None if seguridad_min is None else float(seguridad_min), actividades)
+            k = _entero(datos.get("k", 6), "k")
+        except (ValueError, KeyError, TypeError) as error:
+            raise SolicitudInvalida(f"Consulta inválida: {error}") from error
+        if k < 1:
+            raise SolicitudInvalida("k debe ser al menos 1")
+        return consulta, k
+
+    async def _atender(self, metodo, ruta, cuerpo):
+        """Resuelve una solicitud → (código HTTP, cuerpo JSON, encabezados extra)."""
+        if ruta == "/metricas":
+            if metodo != "GET":
+                return 405, b'{"error": "use GET"}', {}
+            return 200, METRICAS.prometheus().encode(), {"Content-Type": "text/plain; version=0.0.4"}
+        if ruta == "/estado":
+            if metodo != "GET":
+                return 405, b'{"error": "use GET"}', {}
+            return 200, json.dumps(self.estado()).encode(), {}
+        if ruta != "/recomendar":
+            return 404, b'{"error": "ruta no encontrada"}', {}
+        if metodo != "POST":
+            return 405, b'{"error": "use POST"}', {}
+        try:
+            consulta, k = self._consulta(cuerpo)
+        except SolicitudInvalida as error:
+            return 400, json.dumps({"error": str(error)}).encode(), {}
+        resultado = await self.recomendar(consulta, k)
+        if resultado is None:
+            return 503, b'{"error": "cola llena"}', {"Retry-After": "1"}
+        return 200, resultado, {}
+
+    async def _conexion(self, lector, escritor):
+        """HTTP/1.1 mínimo con keep-alive: una solicitud a la vez por conexión."""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                encabezados = {}
+                while (linea := await lector.readline()) not in (b"\r\n", b"\n", b""):
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                cuerpo = await lector.readexactly(int(encabezados.get("content-length", 0)))
+                try:
+                    codigo, respuesta, extra = await self._atender(metodo, ruta.split("?", 1)[0], cuerpo)
+                except Exception as error:  # un fallo del motor no deja la solicitud sin respuesta
+                    codigo, respuesta, extra = 500, json.dumps({"error": f"error interno: {error}"}).encode(), {}
+                cerrar = encabezados.get("connection", "").lower() == "close"
+                tipo = extra.pop("Content-Type", "application/json")
+                cabecera = [f"HTTP/1.1 {codigo} {MENSAJES[codigo]}", f"Content-Type: {tipo}",
+                            f"Content-Length: {len(respuesta)}", f"X-Profundidad-Cola: {self.pendientes}",
+                            "Connection: " + ("close" if cerrar else "keep-alive")]
+                cabecera += [f"{nombre}: {valor}" for nombre, valor in extra.items()]
+                escritor.write(("\r\n".join(cabecera) + "\r\n\r\n").encode() + respuesta)
+                await escritor.drain()
+                if cerrar:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host="127.0.0.1", puerto=8502):
+        self._cola = asyncio.Queue()
+        despachador = asyncio.create_task(self._despachar())
+        servidor = await asyncio.start_server(self._conexion, host, puerto, backlog=self.cola_max)
+        print(f"Servicio de recomendaciones en http://{host}:{puerto} "
+              f"(micro-lotes: {'sí' if self.lotes else 'no'}, ventana {self.ventana_s * 1000:g} ms, lote máx {self.lote_max})",
+              flush=True)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            despachador.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8502)
+    parser.add_argument("--ventana-ms", type=float, default=2.0, help="espera máxima para completar un lote")
+    parser.add_argument("--lote-max", type=int, default=64, help="consultas máximas por lote")
+    parser.add_argument("--cola-max", type=int, default=1024, help="solicitudes pendientes antes de responder 503")
+    parser.add_argument("--sin-lotes", action="store_true", help="puntuar cada solicitud por separado")
+    parser.add_argument("--agregado", action="store_true",
+                        help="puntuar el cubo por (destino, mes, tipo) y devolver un viaje por destino")
+    parser.add_argument("--dataset", help="CSV, Parquet o directorio .columnar alternativo (sin caché de resultados ni snapshot)")
+    parser.add_argument("--metricas", action="store_true", help="encender la instrumentación servida en GET /metricas")
+    args = parser.parse_args()
+    if args.metricas:
+        METRICAS.activa = True
+
+    t0 = time.perf_counter()
+    if args.dataset:
+        from base_conocimiento import BaseConocimiento
+        from motor_inferencia import MotorInferencia
+        if args.dataset.endswith(".csv"):
+            import pandas as pd
+            base = BaseConocimiento(pd.read_csv(args.dataset))
+        else:
+            base = BaseConocimiento.desde_columnar(args.dataset)
+        motor = MotorInferencia(base)
+    else:
+        from motor_compartido import obtener_motor_compartido
+        motor = obtener_motor_compartido().motor
+    if args.agregado:
+        from cubo_destinos import CuboDestinos
+        from motor_inferencia import MotorInferencia
+        motor = MotorInferencia(CuboDestinos(motor.base_conocimiento))
+    print(f"Motor listo en {time.perf_counter() - t0:.2f} s", flush=True)
+    servicio = ServicioRecomendaciones(motor, args.ventana_ms, args.lote_max, args.cola_max, lotes=not args.sin_lotes)
+    try:
+        asyncio.run(servicio.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Arranque del servidor Streamlit con el motor precalentado.
+
+Construye el motor compartido en segundo plano mientras el servidor levanta, de modo que
+la primera sesión no pague el costo de carga. Acepta las mismas opciones que
+`streamlit run` en la forma --seccion.opcion=valor.
+
+Uso: python servidor.py --server.port=8501 --server.address=0.0.0.0
+"""
+import ast
+import os
+import sys
+
+from streamlit.web import bootstrap
+
+from motor_compartido import calentar_en_segundo_plano
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+def opciones_servidor(argv):
+    """Convierte '--server.port=8501' en {'server_port': 8501}, igual que `streamlit run`."""
+    opciones = {}
+    for arg in argv:
+        if not arg.startswith("--") or "=" not in arg:
+            raise SystemExit(f"Opción no reconocida: {arg} (use --seccion.opcion=valor)")
+        nombre, valor = arg[2:].split("=", 1)
+        if valor.lower() in ("true", "false"):
+            valor = valor.lower() == "true"
+        else:
+            try:
+                valor = ast.literal_eval(valor)
+            except (ValueError, SyntaxError):
+                pass
+        opciones[nombre.replace(".", "_")] = valor
+    return opciones
+
+if __name__ == "__main__":
+    opciones = opciones_servidor(sys.argv[1:])
+    bootstrap.load_config_options(flag_options=opciones)
+    calentar_en_segundo_plano()
+    bootstrap.run(RUTA_APP, False, [], opciones)
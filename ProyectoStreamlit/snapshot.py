@@ -0,0 +1,129 @@
+# Contenido de snapshot.py
+"""
+Snapshot binario de la Base de Conocimientos
+============================================
+Guarda la base ya ajustada en un directorio que se puede mapear en memoria (solo lectura):
+
+    manifiesto.json   formato, hashes del CSV y de rules.json, metadatos de columnas,
+                      parámetros del escalador, del índice y del plan compilado
+    *.npy             un arreglo por archivo: columnas numéricas, códigos categóricos,
+                      matriz normalizada, vectores unitarios, índices y plan
+
+Los .npy se abren con np.load(mmap_mode="r"), así que varios procesos que cargan el mismo
+snapshot comparten las páginas físicas y el arranque no depende del tamaño del catálogo.
+El snapshot se considera vigente solo si coinciden el formato y los hashes de las fuentes.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+FORMATO = 4
+MANIFIESTO = "manifiesto.json"
+
+
+def hash_archivo(ruta, bloque=1 << 20):
+    """SHA-256 del contenido de un archivo."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for trozo in iter(lambda: f.read(bloque), b""):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def leer_manifiesto(ruta):
+    try:
+        with open(os.path.join(ruta, MANIFIESTO), "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        # Sin snapshot o ilegible (ruta inexistente, sin permisos): se reconstruye desde el CSV
+        return None
+
+
+def vigente(ruta, hash_dataset, hash_reglas, tipo_indice="exacto", opciones_indice=None):
+    """True si el snapshot existe y fue generado con las mismas fuentes y el mismo índice."""
+    manifiesto = leer_manifiesto(ruta)
+    return (
+        manifiesto is not None
+        and manifiesto.get("formato") == FORMATO
+        and manifiesto.get("hash_dataset") == hash_dataset
+        and manifiesto.get("hash_reglas") == hash_reglas
+        and manifiesto["indice"]["tipo"] == tipo_indice
+        and manifiesto["indice"]["opciones"] == (opciones_indice or {})
+    )
+
+
+def guardar(base, ruta):
+    """Escribe el snapshot de `base` en `ruta`, reemplazando el anterior de forma atómica."""
+    catalogo = base.catalogo
+    arreglos = {"indice": catalogo.indice}
+    numericas = list(catalogo.numericas)
+    for i, columna in enumerate(numericas):
+        arreglos[f"num_{i}"] = catalogo.numericas[columna]
+    categoricas = list(catalogo.categoricas)
+    for i, columna in enumerate(categoricas):
+        arreglos[f"cat_{i}"] = catalogo.codigos(columna)
+
+    arreglos["normalizados"] = base.normalized_data
+    arreglos["unitarios"] = base.indice_similitud.unitarios
+    parametros_indice, arreglos_indice = base.indice_similitud.exportar()
+    arreglos.update({f"indice_{k}": v for k, v in arreglos_indice.items()})
+    arreglos["filtros_orden_costo"] = base.indice_filtros.orden_costo
+    arreglos["filtros_costos_ordenados"] = base.indice_filtros.costos_ordenados
+    parametros_plan, arreglos_plan = base.plan.exportar()
+    arreglos.update({f"plan_{k}": v for k, v in arreglos_plan.items()})
+
+    manifiesto = {
+        "formato": FORMATO,
+        "hash_dataset": base.hash_dataset,
+        "hash_reglas": base.hash_reglas,
+        "filas": len(catalogo),
+        "catalogo": {
+            "columnas": catalogo.columns,
+            "numericas": numericas,
+            "categoricas": categoricas,
+            "categorias": [catalogo.categorias(c).tolist() for c in categoricas],
+        },
+        "escalador": {
+            "data_min": base.scaler.data_min_.tolist(),
+            "data_max": base.scaler.data_max_.tolist(),
+        },
+        "indice": {"tipo": base.tipo_indice, "opciones": base.opciones_indice, "parametros": parametros_indice},
+        "reglas": base.reglas_config,
+        "plan": parametros_plan,
+        "arreglos": sorted(arreglos),
+    }
+
+    # Se escribe en un directorio temporal y se renombra: los lectores nunca ven un snapshot a medias
+    temporal = f"{ruta}.tmp-{os.getpid()}"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    try:
+        for nombre, arreglo in arreglos.items():
+            # np.save conserva el orden Fortran de los vectores unitarios
+            np.save(os.path.join(temporal, f"{nombre}.npy"), arreglo)
+        with open(os.path.join(temporal, MANIFIESTO), "w") as f:
+            json.dump(manifiesto, f)
+    except BaseException:
+        # Sin espacio u otro error a mitad de la escritura: no se deja el temporal a medias
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    anterior = f"{ruta}.old-{os.getpid()}"
+    if os.path.exists(ruta):
+        os.replace(ruta, anterior)
+    os.replace(temporal, ruta)
+    shutil.rmtree(anterior, ignore_errors=True)
+
+
+def cargar(ruta):
+    """Lee el manifiesto y mapea en memoria (solo lectura) todos los arreglos del snapshot."""
+    manifiesto = leer_manifiesto(ruta)
+    if manifiesto is None or manifiesto.get("formato") != FORMATO:
+        raise ValueError(f"No hay un snapshot válido (formato {FORMATO}) en {ruta}")
+    arreglos = {
+        nombre: np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode="r", allow_pickle=False)
+        for nombre in manifiesto["arreglos"]
+    }
+    return manifiesto, arreglos
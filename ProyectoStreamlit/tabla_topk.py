@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# Contenido de tabla_topk.py
+"""
+Tabla materializada de top-K
+============================
+El espacio de consultas de la app es casi discreto: el mes va de 1 a 12, el tipo de hospedaje
+es una de las cinco opciones del formulario, la duración solo entra por su punto medio (días
+enteros → múltiplos de 0.5) y el presupuesto se ingresa en pasos de 50. Esta tabla guarda,
+para cada celda (mes, tipo, presupuesto, punto medio) de esa grilla, el top-K calculado con la
+puntuación de BaseConocimiento: posiciones de las filas en el catálogo y sus puntajes.
+
+- Construcción (offline, en paralelo): cada proceso carga la base desde el snapshot y resuelve
+  las celdas de un (mes, tipo) con la matriz de similitud por lotes. El resultado es idéntico al
+  de recomendar_destinos con el índice exacto.
+- Consulta: si la consulta cae exactamente en una celda, la respuesta sale de la tabla en O(1)
+  (solo se arma el DataFrame de las K filas). Un presupuesto fuera de la grilla (no múltiplo del
+  paso o fuera del rango), otra duración, otro tipo, un k mayor o una consulta con preferencias
+  (clima, seguridad, actividades) caen al cálculo exacto.
+- Versionado: el manifiesto guarda los hashes del CSV y de rules.json. La tabla solo se usa
+  con una base construida desde esas mismas fuentes y mientras la base no cambie de versión
+  (altas, bajas o recarga de reglas la dejan fuera de uso).
+
+La tabla se guarda como directorio (manifiesto.json + .npy), igual que los snapshots.
+
+Uso: python tabla_topk.py cleaned_travel_dataset.csv cleaned_travel_dataset.topk --procesos 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from base_conocimiento import BaseConocimiento
+from indices_filtro import posiciones
+from seleccion_top_k import top_k
+import snapshot
+
+FORMATO = 1
+MANIFIESTO = "manifiesto.json"
+# Grilla por defecto: la del formulario de app.py
+GRILLA = {
+    "presupuesto_min": 100.0, "presupuesto_paso": 50.0, "presupuesto_max": 10000.0,
+    "punto_medio_min": 1.0, "punto_medio_paso": 0.5, "punto_medio_max": 21.0,
+    "tipos": ["", "Hotel", "Resort", "Villa", "Airbnb"],
+}
+
+# Base de cada proceso constructor, cargada desde el snapshot
+_trabajador = {}
+
+
+def _ejes(grilla):
+    """Valores de presupuesto y de punto medio de la grilla (los mismos al construir y al consultar)."""
+    n_presupuestos = int(round((grilla["presupuesto_max"] - grilla["presupuesto_min"]) / grilla["presupuesto_paso"])) + 1
+    n_medios = int(round((grilla["punto_medio_max"] - grilla["punto_medio_min"]) / grilla["punto_medio_paso"])) + 1
+    presupuestos = grilla["presupuesto_min"] + np.arange(n_presupuestos) * grilla["presupuesto_paso"]
+    medios = grilla["punto_medio_min"] + np.arange(n_medios) * grilla["punto_medio_paso"]
+    return presupuestos, medios
+
+
+def _iniciar_trabajador(ruta_snapshot):
+    _trabajador["base"] = BaseConocimiento.desde_snapshot(ruta_snapshot)
+
+
+def _resolver_bloque(mes, tipo, presupuestos, medios, k, lote):
+    """Top-K de todas las celdas de un (mes, tipo): (posiciones N×k con -1 de relleno, puntajes, cantidades)."""
+    estado = _trabajador["base"].estado
+    # La duración solo entra por su punto medio: duracion_min = duracion_max = punto medio
+    consultas = [(p, m, m, mes, tipo or None) for p in presupuestos for m in medios]
+    filas = np.full((len(consultas), k), -1, dtype=np.int32)
+    puntajes = np.zeros((len(consultas), k))
+    cantidades = np.zeros(len(consultas), dtype=np.int16)
+    for inicio in range(0, len(consultas), lote):
+        parte = consultas[inicio:inicio + lote]
+        similitudes = BaseConocimiento._similitud_batch(estado, parte)
+        for i, (consulta, similitud) in enumerate(zip(parte, similitudes), start=inicio):
+            candidatos = BaseConocimiento._candidatos(estado, consulta[0], consulta[4])
+            if candidatos is None:
+                continue
+            candidatos = posiciones(candidatos)
+            locales = top_k(similitud[candidatos], k, desempate=estado.catalogo.indice[candidatos])
+            filas[i, :len(locales)] = candidatos[locales]
+            puntajes[i, :len(locales)] = similitud[candidatos[locales]]
+            cantidades[i] = len(locales)
+    return filas, puntajes, cantidades
+
+
+def construir(ruta_dataset, ruta_salida, ruta_snapshot=None, k=6, grilla=None, procesos=None, lote=256):
+    """Calcula la tabla para la grilla dada y la guarda en `ruta_salida`; retorna la cantidad de celdas."""
+    grilla = dict(GRILLA, **(grilla or {}))
+    ruta_snapshot = ruta_snapshot or os.path.splitext(ruta_dataset)[0] + ".snapshot"
+    # Deja el snapshot vigente antes de levantar los procesos: todos cargan exactamente la misma base
+    base = BaseConocimiento.desde_csv(ruta_dataset, ruta_snapshot)
+    presupuestos, medios = _ejes(grilla)
+    bloques = [(mes, tipo) for mes in range(1, 13) for tipo in grilla["tipos"]]
+    with ProcessPoolExecutor(procesos or os.cpu_count(), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_iniciar_trabajador, initargs=(ruta_snapshot,)) as ejecutor:
+        futuros = [ejecutor.submit(_resolver_bloque, mes, tipo, presupuestos, medios, k, lote) for mes, tipo in bloques]
+        partes = [futuro.result() for futuro in futuros]
+    arreglos = {
+        "filas": np.concatenate([p[0] for p in partes]),
+        "puntajes": np.concatenate([p[1] for p in partes]),
+        "cantidades": np.concatenate([p[2] for p in partes]),
+    }
+    manifiesto = {
+        "formato": FORMATO, "hash_dataset": base.hash_dataset, "hash_reglas": base.hash_reglas,
+        "filas_catalogo": len(base.catalogo), "k": k, "grilla": grilla,
+    }
+
+    # Directorio temporal y reemplazo, como en snapshot.guardar
+    temporal = f"{ruta_salida}.tmp-{os.getpid()}"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    for nombre, arreglo in arreglos.items():
+        np.save(os.path.join(temporal, f"{nombre}.npy"), arreglo)
+    with open(os.path.join(temporal, MANIFIESTO), "w") as f:
+        json.dump(manifiesto, f)
+    anterior = f"{ruta_salida}.old-{os.getpid()}"
+    if os.path.exists(ruta_salida):
+        os.replace(ruta_salida, anterior)
+    os.replace(temporal, ruta_salida)
+    shutil.rmtree(anterior, ignore_errors=True)
+    return len(arreglos["cantidades"])
+
+
+class TablaTopK:
+    def __init__(self, manifiesto, arreglos, version_base):
+        self.k = manifiesto["k"]
+        self.grilla = manifiesto["grilla"]
+        self.filas = arreglos["filas"]
+        self.puntajes = arreglos["puntajes"]
+        self.cantidades = arreglos["cantidades"]
+        # La tabla describe exactamente esta versión de la base
+        self.version_base = version_base
+        self.presupuestos, self.medios = _ejes(self.grilla)
+        self._tipos = {tipo or None: t for t, tipo in enumerate(self.grilla["tipos"])}
+
+    @classmethod
+    def cargar(cls, ruta, base):
+        """Tabla de `ruta` si fue construida desde las mismas fuentes que `base`; None si no existe o está vencida."""
+        manifiesto = snapshot.leer_manifiesto(ruta)
+        if (
+            manifiesto is None
+            or manifiesto.get("formato") != FORMATO
+            or manifiesto["hash_dataset"] != base.hash_dataset
+            or manifiesto["hash_reglas"] != base.hash_reglas
+            or base.hash_dataset is None
+            or manifiesto["filas_catalogo"] != len(base.catalogo)
+        ):
+            return None
+        arreglos = {nombre: np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode="r")
+                    for nombre in ("filas", "puntajes", "cantidades")}
+        return cls(manifiesto, arreglos, base.version)
+
+    def celda(self, presupuesto, duracion_min, duracion_max, mes, tipo_hospedaje=None,
+              clima=None, seguridad_min=None, actividades=None):
+        """Posición de la celda de una consulta, o None si la consulta no cae exactamente en la grilla."""
+        # La grilla no incluye preferencias: esas consultas se calculan siempre
+        if clima or seguridad_min is not None or actividades:
+            return None
+        tipo = self._tipos.get(tipo_hospedaje or None)
+        if tipo is None or mes not in range(1, 13):
+            return None
+        i = int(round((presupuesto - self.grilla["presupuesto_min"]) / self.grilla["presupuesto_paso"]))
+        if not 0 <= i < len(self.presupuestos) or self.presupuestos[i] != presupuesto:
+            return None
+        medio = (duracion_min + duracion_max) / 2
+        j = int(round((medio - self.grilla["punto_medio_min"]) / self.grilla["punto_medio_paso"]))
+        if not 0 <= j < len(self.medios) or self.medios[j] != medio:
+            return None
+        return ((int(mes) - 1) * len(self._tipos) + tipo) * len(self.presupuestos) * len(self.medios) + i * len(self.medios) + j
+
+    def buscar(self, base, consulta, k=6):
+        """Recomendaciones de la tabla (mismo DataFrame que base.recomendar_destinos) o None si hay que calcularlas."""
+        estado = base.estado
+        if k > self.k or estado.version != self.version_base:
+            return None
+        celda = self.celda(*consulta)
+        if celda is None:
+            return None
+        n = min(int(self.cantidades[celda]), k)
+        if n == 0:
+            return BaseConocimiento._sin_resultados()
+        recomendaciones = estado.catalogo.registros(np.asarray(self.filas[celda, :n]), BaseConocimiento.COLUMNAS_RESULTADO)
+        return recomendaciones.assign(Similarity=np.array(self.puntajes[celda, :n]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", help="CSV del catálogo")
+    parser.add_argument("salida", help="directorio de la tabla (p. ej. cleaned_travel_dataset.topk)")
+    parser.add_argument("--snapshot", help="snapshot de la base (por defecto, junto al CSV)")
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count())
+    parser.add_argument("--presupuesto-max", type=float, default=GRILLA["presupuesto_max"])
+    parser.add_argument("--punto-medio-max", type=float, default=GRILLA["punto_medio_max"])
+    args = parser.parse_args()
+    celdas = construir(args.dataset, args.salida, args.snapshot, args.k,
+                       {"presupuesto_max": args.presupuesto_max, "punto_medio_max": args.punto_medio_max}, args.procesos)
+    print(f"▶️ {celdas} celdas escritas en {args.salida}")
@@ -0,0 +1,63 @@
+# Contenido de tests/conftest.py
+"""Fixtures comunes: el catálogo real con categorías faltantes en algunas filas."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO)
+
+RUTA_DATASET = os.path.join(DIRECTORIO, "cleaned_travel_dataset.csv")
+
+# Consultas con y sin tipo de hospedaje, con presupuestos que dejan pocas o muchas filas
+CONSULTAS = [
+    (800, 3, 5, 1, None),
+    (1500, 5, 10, 6, None),
+    (3000, 2, 9, 12, "Hotel"),
+    (8000, 7, 14, 3, None),
+    (8000, 7, 14, 3, "Resort"),
+    (2000, 1, 4, 8, "Hostel"),
+    (500, 2, 3, 4, "Villa"),
+    (100, 1, 2, 1, None),
+]
+
+# Las mismas consultas con preferencias (clima, seguridad mínima, actividades)
+PREFERENCIAS = [
+    ("templado", None, None),
+    (None, 6, None),
+    (None, None, ["beach", "museums"]),
+    ("cálido", 5, ["hiking"]),
+]
+CONSULTAS_PREFERENCIAS = [c + PREFERENCIAS[i % len(PREFERENCIAS)] for i, c in enumerate(CONSULTAS)]
+
+
+@pytest.fixture(scope="session")
+def datos_faltantes():
+    """Catálogo con tipos de hospedaje, destinos y actividades faltantes en algunas filas."""
+    datos = pd.read_csv(RUTA_DATASET)
+    datos.loc[[3, 5, 7], "Accommodation type"] = np.nan
+    datos.loc[[11], "Destination"] = np.nan
+    datos.loc[[13], "top_activities"] = np.nan
+    return datos
+
+
+@pytest.fixture(scope="session")
+def csv_faltantes(datos_faltantes, tmp_path_factory):
+    ruta = tmp_path_factory.mktemp("catalogo") / "faltantes.csv"
+    datos_faltantes.to_csv(ruta, index=False)
+    return str(ruta)
+
+
+@pytest.fixture(scope="session")
+def base_faltantes(datos_faltantes):
+    from base_conocimiento import BaseConocimiento
+    return BaseConocimiento(datos_faltantes)
+
+
+def mismas_recomendaciones(a, b):
+    """Mismas filas, en el mismo orden y con los mismos puntajes (bit a bit)."""
+    assert list(a.index) == list(b.index)
+    assert a.reset_index(drop=True).equals(b.reset_index(drop=True))
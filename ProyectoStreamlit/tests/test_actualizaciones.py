@@ -0,0 +1,53 @@
+# Contenido de tests/test_actualizaciones.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from base_conocimiento import BaseConocimiento
+from conftest import CONSULTAS, CONSULTAS_PREFERENCIAS, mismas_recomendaciones
+
+
+def altas(datos, n, etiqueta, rng):
+    """n filas remuestreadas con costos nuevos y etiquetas desde `etiqueta`."""
+    nuevas = datos.iloc[rng.integers(0, len(datos), n)].set_axis(np.arange(etiqueta, etiqueta + n))
+    return nuevas.assign(**{"Accommodation cost": (nuevas["Accommodation cost"] * rng.uniform(0.5, 2.0, n)).round(),
+                            "Transportation cost": (nuevas["Transportation cost"] * rng.uniform(0.5, 2.0, n)).round()})
+
+
+def bajas(vigentes, n, rng):
+    """n etiquetas vigentes al azar, a veces con la fila más cara o más barata (mueven los límites)."""
+    etiquetas = rng.choice(vigentes.index.to_numpy(), min(n, len(vigentes) - 1), replace=False).tolist()
+    costo = vigentes["Accommodation cost"] + vigentes["Transportation cost"]
+    if rng.random() < 0.5:
+        etiquetas.append(costo.idxmax() if rng.random() < 0.5 else costo.idxmin())
+    return list(dict.fromkeys(etiquetas))
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_altas_y_bajas_igual_a_base_recien_construida(datos_faltantes, semilla):
+    rng = np.random.default_rng(semilla)
+    base = BaseConocimiento(datos_faltantes)
+    vigentes = datos_faltantes
+    etiqueta = 10_000
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for paso in range(8):
+        operacion = rng.choice(["altas", "bajas", "ambas", "compactar"], p=[0.35, 0.35, 0.2, 0.1])
+        if operacion in ("altas", "ambas"):
+            nuevas = altas(datos_faltantes, int(rng.integers(1, 20)), etiqueta, rng)
+            etiqueta += len(nuevas)
+            base.add_destinations(nuevas)
+            vigentes = pd.concat([vigentes, nuevas])
+        if operacion in ("bajas", "ambas"):
+            quitar = bajas(vigentes, int(rng.integers(1, 15)), rng)
+            base.remove_destinations(quitar)
+            vigentes = vigentes.drop(index=quitar)
+        if operacion == "compactar":
+            base.compactar()
+
+        nueva = BaseConocimiento(vigentes)
+        assert np.array_equal(base.estado.scaler.data_min_, nueva.estado.scaler.data_min_)
+        assert np.array_equal(base.estado.scaler.data_max_, nueva.estado.scaler.data_max_)
+        for consulta in consultas:
+            mismas_recomendaciones(base.recomendar_destinos(*consulta), nueva.recomendar_destinos(*consulta))
+        for resultado, consulta in zip(base.recomendar_destinos_batch(consultas), consultas):
+            mismas_recomendaciones(resultado, nueva.recomendar_destinos(*consulta))
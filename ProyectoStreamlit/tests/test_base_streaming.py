@@ -0,0 +1,43 @@
+# Contenido de tests/test_base_streaming.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from base_conocimiento import BaseConocimiento
+from base_streaming import BaseConocimientoStreaming
+from conftest import CONSULTAS, CONSULTAS_PREFERENCIAS, mismas_recomendaciones
+
+
+@pytest.fixture(scope="module")
+def en_memoria(csv_faltantes):
+    return BaseConocimiento(pd.read_csv(csv_faltantes))
+
+
+# Bloques chicos: algunos quedan sin ciertas categorías o sin filas que pasen los filtros
+@pytest.mark.parametrize("tamano_bloque", [7, 64, 10_000])
+def test_streaming_igual_a_en_memoria(csv_faltantes, en_memoria, tamano_bloque):
+    streaming = BaseConocimientoStreaming(csv_faltantes, tamano_bloque)
+    for consulta in CONSULTAS + CONSULTAS_PREFERENCIAS:
+        mismas_recomendaciones(streaming.recomendar_destinos(*consulta), en_memoria.recomendar_destinos(*consulta))
+
+
+def test_lote_streaming_igual_a_en_memoria(csv_faltantes, en_memoria):
+    streaming = BaseConocimientoStreaming(csv_faltantes, 16)
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for resultado, consulta in zip(streaming.recomendar_destinos_batch(consultas, k=4), consultas):
+        mismas_recomendaciones(resultado, en_memoria.recomendar_destinos(*consulta, k=4))
+
+
+def test_bloque_con_columnas_de_texto_vacias(datos_faltantes, tmp_path):
+    # Con bloques de 7 filas, el primero tiene tipo de hospedaje y actividades solo NaN
+    datos = datos_faltantes.copy()
+    datos.loc[:6, ["Accommodation type", "top_activities"]] = np.nan
+    ruta = tmp_path / "texto_vacio.csv"
+    datos.to_csv(ruta, index=False)
+    streaming = BaseConocimientoStreaming(str(ruta), 7)
+    en_memoria = BaseConocimiento(pd.read_csv(ruta))
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for consulta in consultas:
+        mismas_recomendaciones(streaming.recomendar_destinos(*consulta), en_memoria.recomendar_destinos(*consulta))
+    for resultado, consulta in zip(streaming.recomendar_destinos_batch(consultas), consultas):
+        mismas_recomendaciones(resultado, en_memoria.recomendar_destinos(*consulta))
@@ -0,0 +1,77 @@
+# Contenido de tests/test_cache_resultados.py
+from base_conocimiento import BaseConocimiento
+from base_hechos import Consulta
+from cache_resultados import CacheResultados
+from conftest import mismas_recomendaciones
+from motor_inferencia import MotorInferencia
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_desalojo_lru_al_superar_la_capacidad():
+    cache = CacheResultados(capacidad=2)
+    cache.guardar("a", 1, "A")
+    cache.guardar("b", 1, "B")
+    assert cache.obtener("a", 1) == "A"  # "a" pasa a ser la más reciente
+    cache.guardar("c", 1, "C")
+    assert cache.obtener("b", 1) is None
+    assert cache.obtener("a", 1) == "A" and cache.obtener("c", 1) == "C"
+    assert len(cache) == 2 and cache.desalojos == 1
+
+
+def test_ttl_vence_las_entradas():
+    reloj = Reloj()
+    cache = CacheResultados(ttl=10, reloj=reloj)
+    cache.guardar("a", 1, "A")
+    reloj.ahora = 9.9
+    assert cache.obtener("a", 1) == "A"
+    reloj.ahora = 10
+    assert cache.obtener("a", 1) is None
+    assert cache.expirados == 1 and len(cache) == 0
+
+
+def test_clave_normaliza_numeros_y_duracion():
+    base = CacheResultados.clave(Consulta(1000, 3, 7, 6, "Hotel"))
+    assert CacheResultados.clave(Consulta(1000.0, 3.0, 7.0, 6.0, "Hotel")) == base
+    # Solo importa el punto medio de la duración
+    assert CacheResultados.clave(Consulta(1000, 4, 6, 6, "Hotel")) == base
+    assert CacheResultados.clave(Consulta(1000, 3, 7, 6, "Hostel")) != base
+    hechos = {"presupuesto": 1000, "duracion_min": 3, "duracion_max": 7, "mes": 6, "tipo_hospedaje": "Hotel"}
+    assert CacheResultados.clave(hechos) == base
+
+
+def test_motor_acierta_con_1000_y_1000_punto_0(base_faltantes):
+    cache = CacheResultados()
+    motor = MotorInferencia(base_faltantes, cache=cache)
+    primera = motor.recomendar(Consulta(1000, 3, 7, 6, None))
+    segunda = motor.recomendar(Consulta(1000.0, 3, 7, 6, None))
+    assert (cache.fallos, cache.aciertos) == (1, 1)
+    mismas_recomendaciones(primera, segunda)
+
+
+def test_cambio_de_version_invalida(datos_faltantes):
+    base = BaseConocimiento(datos_faltantes)
+    cache = CacheResultados()
+    motor = MotorInferencia(base, cache=cache)
+    consulta = Consulta(8000, 7, 14, 3, None)
+    motor.recomendar(consulta)
+    motor.recomendar_batch([consulta])
+    assert cache.aciertos == 1
+
+    # Un destino muy barato y bien ubicado cambia el ranking: la entrada vieja no debe servirse
+    nuevo = datos_faltantes.iloc[[0]].set_axis([5000]).assign(**{"Month": 3, "Duration (days)": 10})
+    base.add_destinations(nuevo)
+    resultado = motor.recomendar(consulta)
+    assert cache.invalidaciones == 1 and cache.aciertos == 1
+    mismas_recomendaciones(resultado, base.recomendar_destinos(*consulta))
+
+    base.remove_destinations([5000])
+    resultado = motor.recomendar_batch([consulta])[0]
+    assert cache.invalidaciones == 2 and cache.aciertos == 1
+    mismas_recomendaciones(resultado, base.recomendar_destinos(*consulta))
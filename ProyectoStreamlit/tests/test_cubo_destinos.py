@@ -0,0 +1,66 @@
+# Contenido de tests/test_cubo_destinos.py
+import numpy as np
+import pytest
+
+from base_conocimiento import BaseConocimiento
+from conftest import CONSULTAS, CONSULTAS_PREFERENCIAS, mismas_recomendaciones
+from cubo_destinos import CuboDestinos
+from indices_filtro import posiciones
+
+
+@pytest.fixture
+def base_y_cubo(datos_faltantes):
+    base = BaseConocimiento(datos_faltantes)
+    return base, CuboDestinos(base)
+
+
+def test_un_viaje_por_destino_dentro_de_los_filtros(base_y_cubo, datos_faltantes):
+    base, cubo = base_y_cubo
+    for consulta in CONSULTAS + CONSULTAS_PREFERENCIAS:
+        resultado = cubo.recomendar_destinos(*consulta)
+        if resultado.empty:
+            continue
+        assert len(resultado) <= 6 and resultado["Destination"].is_unique
+        assert (resultado["Total cost"] <= consulta[0]).all()
+        if consulta[4]:
+            assert (resultado["Accommodation type"] == consulta[4]).all()
+        if len(consulta) > 6 and consulta[6] is not None:
+            assert (datos_faltantes.loc[resultado.index, "safety_score"] >= consulta[6]).all()
+        # Cada viaje conserva el puntaje que le da la base
+        similitud = base.calcular_similitud(*consulta)
+        fisicas = [base.catalogo.indice.tolist().index(etiqueta) for etiqueta in resultado.index]
+        assert np.allclose(resultado["Similarity"], similitud[fisicas])
+
+
+def test_lote_igual_a_consultas_individuales(base_y_cubo):
+    _, cubo = base_y_cubo
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for resultado, consulta in zip(cubo.recomendar_destinos_batch(consultas, k=4), consultas):
+        mismas_recomendaciones(resultado, cubo.recomendar_destinos(*consulta, k=4))
+
+
+def test_se_reconstruye_al_cambiar_la_base(base_y_cubo):
+    base, cubo = base_y_cubo
+    version = cubo.version
+    eliminados = list(cubo.recomendar_destinos(*CONSULTAS[3]).index[:2])
+    base.remove_destinations(eliminados)
+    resultado = cubo.recomendar_destinos(*CONSULTAS[3])
+    assert cubo.version != version and len(resultado) == 6
+    assert not set(resultado.index) & set(eliminados)
+
+
+def test_grupo_ganador_sin_viajes_cede_su_lugar(base_y_cubo, monkeypatch):
+    base, cubo = base_y_cubo
+    consulta = (8000, 7, 14, 3, None)
+    completo = cubo.recomendar_destinos(*consulta, k=7)
+    assert len(completo) == 7
+    excluido = completo["Destination"].iloc[0]
+
+    # Ningún viaje del destino ganador pasa el filtro del drill-down (el filtro del cubo sí lo deja pasar)
+    destinos = base.catalogo.valores("Destination")
+    filtrar = base.plan.filtrar
+    monkeypatch.setattr(base.plan, "filtrar", lambda filas, preferencias: (
+        lambda p: p[destinos[p] != excluido])(posiciones(filtrar(filas, preferencias))))
+    resultado = cubo.recomendar_destinos(*consulta, k=6)
+    assert len(resultado) == 6
+    mismas_recomendaciones(resultado, completo[completo["Destination"] != excluido].iloc[:6])
@@ -0,0 +1,31 @@
+# Contenido de tests/test_evaluacion_ranking.py
+import pandas as pd
+
+from conftest import CONSULTAS
+from evaluacion_ranking import BYTES_POR_CELDA, evaluar, tamano_bloque
+
+RELEVANTES = [{"Paris, France", "London, UK"}, {"Bali, Indonesia"}, set(), {"Tokyo, Japan", "Rome, Italy"},
+              {"Phuket, Thailand"}, {"New York, USA"}, {"Paris, France"}, {"Sydney, Australia"}]
+
+
+def test_tamano_bloque_sigue_el_presupuesto():
+    assert tamano_bloque(1_000_000, 256) == 256 * 2**20 // (1_000_000 * BYTES_POR_CELDA)
+    assert tamano_bloque(10**9, 1) == 1
+    assert tamano_bloque(0, 1) == 2**20 // BYTES_POR_CELDA
+
+
+def test_metricas_no_dependen_del_bloque(base_faltantes):
+    resumen, por_consulta = evaluar(base_faltantes, CONSULTAS, RELEVANTES)
+    for kwargs in ({"bloque": 1}, {"bloque": 3}, {"memoria_mb": 0.001}):
+        otro_resumen, otro_por_consulta = evaluar(base_faltantes, CONSULTAS, RELEVANTES, **kwargs)
+        assert otro_resumen == resumen
+        pd.testing.assert_frame_equal(otro_por_consulta, por_consulta)
+
+
+def test_tipo_desconocido_no_recomienda_filas_sin_tipo(base_faltantes):
+    # Las filas sin tipo de hospedaje tienen código -1, igual que un tipo que no está en el catálogo
+    consulta = (8000, 1, 30, 6, "Glamping")
+    assert base_faltantes.recomendar_destinos(*consulta).empty
+    resumen, por_consulta = evaluar(base_faltantes, [consulta], [{"Dubai, United Arab Emirates"}])
+    assert por_consulta["recomendados"].tolist() == [0]
+    assert resumen["cobertura"] == 0.0
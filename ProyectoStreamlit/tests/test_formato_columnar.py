@@ -0,0 +1,66 @@
+# Contenido de tests/test_formato_columnar.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import formato_columnar
+from base_conocimiento import BaseConocimiento
+from catalogo import CatalogoColumnar
+from conftest import CONSULTAS, CONSULTAS_PREFERENCIAS, mismas_recomendaciones
+
+EXTENSIONES = {"npy": "catalogo.columnar", "parquet": "catalogo.parquet"}
+
+
+@pytest.fixture(params=["npy", "parquet"])
+def ruta_columnar(request, csv_faltantes, tmp_path):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    ruta = str(tmp_path / EXTENSIONES[request.param])
+    formato_columnar.convertir(csv_faltantes, ruta)
+    return ruta
+
+
+def test_ida_y_vuelta_conserva_el_catalogo(ruta_columnar, datos_faltantes):
+    original = CatalogoColumnar.desde_dataframe(datos_faltantes)
+    leido = formato_columnar.leer(ruta_columnar)
+    assert list(leido.columns) == list(original.columns)
+    for columna in original.columns:
+        assert leido.es_categorica(columna) == original.es_categorica(columna), columna
+        if original.es_categorica(columna):
+            assert list(leido.categorias(columna)) == list(original.categorias(columna)), columna
+            assert np.array_equal(leido.codigos(columna), original.codigos(columna)), columna
+        else:
+            assert np.array_equal(leido.valores(columna), original.valores(columna), equal_nan=True), columna
+
+
+def test_base_columnar_igual_a_base_desde_csv(ruta_columnar, csv_faltantes, tmp_path):
+    desde_csv = BaseConocimiento.desde_csv(csv_faltantes, str(tmp_path / "base.snapshot"))
+    columnar = BaseConocimiento.desde_columnar(ruta_columnar)
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for consulta in consultas:
+        mismas_recomendaciones(columnar.recomendar_destinos(*consulta), desde_csv.recomendar_destinos(*consulta))
+    for resultado, consulta in zip(columnar.recomendar_destinos_batch(consultas), consultas):
+        mismas_recomendaciones(resultado, desde_csv.recomendar_destinos(*consulta))
+    # Solo se cargan las columnas que usan las reglas y el resultado
+    necesarias = set(BaseConocimiento.columnas_necesarias()) & set(formato_columnar.columnas_guardadas(ruta_columnar))
+    assert set(columnar.travel_data.columns) == necesarias | {"Total cost"}
+    assert columnar.travel_data.equals(desde_csv.travel_data[columnar.travel_data.columns])
+
+
+def test_proyeccion_de_columnas(ruta_columnar):
+    leido = formato_columnar.leer(ruta_columnar, ["safety_score", "Destination"])
+    assert list(leido.columns) == ["Destination", "safety_score"]
+    with pytest.raises(ValueError):
+        formato_columnar.leer(ruta_columnar, ["Destination", "columna que no existe"])
+
+
+def test_parquet_con_texto_sin_diccionario(datos_faltantes, tmp_path):
+    # Un Parquet escrito por otra herramienta (texto plano) da la misma base
+    pytest.importorskip("pyarrow")
+    ruta = str(tmp_path / "externo.parquet")
+    datos_faltantes.to_parquet(ruta, index=False)
+    leido = formato_columnar.leer(ruta, ["Destination", "Accommodation type"])
+    original = CatalogoColumnar.desde_dataframe(datos_faltantes)
+    for columna in ("Destination", "Accommodation type"):
+        assert list(leido.categorias(columna)) == list(original.categorias(columna))
+        assert np.array_equal(leido.codigos(columna), original.codigos(columna))
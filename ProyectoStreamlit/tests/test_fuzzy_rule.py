@@ -0,0 +1,118 @@
+# Contenido de tests/test_fuzzy_rule.py
+import json
+
+import numpy as np
+import pytest
+
+import Rule as rl
+from base_conocimiento import RUTA_REGLAS, BaseConocimiento
+from conftest import CONSULTAS
+
+NAN = float("nan")
+
+
+def test_hombros_abiertos():
+    valores = [-10.0, 0.0, 5.0, 8.0, 9.0, 10.0, 50.0]
+    # Abierto a la izquierda: 1 hasta c, baja a 0 en d y sigue en 0
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [None, None, 8.0, 10.0]), [1, 1, 1, 1, 0.5, 0, 0])
+    # Abierto a la derecha: 0 hasta a, sube a 1 en b y sigue en 1
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [0.0, 10.0, None, None]), [0, 0, 0.5, 0.8, 0.9, 1, 1])
+    # Sin extremos: todo pertenece
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [None, None, None, None]), 1.0)
+
+
+def test_triangular_y_trapezoidal():
+    valores = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    triangular = rl.FuzzyRule._termino({"column": "x", "forma": "triangular", "puntos": [1, 3, 5]})
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, triangular["puntos"]), [0, 0, 0.5, 1, 0.5, 0, 0])
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [1, 2, 4, 5]), [0, 0, 1, 1, 1, 0, 0])
+
+
+def test_bordes_verticales():
+    valores = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    # a == b: escalón de subida en 1
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [1, 1, 3, 5]), [0, 1, 1, 1, 0.5, 0])
+    # c == d: escalón de bajada en 3
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [0, 2, 3, 3]), [0, 0.5, 1, 1, 0, 0])
+    # Ambos verticales: rectángulo cerrado [1, 3]
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [1, 1, 3, 3]), [0, 1, 1, 1, 0, 0])
+    # Hombro abierto con borde vertical
+    assert np.allclose(rl.FuzzyRule.pertenencia(valores, [None, None, 2, 2]), [1, 1, 1, 0, 0, 0])
+
+
+def test_nan_no_pertenece():
+    for puntos in ([None, None, 8, 10], [0, 10, None, None], [1, 1, 3, 3], [None, None, None, None]):
+        grado = rl.FuzzyRule.pertenencia([NAN, 1.0], puntos)
+        assert grado[0] == 0.0
+
+
+def test_cociente_con_presupuesto_no_positivo():
+    termino = rl.FuzzyRule._termino({"column": "Total cost", "relativo": "cociente", "puntos": [None, None, 0.8, 1.0]})
+    costos = np.array([100.0, 800.0, 900.0, 1000.0, 2000.0, NAN])
+    assert np.allclose(rl.FuzzyRule.grado(costos, termino, 1000.0), [1, 1, 0.5, 0, 0, 0])
+    # Con presupuesto 0 o negativo ningún costo positivo cabe: no suma a la puntuación
+    for presupuesto in (0.0, -500.0):
+        assert not rl.FuzzyRule.grado(costos, termino, presupuesto).any()
+
+
+def test_diferencia_traslada_los_puntos():
+    termino = rl.FuzzyRule._termino({"column": "Month", "relativo": "diferencia", "forma": "triangular", "puntos": [-2, 0, 2]})
+    assert np.allclose(rl.FuzzyRule.grado([4.0, 5.0, 6.0, 7.0, 8.0, 9.0], termino, 6.0), [0, 0.5, 1, 0.5, 0, 0])
+
+
+@pytest.mark.parametrize("termino", [
+    {"column": "x", "forma": "triangular", "puntos": [1, 2, 3, 4]},
+    {"column": "x", "forma": "trapezoidal", "puntos": [1, 2, 3]},
+    {"column": "x", "forma": "hexagonal", "puntos": [1, 2, 3]},
+    {"column": "x", "puntos": [3, 2, 4, 5]},
+    {"column": "x", "puntos": [1, None, 4, 5]},
+    {"column": "x", "puntos": [1, 2, None, 5]},
+    {"column": "x", "relativo": "cociente", "puntos": [None, None, 0.8, 1.0]},
+    {"column": "Total cost", "relativo": "producto", "puntos": [None, None, 0.8, 1.0]},
+])
+def test_termino_invalido(termino):
+    with pytest.raises(ValueError):
+        rl.FuzzyRule._termino(termino)
+
+
+def test_regla_invalida():
+    termino = {"column": "Total cost", "puntos": [None, None, 800, 1000]}
+    with pytest.raises(ValueError):
+        rl.FuzzyRule([termino], operador="xor")
+    with pytest.raises(ValueError):
+        rl.FuzzyRule([])
+
+
+def test_and_y_or():
+    grados = [np.array([0.2, 0.9, 0.0]), np.array([0.5, 0.4, 1.0])]
+    assert np.allclose(rl.FuzzyRule.combinar(grados, "and"), [0.2, 0.4, 0.0])
+    assert np.allclose(rl.FuzzyRule.combinar(grados, "or"), [0.5, 0.9, 1.0])
+
+
+def test_budget_fuzzy_de_rules_json(datos_faltantes):
+    # La regla difusa de presupuesto cambia el ranking en producción: su aporte a la similitud
+    # debe ser exactamente peso * FuzzyRule.apply sobre el catálogo
+    with open(RUTA_REGLAS, "r") as f:
+        reglas = json.load(f)["rules"]
+    regla = next(r for r in reglas if r["name"] == "budget_fuzzy")
+    assert regla["terminos"] == [{"column": "Total cost", "relativo": "cociente", "forma": "trapezoidal",
+                                  "puntos": [None, None, 0.8, 1.0]}]
+    difusa = rl.FuzzyRule(regla["terminos"], regla["operador"], regla["weight"])
+    fijas = [r for r in reglas if r["type"] in ("cosine_similarity", "threshold", "equality", "fuzzy")]
+    peso_total = sum(r["weight"] for r in fijas)
+
+    con_difusa = BaseConocimiento(datos_faltantes)
+    sin_difusa = BaseConocimiento(datos_faltantes)
+    sin_difusa.recargar_reglas([r for r in reglas if r["name"] != "budget_fuzzy"])
+    catalogo = datos_faltantes.loc[con_difusa.catalogo.indice]
+    catalogo = catalogo.assign(**{"Total cost": catalogo["Accommodation cost"] + catalogo["Transportation cost"]})
+    contribuye = False
+    for consulta in CONSULTAS:
+        entrada = [consulta[0], (consulta[1] + consulta[2]) / 2, consulta[3]]
+        aporte = (con_difusa.calcular_similitud(*consulta) * peso_total
+                  - sin_difusa.calcular_similitud(*consulta) * (peso_total - regla["weight"]))
+        esperado = difusa.weight * difusa.apply(entrada, catalogo)
+        assert np.allclose(aporte, esperado)
+        contribuye |= esperado.any()
+    # Al menos una consulta deja destinos dentro del presupuesto difuso
+    assert contribuye
@@ -0,0 +1,101 @@
+# Contenido de tests/test_indice_similitud.py
+import numpy as np
+import pytest
+
+from base_conocimiento import BaseConocimiento
+from conftest import CONSULTAS, mismas_recomendaciones
+from indice_similitud import IndiceIVF
+
+TIPOS = [None, "Hotel", "Resort", "Hostel", "Airbnb"]
+
+
+def catalogo_sintetico(datos, n_filas, rng):
+    """Remuestrea el catálogo con ruido en costos, duración y mes (como benchmark_indice.py)."""
+    sintetico = datos.iloc[rng.integers(0, len(datos), n_filas)].reset_index(drop=True)
+    sintetico["Accommodation cost"] *= rng.lognormal(0.0, 0.3, n_filas)
+    sintetico["Transportation cost"] *= rng.lognormal(0.0, 0.3, n_filas)
+    sintetico["Duration (days)"] = np.clip(sintetico["Duration (days)"] + rng.integers(-2, 3, n_filas), 1, None)
+    sintetico["Month"] = (sintetico["Month"] - 1 + rng.integers(-1, 2, n_filas)) % 12 + 1
+    return sintetico
+
+
+def consultas_aleatorias(n, rng):
+    consultas = []
+    for _ in range(n):
+        dur_min = int(rng.integers(1, 15))
+        consultas.append((float(rng.choice([500, 1000, 2000, 3000, 5000, 10000])), dur_min,
+                          dur_min + int(rng.integers(0, 8)), int(rng.integers(1, 13)), TIPOS[rng.integers(0, len(TIPOS))]))
+    return consultas
+
+
+def listas_consistentes(indice):
+    """Las listas invertidas particionan las filas y cada fila está en la lista de su centroide más parecido."""
+    n = len(indice.unitarios)
+    assert indice.limites[0] == 0 and indice.limites[-1] == n
+    assert (np.diff(indice.limites) >= 0).all()
+    assert np.array_equal(np.sort(indice.miembros), np.arange(n))
+    assert np.array_equal(indice.asignacion(), IndiceIVF._asignar(np.ascontiguousarray(indice.unitarios), indice.centroides))
+
+
+@pytest.fixture(scope="module")
+def sintetico(datos_faltantes):
+    return catalogo_sintetico(datos_faltantes, 20_000, np.random.default_rng(0))
+
+
+def test_recall_con_sondeos_por_defecto(sintetico):
+    exacta = BaseConocimiento(sintetico)
+    ivf = BaseConocimiento(sintetico, indice="ivf")
+    aciertos = []
+    for consulta in consultas_aleatorias(200, np.random.default_rng(1)):
+        esperado, obtenido = exacta.recomendar_destinos(*consulta), ivf.recomendar_destinos(*consulta)
+        if esperado.empty:
+            continue
+        # Un empate con el k-ésimo puntaje exacto cuenta como acierto
+        umbral = esperado["Similarity"].min() - 1e-12
+        aciertos.append(min(len(esperado), int((obtenido["Similarity"] >= umbral).sum())) / len(esperado))
+        # Lo que el IVF recomienda tiene el mismo puntaje que en la base exacta
+        assert np.allclose(obtenido["Similarity"], exacta.calcular_similitud(*consulta)[
+            [exacta.catalogo.indice.tolist().index(e) for e in obtenido.index]])
+    assert len(aciertos) > 150
+    assert np.mean(aciertos) >= 0.97
+
+
+def test_indice_recien_construido_es_consistente(sintetico):
+    listas_consistentes(BaseConocimiento(sintetico, indice="ivf").estado.indice_similitud)
+
+
+def test_altas_y_bajas_mantienen_las_listas(datos_faltantes):
+    rng = np.random.default_rng(2)
+    datos = catalogo_sintetico(datos_faltantes, 2_000, rng)
+    # Con todas las listas sondeadas el IVF debe dar exactamente lo mismo que el índice exacto
+    exacta = BaseConocimiento(datos)
+    ivf = BaseConocimiento(datos, indice="ivf", opciones_indice={"n_sondeos": 10_000})
+    centroides = ivf.estado.indice_similitud.centroides
+    siguiente = len(datos)
+    quitadas = set()
+    for paso in range(6):
+        nuevas = catalogo_sintetico(datos_faltantes, 150, rng)
+        if paso == 2:
+            # Costos fuera del rango actual: mueven los límites y se reescala todo el catálogo
+            nuevas["Accommodation cost"] *= 20
+        nuevas = nuevas.set_axis(np.arange(siguiente, siguiente + len(nuevas)))
+        siguiente += len(nuevas)
+        vivas = sorted(set(range(siguiente)) - quitadas)
+        bajas = rng.choice(vivas, 300, replace=False).tolist()
+        quitadas.update(bajas)
+        for base in (exacta, ivf):
+            base.add_destinations(nuevas)
+            base.remove_destinations(bajas)
+        indice = ivf.estado.indice_similitud
+        listas_consistentes(indice)
+        # Las altas se asignan a los centroides entrenados, no se reentrenan
+        assert indice.centroides is centroides
+        for consulta in CONSULTAS:
+            resultado = ivf.recomendar_destinos(*consulta)
+            assert not quitadas & set(resultado.index)
+            mismas_recomendaciones(resultado, exacta.recomendar_destinos(*consulta))
+    ivf.compactar()
+    exacta.compactar()
+    listas_consistentes(ivf.estado.indice_similitud)
+    for consulta in CONSULTAS:
+        mismas_recomendaciones(ivf.recomendar_destinos(*consulta), exacta.recomendar_destinos(*consulta))
@@ -0,0 +1,53 @@
+# Contenido de tests/test_instrumentacion.py
+import threading
+
+from conftest import CONSULTAS
+from instrumentacion import METRICAS, Instrumentacion
+
+
+def test_apagada_por_defecto():
+    registro = Instrumentacion()
+    registro.registrar("etapa", registro.inicio())
+    registro.contar("eventos")
+    assert registro.estadisticas() == {"activa": False, "etapas": {}, "contadores": {}}
+
+
+def test_hilos_acumulan_por_separado_y_se_combinan_al_leer():
+    registro = Instrumentacion(activa=True)
+
+    def trabajar():
+        for _ in range(1000):
+            registro.registrar("etapa", registro.inicio())
+            registro.contar("eventos", 2)
+
+    hilos = [threading.Thread(target=trabajar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    trabajar()  # hilo principal, además de los terminados
+    estadisticas = registro.estadisticas()
+    assert estadisticas["etapas"]["etapa"]["cantidad"] == 5000
+    assert estadisticas["contadores"] == {"eventos": 10000}
+    assert 'etapa="etapa",le="+Inf"} 5000' in registro.prometheus()
+    registro.reiniciar()
+    assert registro.estadisticas()["contadores"] == {}
+
+
+def test_reglas_por_instancia(base_faltantes):
+    METRICAS.activa = True
+    try:
+        METRICAS.reiniciar()
+        for c in CONSULTAS:
+            base_faltantes.recomendar_destinos(*c, clima="templado", actividades=["beach"])
+        base_faltantes.recomendar_destinos_batch(CONSULTAS[:2])
+        etapas = METRICAS.estadisticas()["etapas"]
+    finally:
+        METRICAS.activa = False
+        METRICAS.reiniciar()
+    plan = base_faltantes.plan
+    for columna in plan.columnas_igualdad:
+        assert f"regla_igualdad:{columna}" in etapas and f"lote_regla_igualdad:{columna}" in etapas
+    assert {"regla_preferencias:clima", "regla_preferencias:actividades"} <= set(etapas)
+    assert len([e for e in etapas if e.startswith("regla_difusa:")]) == len(plan.difusas)
+    assert not {"regla_igualdad", "regla_difusa", "regla_preferencias"} & set(etapas)
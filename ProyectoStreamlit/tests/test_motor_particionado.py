@@ -0,0 +1,63 @@
+# Contenido de tests/test_motor_particionado.py
+import threading
+
+import pytest
+
+from base_conocimiento import BaseConocimiento
+from conftest import CONSULTAS, CONSULTAS_PREFERENCIAS, mismas_recomendaciones
+from motor_particionado import BaseConocimientoParticionada
+
+
+@pytest.fixture(scope="module")
+def particionada(base_faltantes):
+    with BaseConocimientoParticionada(base_faltantes, n_procesos=3) as particionada:
+        yield particionada
+
+
+def test_particionada_igual_a_en_memoria(base_faltantes, particionada):
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for resultado, consulta in zip(particionada.recomendar_destinos_batch(consultas), consultas):
+        mismas_recomendaciones(resultado, base_faltantes.recomendar_destinos(*consulta))
+    mismas_recomendaciones(particionada.recomendar_destinos(*consultas[2], k=3),
+                           base_faltantes.recomendar_destinos(*consultas[2], k=3))
+
+
+def test_particionada_sigue_los_cambios_de_la_base(datos_faltantes):
+    base = BaseConocimiento(datos_faltantes)
+    with BaseConocimientoParticionada(base, n_procesos=2) as particionada:
+        particionada.recomendar_destinos_batch(CONSULTAS[:1])
+        base.add_destinations(datos_faltantes.iloc[[3, 11, 20]].set_axis([1000, 1001, 1002]).assign(**{"Accommodation cost": 10}))
+        base.remove_destinations([4, 50])
+        for resultado, consulta in zip(particionada.recomendar_destinos_batch(CONSULTAS), CONSULTAS):
+            mismas_recomendaciones(resultado, base.recomendar_destinos(*consulta))
+
+
+def test_actualizaciones_concurrentes_con_consultas(datos_faltantes):
+    base = BaseConocimiento(datos_faltantes)
+    errores = []
+    with BaseConocimientoParticionada(base, n_procesos=2) as particionada:
+        publicaciones = [particionada._publicacion]
+
+        def consultar():
+            try:
+                for _ in range(15):
+                    for resultado in particionada.recomendar_destinos_batch(CONSULTAS):
+                        assert resultado is not None
+            except Exception as e:  # noqa: BLE001 - se reporta en el hilo principal
+                errores.append(e)
+
+        hilos = [threading.Thread(target=consultar) for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        for i in range(6):
+            base.add_destinations(datos_faltantes.iloc[[i]].set_axis([3000 + i]))
+            particionada.recomendar_destinos_batch(CONSULTAS[:1])
+            publicaciones.append(particionada._publicacion)
+        for hilo in hilos:
+            hilo.join()
+        assert not errores, errores
+        for resultado, consulta in zip(particionada.recomendar_destinos_batch(CONSULTAS), CONSULTAS):
+            mismas_recomendaciones(resultado, base.recomendar_destinos(*consulta))
+        # Las publicaciones reemplazadas se liberaron al terminar su último lote
+        assert all(not p.liberar.alive for p in publicaciones[:-1])
+    assert not publicaciones[-1].liberar.alive
@@ -0,0 +1,40 @@
+# Contenido de tests/test_plan_puntuacion.py
+import numpy as np
+import pytest
+
+from conftest import CONSULTAS, mismas_recomendaciones
+from plan_puntuacion import PlanPuntuacion, numba
+
+
+def test_lote_igual_a_consultas_individuales(base_faltantes):
+    # Las filas sin tipo de hospedaje (-1) no deben puntuar igualdad con consultas sin tipo (-1)
+    lote = base_faltantes.recomendar_destinos_batch(CONSULTAS)
+    for consulta, resultado in zip(CONSULTAS, lote):
+        mismas_recomendaciones(resultado, base_faltantes.recomendar_destinos(*consulta))
+
+
+def test_matriz_de_similitud_igual_a_consulta_individual(base_faltantes):
+    matriz = base_faltantes.calcular_similitud_batch(CONSULTAS)
+    for consulta, fila in zip(CONSULTAS, matriz):
+        assert np.array_equal(fila, base_faltantes.calcular_similitud(*consulta))
+
+
+def test_sin_tipo_no_suma_igualdad_en_filas_sin_categoria(base_faltantes):
+    plan = base_faltantes.plan
+    sin_tipo = base_faltantes.catalogo.codigos("Accommodation type") < 0
+    assert sin_tipo.any()
+    entrada = base_faltantes._entrada(*CONSULTAS[0][:4])
+    lote = plan.puntuar([entrada], [None])[0]
+    assert np.array_equal(lote, plan.puntuar_una(entrada, None))
+
+
+@pytest.mark.skipif(numba is None, reason="numba no está instalado")
+def test_kernel_jit_igual_a_numpy(base_faltantes):
+    estado = base_faltantes.estado
+    parametros, arreglos = estado.plan.exportar()
+    planes = [PlanPuntuacion.desde_exportado(parametros, arreglos, estado.indice_similitud, estado.scaler, backend=b)
+              for b in ("numba", "numpy")]
+    for consulta in CONSULTAS:
+        entrada = base_faltantes._entrada(*consulta[:4])
+        jit, numpy = (plan.puntuar_una(entrada, consulta[4]) for plan in planes)
+        assert np.allclose(jit, numpy)
@@ -0,0 +1,99 @@
+# Contenido de tests/test_reglas_preferencia.py
+import numpy as np
+import pytest
+
+import Rule as rl
+from base_conocimiento import BaseConocimiento
+from conftest import CONSULTAS
+from plan_puntuacion import _popcount
+
+NAN = float("nan")
+
+
+def catalogo_df(base, datos):
+    """Filas de `datos` en el orden físico del catálogo de la base."""
+    return datos.loc[base.catalogo.indice]
+
+
+def test_clases_de_clima_en_los_bordes():
+    regla = rl.ClimateRule()
+    temperatura = [14.99, 15.0, 24.99, 25.0, 25.0, 25.0, 10.0, 40.0]
+    humedad = [50.0, 50.0, 90.0, 69.99, 70.0, 95.0, 95.0, 10.0]
+    # La humedad solo separa cálido de tropical
+    assert list(regla.clases(temperatura, humedad)) == [0, 1, 1, 2, 3, 3, 0, 2]
+
+
+def test_clima_sin_temperatura_o_humedad():
+    regla = rl.ClimateRule()
+    assert list(regla.clases([NAN, 10.0, 30.0, NAN], [50.0, NAN, NAN, NAN])) == [-1, -1, -1, -1]
+
+
+def test_bordes_configurables():
+    regla = rl.ClimateRule(templado_desde=10.0, calido_desde=20.0, humedad_tropical=80.0)
+    assert list(regla.clases([9.9, 10.0, 20.0, 20.0], [0.0, 0.0, 79.9, 80.0])) == [0, 1, 2, 3]
+
+
+def test_apply_de_clima(datos_faltantes):
+    regla = rl.ClimateRule()
+    clases = regla.clases(datos_faltantes["avg_temperature"], datos_faltantes["avg_humidity"])
+    for codigo, clima in enumerate(regla.CLIMAS):
+        assert np.array_equal(regla.apply(clima, datos_faltantes), (clases == codigo).astype(float))
+    assert regla.apply("polar", datos_faltantes) == 0
+    assert regla.apply(None, datos_faltantes) == 0
+    assert regla.apply("cálido", datos_faltantes.drop(columns="avg_humidity")) == 0
+
+
+def test_escala_de_seguridad():
+    regla = rl.SafetyRule(minimo=2.0, maximo=8.0)
+    assert np.allclose(regla.escalar([0.0, 2.0, 5.0, 8.0, 10.0, NAN]), [0, 0, 0.5, 1, 1, 0])
+    # Escala degenerada: no divide por cero
+    assert np.allclose(rl.SafetyRule(minimo=5.0, maximo=5.0).escalar([4.0, 5.0, 6.0]), [0, 0, 1])
+
+
+@pytest.mark.parametrize("actividades", [
+    ["beach"],
+    ["beach", "museums"],
+    [" Hiking ", "BEACH"],
+    ["hiking", "hiking"],
+    ["beach", "actividad que no existe"],
+    ["actividad que no existe"],
+])
+def test_bitset_igual_a_activities_rule(base_faltantes, datos_faltantes, actividades):
+    plan = base_faltantes.plan
+    preferencias = plan.preferencias(None, None, actividades)
+    esperado = rl.ActivitiesRule().apply(actividades, catalogo_df(base_faltantes, datos_faltantes))
+    obtenido = _popcount(plan.actividades & preferencias.bits).sum(axis=1) / preferencias.n_actividades
+    assert np.allclose(obtenido, esperado)
+
+
+def test_fila_sin_actividades_no_coincide(base_faltantes):
+    plan = base_faltantes.plan
+    fisica = base_faltantes.catalogo.indice.tolist().index(13)
+    assert not plan.actividades[fisica].any()
+
+
+def test_similitud_con_preferencias_suma_las_reglas(datos_faltantes):
+    # Catálogo con temperatura y humedad faltantes: esas filas no puntúan en clima
+    datos = datos_faltantes.copy()
+    datos.loc[[2, 9], "avg_temperature"] = np.nan
+    datos.loc[[4], "avg_humidity"] = np.nan
+    base = BaseConocimiento(datos)
+    catalogo = catalogo_df(base, datos)
+    reglas = {type(r): r for r in base.rules}
+    plan = base.plan
+    assert (plan.clima[[catalogo.index.get_loc(i) for i in (2, 4, 9)]] == -1).all()
+
+    for clima, seguridad_min, actividades in [("templado", None, None), ("cálido", None, None), ("tropical", 6, ["beach"]),
+                                              (None, 3, ["hiking", "museums"]), ("frío", 0, ["beach", "castles"])]:
+        for consulta in CONSULTAS[:4]:
+            con = base.calcular_similitud(*consulta, clima, seguridad_min, actividades)
+            sin = base.calcular_similitud(*consulta)
+            assert not np.isnan(con).any()
+            esperado = np.zeros(len(catalogo))
+            peso_total = plan.peso_base
+            for regla, entrada in ((reglas[rl.ClimateRule], clima), (reglas[rl.SafetyRule], seguridad_min),
+                                   (reglas[rl.ActivitiesRule], actividades)):
+                if entrada is not None:
+                    esperado += regla.weight * regla.apply(entrada, catalogo)
+                    peso_total += regla.weight
+            assert np.allclose(con * peso_total - sin * plan.peso_base, esperado)
@@ -0,0 +1,91 @@
+# Contenido de tests/test_servicio_http.py
+import asyncio
+import json
+
+import pytest
+
+from base_hechos import Consulta
+from motor_inferencia import MotorInferencia
+from servicio_http import ServicioRecomendaciones, SolicitudInvalida
+
+VALIDA = {"presupuesto": 3000, "duracion_min": 3, "duracion_max": 7, "mes": 6}
+
+
+class MotorQueFalla(MotorInferencia):
+    """Motor real que falla con las consultas de presupuesto 13 (el lote completo falla con ellas)."""
+
+    def recomendar(self, consulta, k=6):
+        if consulta.presupuesto == 13:
+            raise RuntimeError("falla de prueba")
+        return super().recomendar(consulta, k)
+
+    def recomendar_batch(self, consultas, k=6):
+        if any(c.presupuesto == 13 for c in consultas):
+            raise RuntimeError("falla de prueba")
+        return super().recomendar_batch(consultas, k)
+
+
+@pytest.mark.parametrize("cuerpo", [
+    {**VALIDA, "tipo_hospedaje": 5},
+    {**VALIDA, "clima": ["cálido"]},
+    {**VALIDA, "actividades": [1, 2]},
+    {**VALIDA, "actividades": "beach"},
+    {**VALIDA, "presupuesto": "mucho"},
+    {**VALIDA, "duracion_min": 3.7},
+    {**VALIDA, "mes": "3.5"},
+    {**VALIDA, "duracion_max": True},
+    {**VALIDA, "k": 2.5},
+    {"presupuesto": 3000},
+    [VALIDA],
+])
+def test_consulta_invalida(cuerpo):
+    with pytest.raises(SolicitudInvalida):
+        ServicioRecomendaciones._consulta(json.dumps(cuerpo).encode())
+
+
+def test_consulta_valida():
+    consulta, k = ServicioRecomendaciones._consulta(json.dumps(
+        {**VALIDA, "tipo_hospedaje": "Hotel", "actividades": ["Beach"], "k": 3}).encode())
+    assert consulta == Consulta(3000.0, 3, 7, 6, "Hotel", actividades=["beach"]) and k == 3
+
+
+def test_enteros_escritos_como_real_o_texto():
+    consulta, k = ServicioRecomendaciones._consulta(json.dumps(
+        {**VALIDA, "duracion_min": 3.0, "duracion_max": "7", "mes": 6.0, "k": "4"}).encode())
+    assert (consulta.duracion_min, consulta.duracion_max, consulta.mes, k) == (3, 7, 6, 4)
+
+
+def test_entero_con_decimales_explica_el_error():
+    with pytest.raises(SolicitudInvalida, match="duracion_min debe ser un entero"):
+        ServicioRecomendaciones._consulta(json.dumps({**VALIDA, "duracion_min": 3.7}).encode())
+
+
+async def _http(puerto, cuerpo):
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    datos = json.dumps(cuerpo).encode()
+    escritor.write(b"POST /recomendar HTTP/1.1\r\nConnection: close\r\n"
+                   + f"Content-Length: {len(datos)}\r\n\r\n".encode() + datos)
+    respuesta = await lector.read()
+    escritor.close()
+    return int(respuesta.split(b" ", 2)[1]), respuesta.split(b"\r\n\r\n", 1)[1]
+
+
+def test_una_solicitud_que_falla_no_arrastra_a_su_lote(base_faltantes):
+    async def escenario():
+        servicio = ServicioRecomendaciones(MotorQueFalla(base_faltantes), ventana_ms=50, lote_max=8)
+        servicio._cola = asyncio.Queue()
+        despachador = asyncio.create_task(servicio._despachar())
+        servidor = await asyncio.start_server(servicio._conexion, "127.0.0.1", 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        try:
+            cuerpos = [VALIDA, {**VALIDA, "presupuesto": 13}, {**VALIDA, "tipo_hospedaje": 5}, {**VALIDA, "mes": 1}]
+            return servicio, await asyncio.gather(*(_http(puerto, c) for c in cuerpos))
+        finally:
+            servidor.close()
+            despachador.cancel()
+
+    servicio, respuestas = asyncio.run(escenario())
+    assert [codigo for codigo, _ in respuestas] == [200, 500, 400, 200]
+    assert json.loads(respuestas[0][1]) and json.loads(respuestas[3][1])
+    # Las tres solicitudes válidas llegaron juntas al despachador
+    assert servicio.lotes_procesados == 1 and servicio.atendidas == 3
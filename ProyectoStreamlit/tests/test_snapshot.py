@@ -0,0 +1,60 @@
+# Contenido de tests/test_snapshot.py
+import numpy as np
+import pytest
+
+import snapshot
+from base_conocimiento import BaseConocimiento
+from conftest import CONSULTAS, CONSULTAS_PREFERENCIAS, mismas_recomendaciones
+
+
+@pytest.fixture(scope="module")
+def original_y_cargada(datos_faltantes, tmp_path_factory):
+    original = BaseConocimiento(datos_faltantes)
+    # Altas y bajas pendientes: el snapshot las compacta antes de guardar
+    original.add_destinations(datos_faltantes.iloc[[5, 13]].set_axis([2000, 2001]))
+    original.remove_destinations([7, 40])
+    ruta = str(tmp_path_factory.mktemp("snapshot") / "base.snapshot")
+    original.guardar_snapshot(ruta)
+    return original, BaseConocimiento.desde_snapshot(ruta)
+
+
+def test_snapshot_da_las_mismas_recomendaciones(original_y_cargada):
+    original, cargada = original_y_cargada
+    consultas = CONSULTAS + CONSULTAS_PREFERENCIAS
+    for consulta in consultas:
+        mismas_recomendaciones(cargada.recomendar_destinos(*consulta), original.recomendar_destinos(*consulta))
+    for resultado, consulta in zip(cargada.recomendar_destinos_batch(consultas), consultas):
+        mismas_recomendaciones(resultado, original.recomendar_destinos(*consulta))
+
+
+def test_snapshot_conserva_catalogo_y_plan(original_y_cargada):
+    original, cargada = original_y_cargada
+    assert cargada.travel_data.equals(original.travel_data)
+    parametros, arreglos = original.plan.exportar()
+    parametros_cargados, arreglos_cargados = cargada.plan.exportar()
+    assert parametros_cargados == parametros
+    assert arreglos_cargados.keys() == arreglos.keys()
+    for clave, arreglo in arreglos.items():
+        assert np.array_equal(arreglos_cargados[clave], arreglo), clave
+
+
+def test_snapshot_no_escribible_no_impide_cargar(csv_faltantes, base_faltantes, tmp_path):
+    # La ruta cuelga de un archivo: guardar falla con OSError, como en un directorio de solo lectura
+    # (chmod no sirve si los tests corren como root)
+    archivo = tmp_path / "no_es_directorio"
+    archivo.write_text("")
+    ruta = str(archivo / "base.snapshot")
+    base = BaseConocimiento.desde_csv(csv_faltantes, ruta)
+    for consulta in CONSULTAS + CONSULTAS_PREFERENCIAS:
+        mismas_recomendaciones(base.recomendar_destinos(*consulta), base_faltantes.recomendar_destinos(*consulta))
+
+
+def test_snapshot_fallido_no_deja_temporales(base_faltantes, tmp_path, monkeypatch):
+    def sin_espacio(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    ruta = str(tmp_path / "base.snapshot")
+    monkeypatch.setattr(np, "save", sin_espacio)
+    with pytest.raises(OSError):
+        snapshot.guardar(base_faltantes, ruta)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,79 @@
+# Contenido de tests/test_tabla_topk.py
+import numpy as np
+import pytest
+
+from base_conocimiento import BaseConocimiento
+from base_hechos import Consulta
+from conftest import mismas_recomendaciones
+from motor_inferencia import MotorInferencia
+from tabla_topk import TablaTopK, construir
+
+GRILLA = {"presupuesto_max": 3000.0, "punto_medio_max": 8.0}
+
+
+@pytest.fixture(scope="module")
+def fuentes(csv_faltantes, tmp_path_factory):
+    carpeta = tmp_path_factory.mktemp("topk")
+    ruta_snapshot, ruta_tabla = str(carpeta / "base.snapshot"), str(carpeta / "base.topk")
+    construir(csv_faltantes, ruta_tabla, ruta_snapshot, k=6, grilla=GRILLA, procesos=2)
+    return csv_faltantes, ruta_snapshot, ruta_tabla
+
+
+@pytest.fixture
+def base_y_tabla(fuentes):
+    csv, ruta_snapshot, ruta_tabla = fuentes
+    base = BaseConocimiento.desde_csv(csv, ruta_snapshot)
+    tabla = TablaTopK.cargar(ruta_tabla, base)
+    assert tabla is not None
+    return base, tabla
+
+
+def test_celdas_de_la_grilla_igual_al_motor(base_y_tabla):
+    base, tabla = base_y_tabla
+    rng = np.random.default_rng(0)
+    tipos = [None, "Hotel", "Resort", "Villa", "Airbnb"]
+    for _ in range(2000):
+        presupuesto = float(rng.choice(tabla.presupuestos))
+        medio = float(rng.choice(tabla.medios))
+        # Duraciones distintas con el mismo punto medio caen en la misma celda
+        ancho = float(rng.integers(0, 2)) if medio >= 2 else 0.0
+        consulta = (presupuesto, medio - ancho, medio + ancho, int(rng.integers(1, 13)), tipos[rng.integers(len(tipos))])
+        k = int(rng.integers(1, 7))
+        desde_tabla = tabla.buscar(base, consulta, k)
+        assert desde_tabla is not None, consulta
+        mismas_recomendaciones(desde_tabla, base.recomendar_destinos(*consulta, k=k))
+
+
+@pytest.mark.parametrize("consulta,k", [
+    ((1025.0, 3, 5, 6, None), 6),  # presupuesto entre dos pasos
+    ((5000.0, 3, 5, 6, None), 6),  # presupuesto fuera del rango
+    ((1000.0, 3, 4.5, 6, None), 6),  # punto medio fuera de la grilla
+    ((1000.0, 3, 5, 6, "Hostel"), 6),  # tipo que no está en la grilla
+    ((1000.0, 3, 5, 6, None, "templado"), 6),  # con preferencias
+    ((1000.0, 3, 5, 6, None), 10),  # k mayor que el de la tabla
+])
+def test_consultas_fuera_de_la_grilla_van_al_motor(base_y_tabla, consulta, k):
+    base, tabla = base_y_tabla
+    assert tabla.buscar(base, consulta, k) is None
+    motor = MotorInferencia(base, tabla=tabla)
+    mismas_recomendaciones(motor.recomendar(Consulta(*consulta), k), base.recomendar_destinos(*consulta, k=k))
+
+
+def test_tabla_de_otra_version_no_se_usa(base_y_tabla, datos_faltantes):
+    base, tabla = base_y_tabla
+    consulta = (2000.0, 5, 7, 6, None)
+    assert tabla.buscar(base, consulta) is not None
+    base.add_destinations(datos_faltantes.iloc[[0]].set_axis([7000]).assign(**{"Month": 6, "Duration (days)": 6}))
+    assert tabla.buscar(base, consulta) is None
+    mismas_recomendaciones(MotorInferencia(base, tabla=tabla).recomendar(Consulta(*consulta)),
+                           base.recomendar_destinos(*consulta))
+
+
+def test_tabla_de_otras_fuentes_se_rechaza(fuentes, datos_faltantes, tmp_path):
+    _, _, ruta_tabla = fuentes
+    otro_csv = tmp_path / "otro.csv"
+    datos_faltantes.iloc[:-1].to_csv(otro_csv, index=False)
+    otra = BaseConocimiento.desde_csv(str(otro_csv), str(tmp_path / "otro.snapshot"))
+    assert TablaTopK.cargar(ruta_tabla, otra) is None
+    # Una base construida desde un DataFrame no tiene hash de origen
+    assert TablaTopK.cargar(ruta_tabla, BaseConocimiento(datos_faltantes)) is None